@@ -23,8 +23,10 @@ from pydantic_ai_blocking_approval import (
     ApprovalToolset,
 )
 
+from .http_clients import HttpClientSettings, configure_provider_http
 from .models import (
     InvalidCompatibleModelsError,
+    ModelCache,
     ModelCompatibilityError,
     ModelInput,
     NoModelError,
@@ -57,8 +59,12 @@ __all__ = [
     "ModelCompatibilityError",
     "NoModelError",
     "ModelInput",
+    "ModelCache",
     "register_model_factory",
     "resolve_model",
+    # Provider HTTP clients
+    "HttpClientSettings",
+    "configure_provider_http",
     # Runtime types
     "CallContext",
     "Runtime",
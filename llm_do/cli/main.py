@@ -14,14 +14,12 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import itertools
 import json
 import sys
 from pathlib import Path
 from typing import Any, Callable
 
-from pydantic_ai.messages import ModelMessagesTypeAdapter
-
+from ..http_clients import configure_http_clients
 from ..oauth import (
     get_oauth_provider_for_model_provider,
     resolve_oauth_overrides,
@@ -29,17 +27,22 @@ from ..oauth import (
 from ..project import (
     AgentRegistry,
     ProjectManifest,
+    ProjectReloader,
     build_registry,
     build_registry_host_wiring,
     load_manifest,
     load_module,
+    resolve_capability_policy,
     resolve_entry,
     resolve_generated_agents_dir,
+    resolve_http_client_settings,
     resolve_manifest_paths,
+    warm_up_entry,
 )
 from ..runtime import Entry
 from ..ui import HeadlessDisplayBackend
 from ..ui.runner import RunConfig, run_ui
+from .message_log import MessageLogWriter, make_message_log_callback
 
 
 def _input_to_args(data: dict[str, Any] | str) -> dict[str, Any]:
@@ -51,36 +54,6 @@ def _input_to_args(data: dict[str, Any] | str) -> dict[str, Any]:
     return dict(data)
 
 
-def _make_message_log_callback(stream: Any) -> Callable[[str, int, list[Any]], None]:
-    """Stream raw model request/response messages as JSONL."""
-    counter = itertools.count()
-
-    def callback(agent: str, depth: int, messages: list[Any]) -> None:
-        try:
-            serialized = ModelMessagesTypeAdapter.dump_python(messages, mode="json")
-        except Exception:
-            serialized = []
-            for msg in messages:
-                try:
-                    serialized.append(ModelMessagesTypeAdapter.dump_python([msg], mode="json")[0])
-                except Exception:
-                    serialized.append({"repr": repr(msg)})
-
-        for message in serialized:
-            record = {
-                "seq": next(counter),
-                "agent": agent,
-                "depth": depth,
-                "message": message,
-            }
-            stream.write(json.dumps(record, ensure_ascii=True, separators=(",", ":")) + "\n")
-        stream.flush()
-
-    return callback
-
-
-
-
 def _load_init_modules(module_paths: list[str]) -> None:
     """Load Python modules for side effects (e.g., custom provider registration)."""
     # TEMPORARY: Escape hatch for provider injection during CLI runs;
@@ -160,6 +133,25 @@ def main() -> int:
             "-vvv for full LLM message log JSONL only)"
         ),
     )
+    parser.add_argument(
+        "--message-log",
+        dest="message_log",
+        metavar="PATH",
+        help="Write the full LLM message log as JSONL to PATH (instead of stderr at -vvv)",
+    )
+    parser.add_argument(
+        "--message-log-max-bytes",
+        dest="message_log_max_bytes",
+        type=int,
+        metavar="N",
+        help="Rotate --message-log segments after N uncompressed bytes",
+    )
+    parser.add_argument(
+        "--message-log-compression",
+        dest="message_log_compression",
+        choices=["gzip", "zstd"],
+        help="Compress --message-log segments (zstd requires the 'zstandard' package)",
+    )
     parser.add_argument(
         "--headless",
         action="store_true",
@@ -255,6 +247,10 @@ def main() -> int:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
+    http_client_settings = resolve_http_client_settings(manifest)
+    configure_http_clients(http_client_settings)
+    warmup = any(settings.warmup_connections for settings in http_client_settings.values())
+
     try:
         _load_init_modules(args.init_python)
     except Exception as e:
@@ -263,7 +259,9 @@ def main() -> int:
             raise
         return 1
 
-    entry_factory = _make_entry_factory(manifest, manifest_dir)
+    # Chat sessions are long-lived: pick up edits to agent and Python files between turns.
+    reloader = ProjectReloader(manifest, manifest_dir) if args.chat else None
+    entry_factory = reloader if reloader is not None else _make_entry_factory(manifest, manifest_dir)
 
     # Determine if we should use TUI mode:
     # - Explicit --tui flag
@@ -276,10 +274,29 @@ def main() -> int:
         return 1
 
     generated_agents_dir = resolve_generated_agents_dir(manifest, manifest_dir)
+    capability_policy = resolve_capability_policy(manifest, manifest_dir)
     log_verbosity = args.verbose
     message_log_callback = None
-    if log_verbosity >= 3:
-        message_log_callback = _make_message_log_callback(sys.stderr)
+    message_log_writer: MessageLogWriter | None = None
+    if args.message_log is None and (
+        args.message_log_max_bytes is not None or args.message_log_compression is not None
+    ):
+        print("Error: --message-log-max-bytes/--message-log-compression require --message-log", file=sys.stderr)
+        return 1
+    try:
+        if args.message_log is not None:
+            message_log_writer = MessageLogWriter(
+                path=args.message_log,
+                max_bytes=args.message_log_max_bytes,
+                compression=args.message_log_compression,
+            )
+        elif log_verbosity >= 3:
+            message_log_writer = MessageLogWriter(sys.stderr)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if message_log_writer is not None:
+        message_log_callback = make_message_log_callback(message_log_writer)
 
     backends: list[Any] = []
     extra_backends: list[Any] | None = None
@@ -299,6 +316,8 @@ def main() -> int:
 
     config = RunConfig(
         entry_factory=entry_factory,
+        entry_reloader=reloader.reload if reloader is not None else None,
+        connection_warmup=warm_up_entry if warmup else None,
         project_root=manifest_dir,
         approval_mode=manifest.runtime.approval_mode,
         auth_mode=manifest.runtime.auth_mode,
@@ -309,21 +328,28 @@ def main() -> int:
         agent_calls_require_approval=manifest.runtime.agent_calls_require_approval,
         agent_attachments_require_approval=manifest.runtime.agent_attachments_require_approval,
         agent_approval_overrides=manifest.runtime.agent_approval_overrides,
+        capability_policy=capability_policy,
         oauth_provider_resolver=get_oauth_provider_for_model_provider,
         oauth_override_resolver=resolve_oauth_overrides,
         message_log_callback=message_log_callback,
         debug=args.debug,
         error_stream=error_stream,
     )
-    outcome = asyncio.run(run_ui(
-        input=input_data,
-        config=config,
-        mode="tui" if use_tui else "headless",
-        backends=backends,
-        extra_backends=extra_backends,
-        chat=args.chat,
-        agent_name="agent",
-    ))
+    try:
+        outcome = asyncio.run(run_ui(
+            input=input_data,
+            config=config,
+            mode="tui" if use_tui else "headless",
+            backends=backends,
+            extra_backends=extra_backends,
+            chat=args.chat,
+            agent_name="agent",
+        ))
+    finally:
+        if message_log_writer is not None:
+            message_log_writer.close()
+        if reloader is not None:
+            reloader.close()
     if outcome.result is not None:
         print(outcome.result)
     return outcome.exit_code
@@ -0,0 +1,239 @@
+"""JSONL message logging for `-vvv` / `--message-log`.
+
+Records are serialized on the calling thread (so the active OpenTelemetry span
+can be attached) and written by a background thread, which batches writes,
+optionally compresses, and rotates file output by uncompressed size.
+"""
+from __future__ import annotations
+
+import gzip
+import itertools
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import IO, Any, Callable, Literal
+
+from pydantic_ai.messages import ModelMessagesTypeAdapter
+
+Compression = Literal["gzip", "zstd"]
+
+_COMPRESSION_SUFFIXES: dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _current_span_ids() -> dict[str, str]:
+    """Return hex trace/span ids of the active OpenTelemetry span, if any."""
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return {}
+    context = trace.get_current_span().get_span_context()
+    if not context.is_valid:
+        return {}
+    return {
+        "trace_id": f"{context.trace_id:032x}",
+        "span_id": f"{context.span_id:016x}",
+    }
+
+
+def _serialize_messages(messages: list[Any]) -> list[Any]:
+    try:
+        return ModelMessagesTypeAdapter.dump_python(messages, mode="json")
+    except Exception:
+        serialized = []
+        for msg in messages:
+            try:
+                serialized.append(ModelMessagesTypeAdapter.dump_python([msg], mode="json")[0])
+            except Exception:
+                serialized.append({"repr": repr(msg)})
+        return serialized
+
+
+def _segment_path(base: Path, index: int) -> Path:
+    """Return the path of rotation segment ``index`` (0 is ``base`` itself)."""
+    if index == 0:
+        return base
+    stem, dot, rest = base.name.partition(".")
+    if not stem:
+        return base.with_name(f"{base.name}.{index}")
+    return base.with_name(f"{stem}.{index}{dot}{rest}")
+
+
+def _open_segment(path: Path, compression: Compression | None) -> IO[bytes]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise RuntimeError(
+                "zstd message log compression requires the 'zstandard' package"
+            ) from exc
+        return zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+    raise ValueError(f"Unknown message log compression: {compression}")
+
+
+class MessageLogWriter:
+    """Buffered background writer for JSONL message log lines.
+
+    Writes to ``stream`` when given, otherwise to ``path`` (rotated once a
+    segment holds ``max_bytes`` of uncompressed data). Call ``close()`` to
+    drain pending lines before exit.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str] | None = None,
+        *,
+        path: str | Path | None = None,
+        max_bytes: int | None = None,
+        compression: Compression | None = None,
+    ) -> None:
+        if (stream is None) == (path is None):
+            raise ValueError("MessageLogWriter needs exactly one of stream or path")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if stream is not None and (max_bytes is not None or compression is not None):
+            raise ValueError("rotation and compression require a file path")
+        self._stream = stream
+        self._path: Path | None = None
+        if path is not None:
+            base = Path(path).expanduser()
+            suffix = _COMPRESSION_SUFFIXES.get(compression or "")
+            if suffix and not base.name.endswith(suffix):
+                base = base.with_name(base.name + suffix)
+            self._path = base
+        self._max_bytes = max_bytes
+        self._compression = compression
+        self._file: IO[bytes] | None = None
+        self._segment_index = 0
+        self._segment_bytes = 0
+        self._queue: queue.SimpleQueue[str | threading.Event | None] = queue.SimpleQueue()
+        self._closed = False
+        self._error: BaseException | None = None
+        if self._path is not None:
+            self._file = _open_segment(self._path, compression)
+        self._thread = threading.Thread(
+            target=self._run, name="llm-do-message-log", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def segment_paths(self) -> list[Path]:
+        """Paths of all segments written so far (file output only)."""
+        if self._path is None:
+            return []
+        return [_segment_path(self._path, i) for i in range(self._segment_index + 1)]
+
+    def write(self, line: str) -> None:
+        """Queue one newline-terminated line for writing."""
+        if self._closed:
+            raise RuntimeError("MessageLogWriter is closed")
+        self._queue.put(line)
+
+    def flush(self) -> None:
+        """Block until every line queued so far has been written."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_pending_error()
+
+    def close(self) -> None:
+        """Drain pending lines, stop the writer thread and close file output."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Message log write failed: {error}") from error
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            lines: list[str] = []
+            waiters: list[threading.Event] = []
+            item = self._queue.get()
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    lines.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if lines:
+                try:
+                    self._write_lines(lines)
+                except Exception as exc:  # surfaced on flush/close
+                    self._error = exc
+            for waiter in waiters:
+                waiter.set()
+        if self._file is not None:
+            self._file.close()
+
+    def _write_lines(self, lines: list[str]) -> None:
+        if self._stream is not None:
+            self._stream.write("".join(lines))
+            self._stream.flush()
+            return
+        assert self._file is not None
+        for line in lines:
+            data = line.encode("utf-8")
+            if (
+                self._max_bytes is not None
+                and self._segment_bytes
+                and self._segment_bytes + len(data) > self._max_bytes
+            ):
+                self._rotate()
+            self._file.write(data)
+            self._segment_bytes += len(data)
+        self._file.flush()
+
+    def _rotate(self) -> None:
+        assert self._file is not None and self._path is not None
+        self._file.close()
+        self._segment_index += 1
+        self._segment_bytes = 0
+        self._file = _open_segment(
+            _segment_path(self._path, self._segment_index), self._compression
+        )
+
+
+def make_message_log_callback(
+    writer: MessageLogWriter,
+) -> Callable[[str, int, list[Any]], None]:
+    """Return a message log callback that emits one JSONL record per message.
+
+    The runtime passes only the messages produced since the previous log point,
+    so each call costs O(new messages) rather than O(history).
+    """
+    counter = itertools.count()
+
+    def callback(agent: str, depth: int, messages: list[Any]) -> None:
+        if not messages:
+            return
+        span_ids = _current_span_ids()
+        for message in _serialize_messages(messages):
+            record = {
+                "seq": next(counter),
+                "agent": agent,
+                "depth": depth,
+                **span_ids,
+                "message": message,
+            }
+            writer.write(json.dumps(record, ensure_ascii=True, separators=(",", ":")) + "\n")
+
+    return callback
@@ -18,6 +18,7 @@ from ..oauth import (
     OAuthStorage,
     get_oauth_path,
     login_anthropic,
+    logout,
 )
 
 ALL_PROVIDERS = list(get_args(OAuthProvider))
@@ -94,10 +95,9 @@ async def run_oauth_cli(argv: list[str]) -> int:
         return 0
 
     if args.command == "logout":
-        if not storage.has_credentials(args.provider):
+        if not logout(args.provider, storage=storage):
             print(f"No OAuth credentials found for {args.provider}")
             return 0
-        storage.remove_credentials(args.provider)
         print(f"Cleared OAuth credentials for {args.provider}")
         return 0
 
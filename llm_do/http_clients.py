@@ -0,0 +1,138 @@
+"""Per-provider HTTP client settings and connection warmup.
+
+PydanticAI providers share one ``cached_async_http_client`` per provider with
+httpx's default pool (100 connections, 20 kept alive for 5s, HTTP/1.1).
+``configure_provider_http`` replaces that client for one provider name with
+one built from ``HttpClientSettings``. Providers inferred from model strings
+(``openai:...``) and ``OpenAICompatibleProvider`` pick it up through
+``provider_http_client``; custom model factories can pass it explicitly.
+
+``warm_up_connections`` pre-opens pooled connections to a model's base URL so
+the first turns of a fan-out don't each pay a TCP/TLS handshake.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+import httpx
+from pydantic_ai.models import Model, cached_async_http_client
+
+
+@dataclass(frozen=True, slots=True)
+class HttpClientSettings:
+    """Connection pool, protocol and timeout settings for one provider's client."""
+
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    http2: bool = False
+    timeout: float = 600.0
+    connect_timeout: float = 5.0
+    warmup_connections: int = 0
+
+
+_SETTINGS: dict[str, HttpClientSettings] = {}
+_CLIENTS: dict[str, httpx.AsyncClient] = {}
+_LOCK = threading.Lock()
+
+
+def build_http_client(settings: HttpClientSettings) -> httpx.AsyncClient:
+    """Create an ``httpx.AsyncClient`` with ``settings`` applied."""
+    if settings.http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError(
+                "http2 provider clients require the 'h2' package (pip install 'httpx[http2]')"
+            ) from exc
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(timeout=settings.timeout, connect=settings.connect_timeout),
+        http2=settings.http2,
+        headers={"User-Agent": "llm-do"},
+    )
+
+
+def configure_provider_http(provider: str, settings: HttpClientSettings | None) -> None:
+    """Use ``settings`` for ``provider``'s HTTP client (None restores the default).
+
+    Only models resolved afterwards use the new client; invalidate a
+    ``ModelCache`` to rebuild instances created before.
+    """
+    with _LOCK:
+        _CLIENTS.pop(provider, None)
+        if settings is None:
+            _SETTINGS.pop(provider, None)
+        else:
+            _SETTINGS[provider] = settings
+
+
+def configure_http_clients(settings: Mapping[str, HttpClientSettings]) -> None:
+    """Apply per-provider settings, e.g. from the manifest's ``runtime.http_clients``."""
+    for provider, provider_settings in settings.items():
+        configure_provider_http(provider, provider_settings)
+
+
+def provider_http_settings(provider: str) -> HttpClientSettings | None:
+    with _LOCK:
+        return _SETTINGS.get(provider)
+
+
+def provider_http_client(provider: str) -> httpx.AsyncClient:
+    """The HTTP client for ``provider``: configured if set, else PydanticAI's shared one."""
+    with _LOCK:
+        settings = _SETTINGS.get(provider)
+        if settings is None:
+            return cached_async_http_client(provider=provider)
+        client = _CLIENTS.get(provider)
+        if client is None or client.is_closed:
+            client = build_http_client(settings)
+            _CLIENTS[provider] = client
+        return client
+
+
+async def _open_connection(client: httpx.AsyncClient, url: str, timeout: float) -> bool:
+    try:
+        # Any response means the connection is pooled; the status doesn't matter.
+        await client.head(url, timeout=timeout)
+    except httpx.HTTPError:
+        return False
+    return True
+
+
+async def warm_up_connections(models: Iterable[Model]) -> dict[str, int]:
+    """Pre-open ``warmup_connections`` pooled connections per configured provider.
+
+    Providers are matched by ``Model.system`` and contacted at the model's base
+    URL. Warmup is best effort: unreachable hosts are skipped, and each request
+    is bounded by ``connect_timeout`` rather than the client's long read timeout,
+    so a slow host delays the first run by at most that much. Returns the number
+    of connections opened per provider.
+    """
+    targets: dict[str, str] = {}
+    for model in models:
+        base_url = getattr(model, "base_url", None)
+        settings = provider_http_settings(model.system)
+        if base_url and settings is not None and settings.warmup_connections > 0:
+            targets.setdefault(model.system, base_url)
+    opened: dict[str, int] = {}
+    for provider, base_url in targets.items():
+        settings = provider_http_settings(provider)
+        assert settings is not None
+        client = provider_http_client(provider)
+        # Concurrent requests, so each one needs its own connection.
+        results = await asyncio.gather(
+            *(
+                _open_connection(client, base_url, settings.connect_timeout)
+                for _ in range(settings.warmup_connections)
+            )
+        )
+        opened[provider] = sum(results)
+    return opened
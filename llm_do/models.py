@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import fnmatch
+import inspect
 import os
+import threading
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any, TypeAlias
@@ -15,7 +17,7 @@ from pydantic_ai.models import (
     ModelResponse,
     infer_model,
 )
-from pydantic_ai.providers import infer_provider_class
+from pydantic_ai.providers import Provider, infer_provider, infer_provider_class
 
 LLM_DO_MODEL_ENV = "LLM_DO_MODEL"
 
@@ -133,17 +135,27 @@ def register_model_factory(provider: str, factory: ModelFactory, *, replace: boo
     _CUSTOM_MODEL_FACTORIES[provider] = factory
 
 
-def _resolve_model_string(model: str) -> Model:
-    has_prefix = ":" in model
-    if has_prefix:
-        provider, model_name = model.split(":", 1)
-        factory = _CUSTOM_MODEL_FACTORIES.get(provider)
-        if factory is not None:
-            return factory(model_name)
+def _infer_provider(provider: str) -> Provider[Any]:
+    """``infer_provider``, but with the HTTP client configured for ``provider``, if any."""
+    from .http_clients import provider_http_client, provider_http_settings
+
+    if provider_http_settings(provider) is None:
+        return infer_provider(provider)
     try:
-        return infer_model(model)
+        provider_class = infer_provider_class(provider)
+    except ValueError:
+        # gateway/... and google-* are built by infer_provider with their defaults.
+        return infer_provider(provider)
+    if "http_client" not in inspect.signature(provider_class).parameters:
+        return infer_provider(provider)  # e.g. bedrock (boto3, not httpx)
+    return provider_class(http_client=provider_http_client(provider))
+
+
+def _infer_model(model: str) -> Model:
+    try:
+        return infer_model(model, provider_factory=_infer_provider)
     except UserError as exc:
-        if not has_prefix:
+        if ":" not in model:
             raise ModelError(
                 f"Unknown model '{model}'. Model identifiers must include a provider prefix, "
                 "e.g. 'openai:gpt-4o-mini' or 'anthropic:claude-haiku-4-5'. "
@@ -153,41 +165,117 @@ def _resolve_model_string(model: str) -> Model:
         raise
 
 
-def resolve_model_with_id(model: ModelInput) -> ModelSelection:
-    """Resolve a model identifier into a Model instance and track its string id."""
+def _model_factory(model: str) -> tuple[ModelFactory, str]:
+    """Return the factory that builds ``model`` and the name to pass it."""
+    if ":" in model:
+        provider, model_name = model.split(":", 1)
+        factory = _CUSTOM_MODEL_FACTORIES.get(provider)
+        if factory is not None:
+            return factory, model_name
+    return _infer_model, model
+
+
+class ModelCache:
+    """Model instances keyed by model string and the factory that builds them.
+
+    Agents resolving the same string share one Model, and with it one provider
+    and HTTP connection pool. The factory is part of the key, so re-registering
+    a provider's factory never serves models built by the old one.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: dict[tuple[str, ModelFactory], Model] = {}
+
+    def resolve(self, model: str) -> Model:
+        factory, model_name = _model_factory(model)
+        key = (model, factory)
+        with self._lock:
+            cached = self._models.get(key)
+        if cached is not None:
+            return cached
+        created = factory(model_name)
+        with self._lock:
+            # Another thread may have built it meanwhile; keep the first one.
+            return self._models.setdefault(key, created)
+
+    def add(self, model: str, instance: Model) -> None:
+        """Remember ``instance`` for ``model`` unless one is already cached."""
+        key = (model, _model_factory(model)[0])
+        with self._lock:
+            self._models.setdefault(key, instance)
+
+    def invalidate(self, model: str | None = None) -> int:
+        """Drop the cached instance(s) for ``model`` (all if None); returns how many."""
+        with self._lock:
+            if model is None:
+                dropped = len(self._models)
+                self._models.clear()
+                return dropped
+            keys = [key for key in self._models if key[0] == model]
+            for key in keys:
+                del self._models[key]
+            return len(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+
+def _resolve_model_string(model: str, cache: ModelCache | None) -> Model:
+    if cache is not None:
+        return cache.resolve(model)
+    factory, model_name = _model_factory(model)
+    return factory(model_name)
+
+
+def resolve_model_with_id(model: ModelInput, *, cache: ModelCache | None = None) -> ModelSelection:
+    """Resolve a model identifier into a Model instance and track its string id.
+
+    With ``cache``, strings resolved before return the cached instance.
+    """
     if isinstance(model, Model):
         return ModelSelection(model=model, model_id=None)
     if not isinstance(model, str):
         raise TypeError("Model must be a string or Model instance.")
-    return ModelSelection(model=_resolve_model_string(model), model_id=model)
+    return ModelSelection(model=_resolve_model_string(model, cache), model_id=model)
 
 
-def resolve_model(model: ModelInput) -> Model:
+def resolve_model(model: ModelInput, *, cache: ModelCache | None = None) -> Model:
     """Resolve a model identifier into a Model instance, honoring custom factories."""
-    return resolve_model_with_id(model).model
+    return resolve_model_with_id(model, cache=cache).model
 
 
 def select_model_with_id(
-    *, agent_model: str | Model | None = None, compatible_models: list[str] | None, agent_name: str = "agent"
+    *,
+    agent_model: str | Model | None = None,
+    compatible_models: list[str] | None,
+    agent_name: str = "agent",
+    cache: ModelCache | None = None,
 ) -> ModelSelection:
     """Select the effective model and return both Model and original identifier."""
     if agent_model is not None and compatible_models is not None:
         raise ModelConfigError(f"Agent '{agent_name}' cannot have both 'model' and 'compatible_models' set.")
     if agent_model is not None:
-        return resolve_model_with_id(agent_model)
+        return resolve_model_with_id(agent_model, cache=cache)
     env_model = get_env_model()
     if env_model is not None:
         validate_model_compatibility(env_model, compatible_models, agent_name=agent_name)
-        return resolve_model_with_id(env_model)
+        return resolve_model_with_id(env_model, cache=cache)
     raise NoModelError(f"No model configured for agent '{agent_name}'. Set agent.model or {LLM_DO_MODEL_ENV}.")
 
 
 def select_model(
-    *, agent_model: str | Model | None = None, compatible_models: list[str] | None, agent_name: str = "agent"
+    *,
+    agent_model: str | Model | None = None,
+    compatible_models: list[str] | None,
+    agent_name: str = "agent",
+    cache: ModelCache | None = None,
 ) -> Model:
     """Select and validate the effective model for an agent (agent_model > LLM_DO_MODEL env)."""
     return select_model_with_id(
         agent_model=agent_model,
         compatible_models=compatible_models,
         agent_name=agent_name,
+        cache=cache,
     ).model
@@ -1,14 +1,16 @@
 """OAuth helpers for llm-do."""
 from __future__ import annotations
 
-import logging
+import weakref
 from dataclasses import dataclass
-from typing import Any, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from pydantic_ai.settings import ModelSettings
 
 from .anthropic import login_anthropic, refresh_anthropic_token
+from .cache import OAuthTokenCache
 from .storage import (
+    FileLock,
     OAuthCredentials,
     OAuthProvider,
     OAuthStorage,
@@ -16,8 +18,6 @@ from .storage import (
     get_oauth_path,
 )
 
-logger = logging.getLogger(__name__)
-
 ANTHROPIC_OAUTH_BETA = "oauth-2025-04-20"
 ANTHROPIC_OAUTH_BETA_FEATURES = ("fine-grained-tool-streaming-2025-05-14",)
 ANTHROPIC_OAUTH_ACCEPT = "application/json"
@@ -37,14 +37,29 @@ def _split_model_identifier(model: str) -> Tuple[Optional[str], str]:
     return provider, name
 
 
+_default_storage: Optional[OAuthStorage] = None
+_token_caches: "weakref.WeakKeyDictionary[OAuthStorage, OAuthTokenCache]" = (
+    weakref.WeakKeyDictionary()
+)
+# model name -> (token, model); rebuilt only when the token changes.
+_oauth_models: Dict[str, Tuple[str, Any]] = {}
+
+
 def _ensure_storage(storage: Optional[OAuthStorage]) -> OAuthStorage:
-    return storage or OAuthStorage()
+    global _default_storage
+    if storage is not None:
+        return storage
+    if _default_storage is None:
+        _default_storage = OAuthStorage()
+    return _default_storage
 
 
-async def refresh_token(provider: OAuthProvider, storage: Optional[OAuthStorage] = None) -> str:
-    """Refresh OAuth token for a provider and return the new access token."""
-    oauth_storage = _ensure_storage(storage)
-    credentials = oauth_storage.load_credentials(provider)
+async def _refresh_credentials(provider: OAuthProvider, storage: OAuthStorage) -> OAuthCredentials:
+    """Spend the stored refresh token and save the new credentials.
+
+    Callers hold the provider's cache lock and the storage refresh lock.
+    """
+    credentials = storage.load_credentials(provider)
     if not credentials:
         raise RuntimeError(f"No OAuth credentials found for {provider}")
 
@@ -53,30 +68,49 @@ async def refresh_token(provider: OAuthProvider, storage: Optional[OAuthStorage]
     else:
         raise RuntimeError(f"Unknown OAuth provider: {provider}")
 
-    oauth_storage.save_credentials(provider, new_credentials)
-    return new_credentials.access
+    storage.save_credentials(provider, new_credentials)
+    return new_credentials
 
 
-async def get_oauth_api_key(provider: OAuthProvider, storage: Optional[OAuthStorage] = None) -> Optional[str]:
-    """Return an API token for a provider, refreshing if expired."""
+async def _refresh(provider: OAuthProvider, storage: OAuthStorage) -> object:
+    # Looked up at call time so tests can patch ``_refresh_credentials``.
+    return await _refresh_credentials(provider, storage)
+
+
+async def refresh_token(provider: OAuthProvider, storage: Optional[OAuthStorage] = None) -> str:
+    """Refresh OAuth token for a provider and return the new access token.
+
+    Goes through the token cache, so it takes the same locks as an expiry
+    refresh and the cache serves the new token afterwards.
+    """
+    return await get_token_cache(storage).refresh(provider)
+
+
+def logout(provider: OAuthProvider, storage: Optional[OAuthStorage] = None) -> bool:
+    """Remove stored credentials for ``provider``; return False if there were none."""
     oauth_storage = _ensure_storage(storage)
-    credentials = oauth_storage.load_credentials(provider)
-    if not credentials:
-        return None
+    get_token_cache(oauth_storage).invalidate(provider)
+    if not oauth_storage.has_credentials(provider):
+        return False
+    oauth_storage.remove_credentials(provider)
+    return True
+
+
+def get_token_cache(storage: Optional[OAuthStorage] = None) -> OAuthTokenCache:
+    """Return the process-wide token cache for ``storage`` (default: ~/.llm-do)."""
+    oauth_storage = _ensure_storage(storage)
+    cache = _token_caches.get(oauth_storage)
+    if cache is None:
+        cache = _token_caches.setdefault(oauth_storage, OAuthTokenCache(oauth_storage, _refresh))
+    return cache
+
 
-    if credentials.is_expired():
-        try:
-            await refresh_token(provider, storage=oauth_storage)
-            # Reload credentials after refresh
-            credentials = oauth_storage.load_credentials(provider)
-            if not credentials:
-                return None
-        except Exception as exc:
-            logger.warning("Failed to refresh OAuth token for %s: %s", provider, exc)
-            oauth_storage.remove_credentials(provider)
-            return None
+async def get_oauth_api_key(provider: OAuthProvider, storage: Optional[OAuthStorage] = None) -> Optional[str]:
+    """Return an API token for a provider, refreshing if expired.
 
-    return credentials.access
+    Tokens are cached in memory until they expire; see ``OAuthTokenCache``.
+    """
+    return await get_token_cache(storage).get_token(provider)
 
 
 def get_oauth_provider_for_model_provider(model_provider: str) -> Optional[OAuthProvider]:
@@ -88,16 +122,26 @@ def get_oauth_provider_for_model_provider(model_provider: str) -> Optional[OAuth
 
 def _build_anthropic_oauth_model(model_name: str, token: str) -> Any:
     from anthropic import AsyncAnthropic
-    from pydantic_ai.models import cached_async_http_client
     from pydantic_ai.models.anthropic import AnthropicModel
     from pydantic_ai.providers.anthropic import AnthropicProvider
 
-    http_client = cached_async_http_client(provider="anthropic")
+    from ..http_clients import provider_http_client
+
+    http_client = provider_http_client("anthropic")
     client = AsyncAnthropic(auth_token=token, http_client=http_client)
     provider = AnthropicProvider(anthropic_client=client)
     return AnthropicModel(model_name=model_name, provider=provider)
 
 
+def _anthropic_oauth_model(model_name: str, token: str) -> Any:
+    cached = _oauth_models.get(model_name)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    model = _build_anthropic_oauth_model(model_name, token)
+    _oauth_models[model_name] = (token, model)
+    return model
+
+
 async def resolve_oauth_overrides(
     model: Any,
     storage: Optional[OAuthStorage] = None,
@@ -115,7 +159,7 @@ async def resolve_oauth_overrides(
     if not token:
         return None
 
-    oauth_model = _build_anthropic_oauth_model(model_name, token)
+    oauth_model = _anthropic_oauth_model(model_name, token)
     beta_flags = ",".join((ANTHROPIC_OAUTH_BETA, *ANTHROPIC_OAUTH_BETA_FEATURES))
     model_settings: ModelSettings = {
         "extra_headers": {
@@ -135,14 +179,18 @@ __all__ = [
     "ANTHROPIC_OAUTH_BETA",
     "ANTHROPIC_OAUTH_BETA_FEATURES",
     "ANTHROPIC_OAUTH_DANGEROUS_HEADER",
+    "FileLock",
     "OAuthCredentials",
     "OAuthProvider",
     "OAuthStorage",
     "OAuthStorageBackend",
+    "OAuthTokenCache",
     "get_oauth_api_key",
     "get_oauth_path",
     "get_oauth_provider_for_model_provider",
+    "get_token_cache",
     "login_anthropic",
+    "logout",
     "refresh_anthropic_token",
     "refresh_token",
     "resolve_oauth_overrides",
@@ -79,6 +79,9 @@ async def login_anthropic(
     )
 
     oauth_storage.save_credentials("anthropic", credentials)
+    from . import get_token_cache
+
+    get_token_cache(oauth_storage).invalidate("anthropic")
     return credentials
 
 
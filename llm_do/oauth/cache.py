@@ -0,0 +1,121 @@
+"""In-memory OAuth token cache with single-flight refresh."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from typing import Awaitable, Callable, Dict, Optional
+
+from .storage import OAuthCredentials, OAuthProvider, OAuthStorage
+
+logger = logging.getLogger(__name__)
+
+RefreshFn = Callable[[OAuthProvider, OAuthStorage], Awaitable[object]]
+
+
+class OAuthTokenCache:
+    """Credentials of one ``OAuthStorage``, kept in memory until they expire.
+
+    A valid cached token is returned without touching storage. When it expires,
+    callers queue on one lock per provider: the first reloads storage and
+    refreshes if needed, the rest reuse its result. If the backend provides a
+    ``refresh_lock()`` (the filesystem backend does), reload, refresh and save
+    happen under that lock, so processes sharing the credentials file never
+    spend the same refresh token twice.
+    """
+
+    def __init__(self, storage: OAuthStorage, refresh: RefreshFn) -> None:
+        self._storage = storage
+        self._refresh = refresh
+        self._credentials: Dict[str, OAuthCredentials] = {}
+        # asyncio locks belong to one event loop; keep a set per loop.
+        self._locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def storage(self) -> OAuthStorage:
+        return self._storage
+
+    def cached(self, provider: OAuthProvider) -> Optional[OAuthCredentials]:
+        """Return the cached credentials without loading or validating them."""
+        return self._credentials.get(provider)
+
+    def invalidate(self, provider: Optional[OAuthProvider] = None) -> None:
+        """Forget cached credentials for ``provider`` (or all providers)."""
+        if provider is None:
+            self._credentials.clear()
+        else:
+            self._credentials.pop(provider, None)
+
+    async def get_token(self, provider: OAuthProvider) -> Optional[str]:
+        """Return a valid access token, or None if not logged in."""
+        credentials = self._fresh(provider)
+        if credentials is not None:
+            return credentials.access
+        async with self._lock(provider):
+            credentials = self._fresh(provider)
+            if credentials is None:
+                credentials = await self._load_or_refresh(provider)
+                if credentials is None:
+                    self._credentials.pop(provider, None)
+                    return None
+                self._credentials[provider] = credentials
+        return credentials.access
+
+    async def refresh(self, provider: OAuthProvider) -> str:
+        """Refresh ``provider``'s token now, even if the cached one is still valid.
+
+        Unlike an expiry refresh, failures are raised and the stored
+        credentials are kept.
+        """
+        async with self._lock(provider):
+            self._credentials.pop(provider, None)
+            credentials = await self._load_or_refresh(provider, force=True)
+            if credentials is None:
+                raise RuntimeError(f"No OAuth credentials found for {provider}")
+            self._credentials[provider] = credentials
+        return credentials.access
+
+    def _fresh(self, provider: OAuthProvider) -> Optional[OAuthCredentials]:
+        credentials = self._credentials.get(provider)
+        if credentials is None or credentials.is_expired():
+            return None
+        return credentials
+
+    def _lock(self, provider: OAuthProvider) -> asyncio.Lock:
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.get(provider)
+        if lock is None:
+            lock = locks[provider] = asyncio.Lock()
+        return lock
+
+    async def _load_or_refresh(
+        self, provider: OAuthProvider, *, force: bool = False
+    ) -> Optional[OAuthCredentials]:
+        file_lock = self._storage.refresh_lock()
+        if file_lock is not None:
+            acquiring = asyncio.ensure_future(asyncio.to_thread(file_lock.acquire))
+            try:
+                await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                # The worker thread still gets the lock; hand it back when it does.
+                acquiring.add_done_callback(lambda _: file_lock.release())
+                raise
+        try:
+            # Another process may have refreshed while we waited for the lock.
+            credentials = self._storage.load_credentials(provider)
+            if credentials is None or (not force and not credentials.is_expired()):
+                return credentials
+            try:
+                await self._refresh(provider, self._storage)
+                return self._storage.load_credentials(provider)
+            except Exception as exc:
+                if force:
+                    raise
+                logger.warning("Failed to refresh OAuth token for %s: %s", provider, exc)
+                self._storage.remove_credentials(provider)
+                return None
+        finally:
+            if file_lock is not None:
+                file_lock.release()
@@ -3,9 +3,15 @@ from __future__ import annotations
 
 import json
 import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Literal, Optional, Protocol
+from typing import IO, Dict, Literal, Optional, Protocol
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
 
 OAuthProvider = Literal["anthropic"]
 
@@ -72,8 +78,51 @@ class OAuthCredentials:
         )
 
 
+class FileLock:
+    """Exclusive advisory lock on a sidecar file, shared across processes.
+
+    Uses ``fcntl.flock``, so it also excludes other open handles in this
+    process. Where ``fcntl`` is unavailable the lock is a no-op.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle: IO[str] | None = None
+
+    def acquire(self) -> None:
+        """Block until the lock is held."""
+        self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        handle = open(self.path, "a", encoding="utf-8")
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                handle.close()
+                raise
+        self._handle = handle
+
+    def release(self) -> None:
+        handle, self._handle = self._handle, None
+        if handle is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        handle.close()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.release()
+
+
 class OAuthStorageBackend(Protocol):
-    """Storage backend protocol for OAuth credentials."""
+    """Storage backend protocol for OAuth credentials.
+
+    Backends shared between processes may also define ``refresh_lock()``
+    returning a ``FileLock`` that is held while a token is refreshed.
+    """
 
     def load(self) -> Dict[str, OAuthCredentials]:
         """Load all OAuth credentials."""
@@ -109,11 +158,23 @@ class FileSystemStorage:
     def save(self, storage: Dict[str, OAuthCredentials]) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
         data = {provider: creds.to_dict() for provider, creds in storage.items()}
-        self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        # mkstemp creates the file 0600; replacing it keeps readers from
+        # seeing a partially written file.
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
         try:
-            os.chmod(self.path, 0o600)
-        except OSError:
-            pass
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, indent=2))
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def refresh_lock(self) -> FileLock:
+        """Lock serializing token refreshes across processes sharing this file."""
+        return FileLock(self.path.with_name(self.path.name + ".lock"))
 
 
 class OAuthStorage:
@@ -142,6 +203,11 @@ class OAuthStorage:
         storage.pop(provider, None)
         self._backend.save(storage)
 
+    def refresh_lock(self) -> Optional[FileLock]:
+        """Return the backend's cross-process refresh lock, if it has one."""
+        factory = getattr(self._backend, "refresh_lock", None)
+        return factory() if factory is not None else None
+
     def has_credentials(self, provider: OAuthProvider) -> bool:
         """Return True if OAuth credentials exist for a provider."""
         return self.load_credentials(provider) is not None
@@ -15,6 +15,7 @@ from .discovery import (
     load_module,
     load_tools_from_files,
     load_toolsets_from_files,
+    unload_module,
 )
 from .entry_resolver import resolve_entry
 from .host_toolsets import (
@@ -25,14 +26,26 @@ from .host_toolsets import (
 )
 from .manifest import (
     EntryConfig,
+    HttpClientConfig,
     ManifestRuntimeConfig,
     ProjectManifest,
     load_manifest,
+    resolve_capability_policy,
     resolve_generated_agents_dir,
+    resolve_http_client_settings,
     resolve_manifest_paths,
 )
-from .registry import AgentRegistry, AgentToolsetFactory, build_registry
+from .registry import (
+    AgentRegistry,
+    AgentToolsetFactory,
+    RegistryBuilder,
+    build_registry,
+    reachable_agents,
+    warm_up_entry,
+)
+from .reload import ProjectReloader, ReloadResult
 from .tool_resolution import resolve_tool_defs, resolve_toolset_defs
+from .watch import FileWatcher
 
 __all__ = [
     "AgentDefinition",
@@ -47,12 +60,16 @@ __all__ = [
     "load_module",
     "load_tools_from_files",
     "load_toolsets_from_files",
+    "unload_module",
     "resolve_entry",
     "ProjectManifest",
     "ManifestRuntimeConfig",
     "EntryConfig",
+    "HttpClientConfig",
     "load_manifest",
+    "resolve_capability_policy",
     "resolve_generated_agents_dir",
+    "resolve_http_client_settings",
     "resolve_manifest_paths",
     "build_host_toolsets",
     "build_agent_toolset_factory",
@@ -61,6 +78,12 @@ __all__ = [
     "AgentRegistry",
     "AgentToolsetFactory",
     "build_registry",
+    "RegistryBuilder",
+    "reachable_agents",
+    "warm_up_entry",
+    "ProjectReloader",
+    "ReloadResult",
+    "FileWatcher",
     "resolve_tool_defs",
     "resolve_toolset_defs",
 ]
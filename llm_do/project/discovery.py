@@ -1,11 +1,14 @@
 """Module loading and tool/toolset discovery."""
 from __future__ import annotations
 
+import importlib
 import importlib.util
+import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 from types import ModuleType
-from typing import Iterable, TypeVar
+from typing import Iterable, Iterator, TypeVar
 
 from pydantic_ai.tools import Tool
 from pydantic_ai.toolsets import AbstractToolset
@@ -20,6 +23,7 @@ from ..runtime.tooling import (
 )
 
 _LOADED_MODULES: dict[Path, ModuleType] = {}
+_MODULE_PREFIX = "_llm_do_runtime_"
 
 
 def load_module(path: str | Path) -> ModuleType:
@@ -28,7 +32,7 @@ def load_module(path: str | Path) -> ModuleType:
     if cached is not None:
         return cached
     module_name = (
-        f"_llm_do_runtime_{resolved.stem}_{hash(str(resolved)) & 0xFFFFFFFF:08x}"
+        f"{_MODULE_PREFIX}{resolved.stem}_{hash(str(resolved)) & 0xFFFFFFFF:08x}"
     )
     spec = importlib.util.spec_from_file_location(module_name, resolved)
     if spec is None or spec.loader is None:
@@ -45,6 +49,55 @@ def load_module(path: str | Path) -> ModuleType:
     return module
 
 
+def unload_module(path: str | Path) -> list[str]:
+    """Forget the module(s) loaded from ``path`` so the next import re-executes it.
+
+    Drops the ``load_module`` cache entry and every ``sys.modules`` entry whose
+    ``__file__`` is ``path`` (project helpers imported by name). Returns the
+    evicted module names.
+    """
+    resolved = Path(path).resolve()
+    _LOADED_MODULES.pop(resolved, None)
+    target = str(resolved)
+    evicted: list[str] = []
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if not module_file:
+            continue
+        if module_file != target and (
+            os.path.basename(module_file) != resolved.name
+            or os.path.realpath(module_file) != target
+        ):
+            continue
+        del sys.modules[name]
+        evicted.append(name)
+    importlib.invalidate_caches()
+    return evicted
+
+
+@contextmanager
+def restore_modules_on_error() -> Iterator[None]:
+    """Undo ``load_module``/``unload_module`` calls made in the block if it raises.
+
+    A reload has to evict a module before re-executing it; on failure the
+    evicted modules are put back, so imports stay as they were before.
+    """
+    loaded = dict(_LOADED_MODULES)
+    modules = dict(sys.modules)
+    try:
+        yield
+    except BaseException:
+        _LOADED_MODULES.clear()
+        _LOADED_MODULES.update(loaded)
+        for name in [name for name in sys.modules if name not in modules]:
+            if name.startswith(_MODULE_PREFIX):
+                del sys.modules[name]
+        for name, module in modules.items():
+            if sys.modules.get(name) is not module:
+                sys.modules[name] = module
+        raise
+
+
 T = TypeVar("T")
 
 
@@ -244,6 +297,17 @@ def discover_agents_from_module(module: ModuleType) -> list[AgentSpec]:
     return _discover_from_module(module, AgentSpec)
 
 
+def discover_all_from_module(
+    module: ModuleType,
+) -> tuple[dict[str, ToolDef], dict[str, ToolsetDef], list[AgentSpec]]:
+    """Discover the tools, toolsets, and agents one module contributes."""
+    return (
+        discover_tools_from_module(module),
+        discover_toolsets_from_module(module),
+        discover_agents_from_module(module),
+    )
+
+
 def load_toolsets_from_files(files: list[str | Path]) -> dict[str, ToolsetDef]:
     all_toolsets: dict[str, ToolsetDef] = {}
     for file_path in files:
@@ -315,10 +379,9 @@ def load_all_from_files(
             continue
         loaded_paths.add(resolved)
 
-        module = load_module(resolved)
-        module_tools = discover_tools_from_module(module)
-        module_toolsets = discover_toolsets_from_module(module)
-        module_agents = discover_agents_from_module(module)
+        module_tools, module_toolsets, module_agents = discover_all_from_module(
+            load_module(resolved)
+        )
 
         for name, tool in module_tools.items():
             if name in tools:
@@ -13,8 +13,12 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+from ..http_clients import HttpClientSettings
+from ..runtime.capabilities import CapabilityPolicy, CapabilityRule
+
 ApprovalMode = Literal["prompt", "approve_all", "reject_all"]
 AuthMode = Literal["oauth_off", "oauth_auto", "oauth_required"]
+CapabilityDecision = Literal["allow", "deny", "prompt"]
 
 
 class AgentApprovalOverride(BaseModel):
@@ -26,6 +30,50 @@ class AgentApprovalOverride(BaseModel):
     attachments_require_approval: bool | None = None
 
 
+class CapabilityRuleConfig(BaseModel):
+    """One capability pattern and its approval outcome."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    capability: str
+    decision: CapabilityDecision
+
+    @model_validator(mode="after")
+    def validate_pattern(self) -> "CapabilityRuleConfig":
+        CapabilityRule(capability=self.capability, decision=self.decision)
+        return self
+
+
+class CapabilityPolicyConfig(BaseModel):
+    """Declarative capability policy (rules + optional persisted grants file)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    rules: list[CapabilityRuleConfig] = Field(default_factory=list)
+    decisions_path: str | None = None
+
+    @field_validator("decisions_path")
+    @classmethod
+    def validate_decisions_path(cls, v: str | None) -> str | None:
+        if v is not None and not v.strip():
+            raise ValueError("decisions_path must be a non-empty string")
+        return v
+
+
+class HttpClientConfig(BaseModel):
+    """HTTP client settings for one provider (keyed by provider name, e.g. ``openai``)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    max_connections: int | None = Field(default=100, ge=1)
+    max_keepalive_connections: int | None = Field(default=20, ge=0)
+    keepalive_expiry: float | None = Field(default=5.0, ge=0)
+    http2: bool = False
+    timeout: float = Field(default=600.0, gt=0)
+    connect_timeout: float = Field(default=5.0, gt=0)
+    warmup_connections: int = Field(default=0, ge=0)
+
+
 class ManifestRuntimeConfig(BaseModel):
     """Runtime configuration from manifest."""
 
@@ -38,6 +86,8 @@ class ManifestRuntimeConfig(BaseModel):
     agent_calls_require_approval: bool = False
     agent_attachments_require_approval: bool = False
     agent_approval_overrides: dict[str, AgentApprovalOverride] = Field(default_factory=dict)
+    capability_policy: CapabilityPolicyConfig | None = None
+    http_clients: dict[str, HttpClientConfig] = Field(default_factory=dict)
 
 
 class EntryConfig(BaseModel):
@@ -201,3 +251,27 @@ def resolve_generated_agents_dir(
     if not path.is_absolute():
         return (manifest_dir / path).resolve()
     return path.resolve()
+
+
+def resolve_capability_policy(
+    manifest: ProjectManifest,
+    manifest_dir: Path,
+) -> CapabilityPolicy | None:
+    """Compile the manifest capability policy (decisions_path is manifest-relative)."""
+    config = manifest.runtime.capability_policy
+    if config is None:
+        return None
+    decisions_path = None
+    if config.decisions_path is not None:
+        decisions_path = Path(config.decisions_path).expanduser()
+        if not decisions_path.is_absolute():
+            decisions_path = (manifest_dir / decisions_path).resolve()
+    return CapabilityPolicy.from_config(config.rules, decisions_path=decisions_path)
+
+
+def resolve_http_client_settings(manifest: ProjectManifest) -> dict[str, HttpClientSettings]:
+    """Per-provider HTTP client settings from ``runtime.http_clients``."""
+    return {
+        provider: HttpClientSettings(**config.model_dump())
+        for provider, config in manifest.runtime.http_clients.items()
+    }
@@ -1,9 +1,12 @@
 """Agent registry and builder utilities."""
 from __future__ import annotations
 
+import os
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Mapping, TypeAlias, cast
+from types import ModuleType
+from typing import Any, Callable, Iterable, Mapping, Sequence, TypeAlias, cast
 
 from pydantic_ai.builtin_tools import (
     CodeExecutionTool,
@@ -12,12 +15,18 @@ from pydantic_ai.builtin_tools import (
     WebSearchTool,
 )
 
-from ..models import select_model_with_id
-from ..runtime.args import AgentArgs
-from ..runtime.contracts import AgentSpec
+from ..http_clients import warm_up_connections
+from ..models import ModelCache, select_model_with_id
+from ..runtime.args import AgentArgs, PromptInput
+from ..runtime.contracts import AgentEntry, AgentSpec, Entry
 from ..runtime.tooling import ToolDef, ToolsetDef
 from .agent_file import AgentDefinition, build_agent_definition, load_agent_file_parts
-from .discovery import load_all_from_files
+from .discovery import (
+    discover_all_from_module,
+    load_module,
+    restore_modules_on_error,
+    unload_module,
+)
 from .input_model_refs import resolve_input_model_ref
 from .tool_resolution import resolve_tool_defs, resolve_toolset_defs
 
@@ -41,6 +50,16 @@ class AgentFileSpec:
     spec: AgentSpec
 
 
+@dataclass(frozen=True, slots=True)
+class _ModuleDefs:
+    """What one Python file contributed to the registry."""
+
+    module: ModuleType
+    tools: dict[str, ToolDef]
+    toolsets: dict[str, ToolsetDef]
+    agents: list[AgentSpec]
+
+
 AgentToolsetFactory: TypeAlias = Callable[[str, AgentSpec], ToolsetDef]
 
 
@@ -86,113 +105,355 @@ def _merge_registry(
     return merged
 
 
-def build_registry(
-    agent_files: list[str],
-    python_files: list[str],
-    *,
-    project_root: Path | str | None,
-    extra_toolsets: Mapping[str, ToolsetDef],
-    agent_toolset_factory: AgentToolsetFactory,
-) -> AgentRegistry:
-    if project_root is None:
-        raise ValueError("project_root is required to build registry")
-    if extra_toolsets is None:
-        raise ValueError("extra_toolsets is required to build registry")
-    if agent_toolset_factory is None:
-        raise ValueError("agent_toolset_factory is required to build registry")
-
-    project_root_path = Path(project_root).resolve()
-    if not project_root_path.exists():
-        raise FileNotFoundError(f"project_root not found: {project_root_path}")
-
-    python_tools, python_toolsets, python_agents = load_all_from_files(python_files)
-
-    if not agent_files and not python_files:
-        raise ValueError("At least one agent_files or python_files entry is required")
-
-    agent_file_specs: dict[str, AgentFileSpec] = {}
-    reserved_names = set(python_agents.keys())
-
-    for agent_file_path in agent_files:
-        resolved_path = Path(agent_file_path).resolve()
-        frontmatter, instructions = load_agent_file_parts(resolved_path)
-        agent_def = build_agent_definition(frontmatter, instructions)
-        name = agent_def.name
+def _imports_any(module: ModuleType, names: set[str]) -> bool:
+    """True if ``module`` holds a reference to one of the named modules or their objects."""
+    for value in vars(module).values():
+        if isinstance(value, ModuleType):
+            if value.__name__ in names:
+                return True
+        elif getattr(value, "__module__", None) in names:
+            return True
+    return False
+
+
+def _same_defs(current: Sequence[Any], resolved: Sequence[Any]) -> bool:
+    """Compare resolved tool/toolset lists by identity, looking through validation wrappers."""
+    if len(current) != len(resolved):
+        return False
+    return all(
+        getattr(old, "__wrapped__", old) is getattr(new, "__wrapped__", new)
+        for old, new in zip(current, resolved)
+    )
 
-        if name in agent_file_specs:
-            raise ValueError(f"Duplicate agent name: {name}")
 
-        if name in reserved_names:
-            raise ValueError(
-                f"Agent name '{name}' conflicts with Python agent"
+class RegistryBuilder:
+    """Builds an AgentRegistry and rebuilds it incrementally after file changes.
+
+    ``build()`` does what ``build_registry`` does. ``rebuild(changed)`` re-imports
+    only the changed Python files (plus project modules importing a changed helper
+    module, directly or through other project modules), re-parses only the changed
+    agent files, and relinks only agents whose definition or referenced
+    tools/toolsets changed. Agent-file specs keep their identity across rebuilds
+    and are updated in place, so agent toolsets and entries pointing at them stay
+    valid. A failed rebuild leaves the previous registry and the previously
+    imported modules untouched; its files are retried on the next rebuild.
+    """
+
+    def __init__(
+        self,
+        agent_files: Sequence[str | Path],
+        python_files: Sequence[str | Path],
+        *,
+        project_root: Path | str | None,
+        extra_toolsets: Mapping[str, ToolsetDef],
+        agent_toolset_factory: AgentToolsetFactory,
+        model_cache: ModelCache | None = None,
+    ) -> None:
+        if project_root is None:
+            raise ValueError("project_root is required to build registry")
+        if extra_toolsets is None:
+            raise ValueError("extra_toolsets is required to build registry")
+        if agent_toolset_factory is None:
+            raise ValueError("agent_toolset_factory is required to build registry")
+
+        project_root_path = Path(project_root).resolve()
+        if not project_root_path.exists():
+            raise FileNotFoundError(f"project_root not found: {project_root_path}")
+        if not agent_files and not python_files:
+            raise ValueError("At least one agent_files or python_files entry is required")
+
+        self.project_root = project_root_path
+        self.agent_paths = tuple(Path(path).resolve() for path in agent_files)
+        self.python_paths = tuple(
+            dict.fromkeys(
+                Path(path).resolve() for path in python_files if Path(path).suffix == ".py"
             )
-        reserved_names.add(name)
-
+        )
+        self._extra_toolsets = dict(extra_toolsets)
+        self._agent_toolset_factory = agent_toolset_factory
+        # Agents naming the same model share one instance, across rebuilds too.
+        self.model_cache = model_cache if model_cache is not None else ModelCache()
+        self._modules: dict[Path, _ModuleDefs] = {}
+        self._definitions: dict[Path, AgentDefinition] = {}
+        self._file_specs: dict[str, AgentFileSpec] = {}
+        self._agent_toolsets: dict[str, tuple[AgentSpec, ToolsetDef]] = {}
+        self._pending: set[Path] = set()
+        self.registry: AgentRegistry | None = None
+        self.last_rebuilt: frozenset[str] = frozenset()
+
+    @property
+    def modules(self) -> list[ModuleType]:
+        """Modules loaded from ``python_paths`` by the last successful build."""
+        return [defs.module for defs in self._modules.values()]
+
+    @property
+    def pending(self) -> frozenset[Path]:
+        """Changed files of a failed rebuild, retried by the next one."""
+        return frozenset(self._pending)
+
+    def build(self) -> AgentRegistry:
+        return self.rebuild(())
+
+    def rebuild(self, changed: Iterable[str | Path] = ()) -> AgentRegistry:
+        """Rebuild after ``changed`` files were edited; returns the new registry."""
+        changed_paths = {Path(path).resolve() for path in changed} | self._pending
+        self._pending = changed_paths
+
+        # Modules evicted for re-import are put back if anything below fails.
+        with restore_modules_on_error():
+            modules = self._load_modules(changed_paths)
+            python_tools, python_toolsets, python_agents = self._merge_modules(modules)
+
+            definitions: dict[Path, AgentDefinition] = {}
+            for path in self.agent_paths:
+                definition = None if path in changed_paths else self._definitions.get(path)
+                if definition is None:
+                    frontmatter, instructions = load_agent_file_parts(path)
+                    definition = build_agent_definition(frontmatter, instructions)
+                definitions[path] = definition
+
+            file_specs: dict[str, AgentFileSpec] = {}
+            updates: dict[str, dict[str, Any]] = {}
+            reserved_names = set(python_agents.keys())
+            for path in self.agent_paths:
+                agent_def = definitions[path]
+                name = agent_def.name
+                if name in file_specs:
+                    raise ValueError(f"Duplicate agent name: {name}")
+                if name in reserved_names:
+                    raise ValueError(
+                        f"Agent name '{name}' conflicts with Python agent"
+                    )
+                reserved_names.add(name)
+
+                current = self._file_specs.get(name)
+                if current is not None and current.definition is agent_def:
+                    file_specs[name] = current
+                    updates[name] = {}
+                    continue
+                fields = self._definition_fields(name, agent_def)
+                if current is None:
+                    spec = AgentSpec(name=name, tools=[], toolsets=[], **fields)
+                    fields = {}
+                else:
+                    spec = current.spec
+                file_specs[name] = AgentFileSpec(
+                    name=name,
+                    path=path,
+                    definition=agent_def,
+                    spec=spec,
+                )
+                updates[name] = fields
+
+            agents: dict[str, AgentSpec] = dict(python_agents)
+            agents.update({name: file_spec.spec for name, file_spec in file_specs.items()})
+
+            agent_toolsets: dict[str, ToolsetDef] = {}
+            for name, spec in agents.items():
+                cached = self._agent_toolsets.get(name)
+                if cached is not None and cached[0] is spec:
+                    agent_toolsets[name] = cached[1]
+                else:
+                    agent_toolsets[name] = self._agent_toolset_factory(name, spec)
+            all_toolsets = _merge_registry(
+                "toolset",
+                self._extra_toolsets,
+                python_toolsets,
+                agent_toolsets,
+            )
+            all_tools = _merge_registry("tool", python_tools)
+
+            for name, file_spec in file_specs.items():
+                self._link_agent_file(file_spec, updates[name], all_tools, all_toolsets)
+
+            previous = self.registry.agents if self.registry is not None else {}
+            rebuilt = {
+                name
+                for name, spec in agents.items()
+                if previous.get(name) is not spec or updates.get(name)
+            }
+
+        # Commit: nothing shared was touched until every file loaded and linked.
+        for name, fields in updates.items():
+            for field_name, value in fields.items():
+                setattr(file_specs[name].spec, field_name, value)
+        self._modules = modules
+        self._definitions = definitions
+        self._file_specs = file_specs
+        self._agent_toolsets = {
+            name: (agents[name], toolset) for name, toolset in agent_toolsets.items()
+        }
+        self._pending = set()
+        self.last_rebuilt = frozenset(rebuilt)
+        self.registry = AgentRegistry(agents=agents, tools=all_tools, toolsets=all_toolsets)
+        return self.registry
+
+    def _load_modules(self, changed: set[Path]) -> dict[Path, _ModuleDefs]:
+        python_set = set(self.python_paths)
+        modules = {path: defs for path, defs in self._modules.items() if path not in changed}
+        stale_names: set[str] = set()
+        for path in changed:
+            if path.suffix == ".py" and path not in python_set:
+                stale_names.update(unload_module(path))
+        if stale_names:
+            stale_names |= self._unload_importers(stale_names)
+            modules = {
+                path: defs
+                for path, defs in modules.items()
+                if defs.module.__name__ not in stale_names
+                and not _imports_any(defs.module, stale_names)
+            }
+        for path in self.python_paths:
+            if path in modules:
+                continue
+            if path in self._modules:
+                unload_module(path)
+            module = load_module(path)
+            modules[path] = _ModuleDefs(module, *discover_all_from_module(module))
+        return {path: modules[path] for path in self.python_paths}
+
+    def _unload_importers(self, names: set[str]) -> set[str]:
+        """Unload project-local modules importing ``names``, following the import chain.
+
+        Returns every module name evicted, ``names`` included.
+        """
+        root = str(self.project_root) + os.sep
+        stale = set(names)
+        frontier = set(names)
+        while frontier:
+            importers = [
+                module
+                for name, module in list(sys.modules.items())
+                if name not in stale
+                and (getattr(module, "__file__", None) or "").startswith(root)
+                and _imports_any(module, frontier)
+            ]
+            frontier = set()
+            for module in importers:
+                frontier.update(unload_module(module.__file__))
+            frontier -= stale
+            stale |= frontier
+        return stale
+
+    @staticmethod
+    def _merge_modules(
+        modules: Mapping[Path, _ModuleDefs],
+    ) -> tuple[dict[str, ToolDef], dict[str, ToolsetDef], dict[str, AgentSpec]]:
+        tools = _merge_registry("tool", *(defs.tools for defs in modules.values()))
+        toolsets = _merge_registry("toolset", *(defs.toolsets for defs in modules.values()))
+        agents: dict[str, AgentSpec] = {}
+        agent_paths: dict[str, Path] = {}
+        for path, defs in modules.items():
+            for agent in defs.agents:
+                if agent.name in agents:
+                    raise ValueError(
+                        f"Duplicate agent name: {agent.name} "
+                        f"(from {agent_paths[agent.name]} and {path})"
+                    )
+                agents[agent.name] = agent
+                agent_paths[agent.name] = path
+        return tools, toolsets, agents
+
+    def _definition_fields(self, name: str, agent_def: AgentDefinition) -> dict[str, Any]:
+        """Spec fields that come straight from an agent file."""
         selection = select_model_with_id(
             agent_model=agent_def.model,
             compatible_models=agent_def.compatible_models,
             agent_name=name,
+            cache=self.model_cache,
         )
-        spec = AgentSpec(
-            name=name,
-            instructions=agent_def.instructions,
-            description=agent_def.description,
-            model=selection.model,
-            model_id=selection.model_id,
-            tools=[],
-            toolsets=[],
-            builtin_tools=_build_builtin_tools(agent_def.server_side_tools),
-        )
-        agent_file_specs[name] = AgentFileSpec(
-            name=name,
-            path=resolved_path,
-            definition=agent_def,
-            spec=spec,
-        )
-
-    agents: dict[str, AgentSpec] = dict(python_agents)
-    agents.update({spec.name: spec.spec for spec in agent_file_specs.values()})
-
-    host_toolsets = dict(extra_toolsets)
-    agent_toolsets = {
-        name: agent_toolset_factory(name, spec)
-        for name, spec in agents.items()
-    }
-    all_toolsets = _merge_registry(
-        "toolset",
-        host_toolsets,
-        python_toolsets,
-        agent_toolsets,
-    )
-    all_tools = _merge_registry("tool", python_tools)
-
-    for agent_file_spec in agent_file_specs.values():
-        agent_root = agent_file_spec.path.parent
+        return {
+            "instructions": agent_def.instructions,
+            "description": agent_def.description,
+            "model": selection.model,
+            "model_id": selection.model_id,
+            "builtin_tools": _build_builtin_tools(agent_def.server_side_tools),
+        }
+
+    @staticmethod
+    def _link_agent_file(
+        file_spec: AgentFileSpec,
+        updates: dict[str, Any],
+        all_tools: Mapping[str, ToolDef],
+        all_toolsets: Mapping[str, ToolsetDef],
+    ) -> None:
+        """Record in ``updates`` the tools, toolsets and input model that changed."""
+        spec = file_spec.spec
         resolved_tools = resolve_tool_defs(
-            agent_file_spec.definition.tools,
+            file_spec.definition.tools,
             available_tools=all_tools,
-            agent_name=agent_file_spec.name,
+            agent_name=file_spec.name,
         )
         resolved_toolsets = resolve_toolset_defs(
-            agent_file_spec.definition.toolsets,
+            file_spec.definition.toolsets,
             available_toolsets=all_toolsets,
-            agent_name=agent_file_spec.name,
+            agent_name=file_spec.name,
         )
+        if not _same_defs(spec.tools, resolved_tools):
+            updates["tools"] = resolved_tools
+        if not _same_defs(spec.toolsets, resolved_toolsets):
+            updates["toolsets"] = resolved_toolsets
 
-        agent_file_spec.spec.tools = resolved_tools
-        agent_file_spec.spec.toolsets = resolved_toolsets
-
-        if agent_file_spec.definition.input_model_ref:
+        input_model: type[AgentArgs] = PromptInput
+        if file_spec.definition.input_model_ref:
             resolved_input_model = resolve_input_model_ref(
-                agent_file_spec.definition.input_model_ref,
-                base_path=agent_root,
+                file_spec.definition.input_model_ref,
+                base_path=file_spec.path.parent,
             )
             if not issubclass(resolved_input_model, AgentArgs):
                 raise TypeError(
                     "input_model_ref must resolve to an AgentArgs subclass"
                 )
-            agent_file_spec.spec.input_model = cast(
-                type[AgentArgs], resolved_input_model
-            )
+            input_model = cast(type[AgentArgs], resolved_input_model)
+        if spec.input_model is not input_model:
+            updates["input_model"] = input_model
 
-    return AgentRegistry(agents=agents, tools=all_tools, toolsets=all_toolsets)
+
+def build_registry(
+    agent_files: list[str],
+    python_files: list[str],
+    *,
+    project_root: Path | str | None,
+    extra_toolsets: Mapping[str, ToolsetDef],
+    agent_toolset_factory: AgentToolsetFactory,
+    model_cache: ModelCache | None = None,
+) -> AgentRegistry:
+    return RegistryBuilder(
+        agent_files,
+        python_files,
+        project_root=project_root,
+        extra_toolsets=extra_toolsets,
+        agent_toolset_factory=agent_toolset_factory,
+        model_cache=model_cache,
+    ).build()
+
+
+def reachable_agents(entry: Entry, registry: AgentRegistry) -> list[AgentSpec]:
+    """The entry's agent plus every agent reachable through agent toolsets.
+
+    A function entry can call any agent, so it reaches every registered agent.
+    """
+    if not isinstance(entry, AgentEntry):
+        return list(registry.agents.values())
+    agents_by_toolset = {
+        id(registry.toolsets[name]): spec
+        for name, spec in registry.agents.items()
+        if name in registry.toolsets
+    }
+    reached: dict[int, AgentSpec] = {}
+    pending = [entry.spec]
+    while pending:
+        spec = pending.pop()
+        if id(spec) in reached:
+            continue
+        reached[id(spec)] = spec
+        for toolset in spec.toolsets:
+            target = agents_by_toolset.get(id(getattr(toolset, "__wrapped__", toolset)))
+            if target is not None:
+                pending.append(target)
+    return list(reached.values())
+
+
+async def warm_up_entry(entry: Entry, registry: AgentRegistry) -> dict[str, int]:
+    """Pre-open provider connections for the models the entry can reach."""
+    return await warm_up_connections(spec.model for spec in reachable_agents(entry, registry))
@@ -0,0 +1,123 @@
+"""Hot reload of a manifest project between turns of a long-lived session.
+
+``ProjectReloader`` is an entry factory (``() -> (entry, registry)``) that keeps
+its ``RegistryBuilder`` and a ``FileWatcher`` on the project's agent files,
+Python files and the project-local modules they import. ``reload()`` asks the
+watcher what changed and, if anything did, rebuilds only the affected registry
+entries and re-resolves the entry. Manifest edits (new files, a different
+entry) still need a restart.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..runtime import Entry
+from .entry_resolver import resolve_entry
+from .host_toolsets import build_registry_host_wiring
+from .manifest import ProjectManifest, resolve_manifest_paths
+from .registry import AgentRegistry, RegistryBuilder
+from .watch import FileWatcher
+
+
+@dataclass(frozen=True, slots=True)
+class ReloadResult:
+    """A rebuilt entry/registry and what caused it."""
+
+    entry: Entry
+    registry: AgentRegistry
+    changed: tuple[Path, ...]
+    rebuilt: frozenset[str]
+
+
+def _project_module_files(project_root: Path) -> list[Path]:
+    """Source files of imported modules that live under ``project_root``."""
+    prefix = str(project_root) + os.sep
+    files: list[Path] = []
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if not module_file or not module_file.endswith(".py"):
+            continue
+        if not module_file.startswith(prefix) or "site-packages" in module_file:
+            continue
+        files.append(Path(module_file))
+    return files
+
+
+class ProjectReloader:
+    """Entry factory that rebuilds changed parts of the project on ``reload()``."""
+
+    def __init__(
+        self,
+        manifest: ProjectManifest,
+        manifest_dir: Path,
+        *,
+        use_inotify: bool = True,
+    ) -> None:
+        self._manifest = manifest
+        self._manifest_dir = Path(manifest_dir).resolve()
+        self._use_inotify = use_inotify
+        self._builder: RegistryBuilder | None = None
+        self._watcher: FileWatcher | None = None
+
+    @property
+    def watcher(self) -> FileWatcher | None:
+        return self._watcher
+
+    def __call__(self) -> tuple[Entry, AgentRegistry]:
+        agent_paths, python_paths = resolve_manifest_paths(self._manifest, self._manifest_dir)
+        builder = RegistryBuilder(
+            [str(p) for p in agent_paths],
+            [str(p) for p in python_paths],
+            project_root=self._manifest_dir,
+            **build_registry_host_wiring(self._manifest_dir),
+        )
+        registry = builder.build()
+        entry = self._resolve_entry(builder, registry)
+        self._builder = builder
+        if self._watcher is not None:
+            self._watcher.close()
+        self._watcher = FileWatcher(use_inotify=self._use_inotify)
+        self._watch_project()
+        return entry, registry
+
+    def reload(self) -> ReloadResult | None:
+        """Rebuild if watched files changed since the last check; None if nothing did.
+
+        Raises whatever the rebuild raises; the previous entry and registry stay
+        valid and the failed files are retried on the next call.
+        """
+        if self._builder is None or self._watcher is None:
+            return None
+        changed = self._watcher.changed()
+        if not changed and not self._builder.pending:
+            return None
+        registry = self._builder.rebuild(changed)
+        entry = self._resolve_entry(self._builder, registry)
+        self._watch_project()
+        return ReloadResult(
+            entry=entry,
+            registry=registry,
+            changed=tuple(sorted(changed)),
+            rebuilt=self._builder.last_rebuilt,
+        )
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+
+    def _resolve_entry(self, builder: RegistryBuilder, registry: AgentRegistry) -> Entry:
+        return resolve_entry(
+            self._manifest.entry,
+            registry,
+            python_files=builder.python_paths,
+            base_path=self._manifest_dir,
+        )
+
+    def _watch_project(self) -> None:
+        assert self._builder is not None and self._watcher is not None
+        self._watcher.watch(self._builder.agent_paths)
+        self._watcher.watch(self._builder.python_paths)
+        self._watcher.watch(_project_module_files(self._manifest_dir))
@@ -0,0 +1,157 @@
+"""Change detection for project files in long-lived sessions.
+
+``FileWatcher`` answers "which of these files changed since I last asked?".
+On Linux it listens with inotify on the files' directories (editors often
+save by writing a new file and renaming it over the old one), so a check
+between turns costs one non-blocking read. Elsewhere, or if inotify is
+unavailable, it falls back to comparing ``stat`` signatures of every file.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable, Literal
+
+WatchBackend = Literal["inotify", "polling"]
+
+# <sys/inotify.h>
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+_WATCH_MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+Signature = tuple[int, int, int] | None
+
+
+def _signature(path: Path) -> Signature:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class _Inotify:
+    """Minimal non-blocking inotify reader (via libc, no extra dependency)."""
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._fd = fd
+        self._dirs: dict[int, Path] = {}
+        self._watched: set[Path] = set()
+
+    def watch_dir(self, directory: Path) -> None:
+        if directory in self._watched:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._dirs[wd] = directory
+        self._watched.add(directory)
+
+    def drain(self) -> set[Path] | None:
+        """Paths named by pending events; None if the kernel queue overflowed."""
+        touched: set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is not None and raw_name:
+                    touched.add(directory / os.fsdecode(raw_name))
+        return None if overflow else touched
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class FileWatcher:
+    """Report which watched files were written, replaced or removed since the last check."""
+
+    def __init__(self, paths: Iterable[str | Path] = (), *, use_inotify: bool = True) -> None:
+        self._signatures: dict[Path, Signature] = {}
+        self._inotify: _Inotify | None = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+        self.watch(paths)
+
+    @property
+    def backend(self) -> WatchBackend:
+        return "inotify" if self._inotify is not None else "polling"
+
+    @property
+    def paths(self) -> set[Path]:
+        return set(self._signatures)
+
+    def watch(self, paths: Iterable[str | Path]) -> None:
+        """Start watching ``paths``; their current state is the baseline."""
+        for raw in paths:
+            path = Path(raw).resolve()
+            if path in self._signatures:
+                continue
+            if self._inotify is not None:
+                try:
+                    self._inotify.watch_dir(path.parent)
+                except OSError:
+                    self._inotify.close()
+                    self._inotify = None
+            self._signatures[path] = _signature(path)
+
+    def changed(self) -> set[Path]:
+        """Return watched files that changed since the previous call."""
+        touched = self._inotify.drain() if self._inotify is not None else None
+        if touched is not None:
+            # A reported write counts even if mtime didn't tick (coarse timestamps).
+            changed = touched & self._signatures.keys()
+            for path in changed:
+                self._signatures[path] = _signature(path)
+            return changed
+        changed = set()
+        for path, previous in self._signatures.items():
+            signature = _signature(path)
+            if signature != previous:
+                self._signatures[path] = signature
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __del__(self) -> None:
+        self.close()
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import httpx
 from openai import AsyncOpenAI
-from pydantic_ai.models import cached_async_http_client
 from pydantic_ai.providers import Provider
 
+from ..http_clients import provider_http_client
+
 
 class OpenAICompatibleProvider(Provider[AsyncOpenAI]):
     """Provider for OpenAI-compatible APIs (e.g., Ollama)."""
@@ -20,7 +21,7 @@ class OpenAICompatibleProvider(Provider[AsyncOpenAI]):
         self._base_url = base_url.rstrip("/")
         self._name = name
 
-        http_client = http_client or cached_async_http_client(provider=self._name)
+        http_client = http_client or provider_http_client(self._name)
 
         self._client = AsyncOpenAI(
             api_key=api_key,  # required by SDK, ignored by Ollama
@@ -7,6 +7,7 @@ from .approval import (
 )
 from .args import AgentArgs, Attachment, PromptContent, PromptInput, PromptMessages
 from .call import CallScope
+from .capabilities import CapabilityPolicy, CapabilityRule
 from .context import CallContext
 from .contracts import (
     AgentEntry,
@@ -17,6 +18,16 @@ from .contracts import (
     ModelType,
 )
 from .runtime import Runtime
+from .streaming import (
+    AgentFinish,
+    AgentStart,
+    RunResult,
+    StreamEvent,
+    TextDelta,
+    ToolCall,
+    ToolOutput,
+    ToolResult,
+)
 from .tooling import ToolDef, ToolsetDef
 
 __all__ = [
@@ -34,11 +45,22 @@ __all__ = [
     "RunApprovalPolicy",
     "AgentApprovalPolicy",
     "resolve_approval_callback",
+    "CapabilityPolicy",
+    "CapabilityRule",
     "Attachment",
     "PromptContent",
     "PromptMessages",
     "AgentArgs",
     "PromptInput",
+    # Runtime.stream_entry events
+    "StreamEvent",
+    "TextDelta",
+    "ToolCall",
+    "ToolResult",
+    "ToolOutput",
+    "AgentStart",
+    "AgentFinish",
+    "RunResult",
     # Tool/toolset defs
     "ToolDef",
     "ToolsetDef",
@@ -42,9 +42,11 @@ def _finalize_messages(
     runtime: CallContextProtocol,
     result: Any,
 ) -> list[Any]:
-    """Log and sync message history using a single message snapshot."""
+    """Log this run's new messages and sync the full message history."""
     messages = _get_all_messages(result)
-    runtime.log_messages(agent_name, runtime.frame.config.depth, messages)
+    runtime.log_messages(
+        agent_name, runtime.frame.config.depth, list(result.new_messages())
+    )
     if runtime.frame.config.depth == 0:
         runtime.frame.messages[:] = messages
     return messages
@@ -55,7 +57,7 @@ def _emit_runtime_event(
     runtime: CallContextProtocol,
     event: Any,
 ) -> None:
-    on_event = runtime.config.on_event
+    on_event = runtime.on_event
     if on_event is None:
         return
     on_event(
@@ -163,7 +165,7 @@ async def _run_with_event_stream(
     model_settings: ModelSettings | None,
 ) -> tuple[Any, list[Any]]:
     """Run agent with event stream handler for UI updates."""
-    on_event = runtime.config.on_event
+    on_event = runtime.on_event
     assert on_event is not None
 
     async def event_stream_handler(_: RunContext[CallContextProtocol], events: AsyncIterable[Any]) -> None:
@@ -261,7 +263,10 @@ async def run_agent(
     prompt = render_prompt(messages, base_path)
 
     async with agent:
-        use_streaming_events = runtime.config.on_event is not None and runtime.config.verbosity >= 2
+        # A run-scoped sink (stream_entry) always wants live deltas.
+        use_streaming_events = runtime.frame.config.event_sink is not None or (
+            runtime.config.on_event is not None and runtime.config.verbosity >= 2
+        )
         if use_streaming_events:
             output, run_messages = await _run_with_event_stream(
                 spec,
@@ -284,7 +289,7 @@ async def run_agent(
                 result,
             )
             output = result.output
-            if runtime.config.on_event is not None:
+            if runtime.on_event is not None:
                 _emit_non_stream_events(spec, runtime, run_messages)
 
     return output, run_messages
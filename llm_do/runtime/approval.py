@@ -2,24 +2,39 @@
 from __future__ import annotations
 
 import inspect
-import json
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any, Literal, Optional
 
 from pydantic_ai.toolsets import AbstractToolset
 from pydantic_ai_blocking_approval import (
+    ApprovalBlocked,
     ApprovalDecision,
+    ApprovalDenied,
     ApprovalRequest,
     ApprovalResult,
     ApprovalToolset,
+    SupportsApprovalDescription,
+    SupportsNeedsApproval,
+    needs_approval_from_config,
 )
 
 from ..toolsets.approval import get_toolset_approval_config
+from .capabilities import CapabilityPolicy, normalize_tool_args
 
 ApprovalCallback = Callable[[ApprovalRequest], ApprovalDecision | Awaitable[ApprovalDecision]]
 
 
+class PersistentApprovalDecision(ApprovalDecision):
+    """Approval the user asked to keep across runs.
+
+    Recorded in the capability policy's ``decisions_path`` when one is
+    configured; otherwise it acts like ``remember="session"``.
+    """
+
+    remember: Literal["none", "session"] = "session"
+
+
 @dataclass(frozen=True)
 class RunApprovalPolicy:
     """Execution-time approval policy configuration for a run."""
@@ -34,38 +49,198 @@ class AgentApprovalPolicy:
     """Resolved approval policy for an agent invocation."""
     approval_callback: ApprovalCallback
     return_permission_errors: bool = False
+    capability_policy: CapabilityPolicy | None = None
 
     def wrap_toolsets(self, toolsets: list[AbstractToolset[Any]]) -> list[AbstractToolset[Any]]:
         wrapped: list[AbstractToolset[Any]] = []
         for toolset in toolsets:
             if isinstance(toolset, (ApprovalToolset, ApprovalDeniedResultToolset)):
                 raise TypeError("Pre-wrapped ApprovalToolset instances are not supported")
-            approved: AbstractToolset[Any] = ApprovalContextToolset(
-                inner=toolset,
-                approval_callback=self.approval_callback,
-                config=get_toolset_approval_config(toolset),
-            )
             wrapped.append(
-                ApprovalDeniedResultToolset(approved)
-                if self.return_permission_errors
-                else approved
+                ApprovalContextToolset(
+                    inner=toolset,
+                    approval_callback=self.approval_callback,
+                    config=get_toolset_approval_config(toolset),
+                    capability_policy=self.capability_policy,
+                    return_permission_errors=self.return_permission_errors,
+                )
             )
         return wrapped
 
 
+def _permission_error_result(name: str, exc: PermissionError) -> dict[str, Any]:
+    return {"error": str(exc), "tool_name": name, "error_type": "permission"}
+
+
 class ApprovalContextToolset(ApprovalToolset):
-    """Approval wrapper that preserves inner toolset context management."""
+    """Single approval wrapper per toolset, with per-tool decisions precomputed.
+
+    Everything that does not depend on call arguments is resolved at
+    construction: which approval hooks the inner toolset implements, and which
+    tools the approval config marks ``pre_approved``. Those call straight
+    through, before the toolset's own ``needs_approval`` is consulted.
+    ``return_permission_errors`` turns ``PermissionError`` into a tool result in
+    place, so no second wrapper is needed. Only the library's public surface
+    is used (constructor, ``config``, ``get_tools``, ``call_tool``); unknown
+    attributes are not forwarded to the inner toolset, use ``inner``.
+
+    With a ``capability_policy``, calls to toolsets exposing
+    ``get_capabilities()`` are also checked against the policy: ``deny`` blocks,
+    ``allow`` skips the prompt, ``prompt`` forces one. A toolset's own
+    ``blocked`` result always wins. When a ``prompt`` rule asked, an approval
+    remembered for the session is granted for that exact call (tool name and
+    args); a ``PersistentApprovalDecision`` is also saved for later runs.
+    """
+
+    def __init__(
+        self,
+        inner: AbstractToolset,
+        approval_callback: ApprovalCallback,
+        config: Optional[dict[str, dict[str, Any]]] = None,
+        capability_policy: CapabilityPolicy | None = None,
+        *,
+        return_permission_errors: bool = False,
+    ) -> None:
+        super().__init__(inner, approval_callback, config)
+        self._toolset = inner
+        self._callback = approval_callback
+        self._return_permission_errors = return_permission_errors
+        self._needs_approval = (
+            inner.needs_approval if isinstance(inner, SupportsNeedsApproval) else None
+        )
+        self._describe = (
+            inner.get_approval_description
+            if isinstance(inner, SupportsApprovalDescription)
+            else None
+        )
+        get_capabilities = getattr(inner, "get_capabilities", None)
+        if capability_policy is not None and callable(get_capabilities):
+            self._capability_policy: CapabilityPolicy | None = capability_policy
+            self._get_capabilities = get_capabilities
+            self._pre_approved: frozenset[str] = frozenset()
+        else:
+            self._capability_policy = None
+            self._get_capabilities = None
+            self._pre_approved = frozenset(
+                tool_name
+                for tool_name, tool_config in self.config.items()
+                if isinstance(tool_config, dict) and tool_config.get("pre_approved")
+            )
+
+    def __getattr__(self, name: str) -> Any:
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    @property
+    def inner(self) -> AbstractToolset:
+        return self._toolset
+
+    @property
+    def id(self) -> Optional[str]:
+        return getattr(self._toolset, "id", None)
 
     async def __aenter__(self) -> "ApprovalContextToolset":
-        await self._inner.__aenter__()
+        await self._toolset.__aenter__()
         return self
 
     async def __aexit__(self, *args: Any) -> bool | None:
-        return await self._inner.__aexit__(*args)
+        return await self._toolset.__aexit__(*args)
+
+    async def get_tools(self, ctx: Any) -> dict:
+        return await self._toolset.get_tools(ctx)
+
+    async def call_tool(
+        self,
+        name: str,
+        tool_args: dict[str, Any],
+        ctx: Any,
+        tool: Any,
+    ) -> Any:
+        try:
+            if name not in self._pre_approved:
+                await self._check_approval(name, tool_args, ctx)
+            return await self._toolset.call_tool(name, tool_args, ctx, tool)
+        except PermissionError as exc:
+            if not self._return_permission_errors:
+                raise
+            return _permission_error_result(name, exc)
+
+    async def _approval_result(
+        self, name: str, tool_args: dict[str, Any], ctx: Any
+    ) -> ApprovalResult:
+        if self._needs_approval is None:
+            return needs_approval_from_config(name, self.config)
+        result = self._needs_approval(name, tool_args, ctx, self.config)
+        if inspect.isawaitable(result):
+            result = await result
+        if not isinstance(result, ApprovalResult):
+            raise TypeError("needs_approval must return ApprovalResult")
+        return result
+
+    def _description(self, name: str, tool_args: dict[str, Any], ctx: Any) -> str:
+        if self._describe is not None:
+            return self._describe(name, tool_args, ctx)
+        args_str = ", ".join(f"{k}={v!r}" for k, v in tool_args.items())
+        return f"{name}({args_str})"
+
+    async def _ask(self, name: str, tool_args: dict[str, Any], ctx: Any) -> ApprovalDecision:
+        request = ApprovalRequest(
+            tool_name=name,
+            tool_args=tool_args,
+            description=self._description(name, tool_args, ctx),
+        )
+        decision = self._callback(request)
+        if inspect.isawaitable(decision):
+            decision = await decision
+        return _ensure_decision(decision)
+
+    async def _prompt(self, name: str, tool_args: dict[str, Any], ctx: Any) -> None:
+        decision = await self._ask(name, tool_args, ctx)
+        if not decision.approved:
+            raise ApprovalDenied(name, decision)
+
+    async def _check_approval(self, name: str, tool_args: dict[str, Any], ctx: Any) -> None:
+        result = await self._approval_result(name, tool_args, ctx)
+        if result.is_blocked:
+            raise ApprovalBlocked(name, result.block_reason)
+
+        policy = self._capability_policy
+        if policy is None or self._get_capabilities is None:
+            if result.is_needs_approval:
+                await self._prompt(name, tool_args, ctx)
+            return
+
+        capabilities = frozenset(self._get_capabilities(name, tool_args, ctx, self.config))
+        decision = policy.evaluate(capabilities)
+        if decision == "deny":
+            raise ApprovalBlocked(
+                name,
+                f"Denied by capability policy ({', '.join(sorted(capabilities))})",
+            )
+        if decision is None:
+            # No rule matched: the toolset's own result and the approval
+            # callback (with its per-call session cache) decide.
+            if result.is_needs_approval:
+                await self._prompt(name, tool_args, ctx)
+            return
+        if decision != "prompt" or policy.is_granted(name, tool_args):
+            return
+        approval = await self._ask(name, tool_args, ctx)
+        if not approval.approved:
+            raise ApprovalDenied(name, approval)
+        if isinstance(approval, PersistentApprovalDecision):
+            policy.grant(name, tool_args, persist=True)
+        elif approval.remember == "session":
+            policy.grant(name, tool_args)
 
 
 class ApprovalDeniedResultToolset(AbstractToolset):
-    """Return a tool result when a PermissionError occurs."""
+    """Return a tool result when a PermissionError occurs.
+
+    Standalone variant of ``ApprovalContextToolset(return_permission_errors=True)``
+    for toolsets that are not approval-wrapped by the runtime.
+    """
     def __init__(self, inner: AbstractToolset):
         self._inner = inner
 
@@ -90,16 +265,12 @@ class ApprovalDeniedResultToolset(AbstractToolset):
         try:
             return await self._inner.call_tool(name, tool_args, ctx, tool)
         except PermissionError as exc:
-            return {"error": str(exc), "tool_name": name, "error_type": "permission"}
+            return _permission_error_result(name, exc)
 
 
 def _default_cache_key(request: ApprovalRequest) -> tuple[str, str]:
     """Return a stable cache key for an ApprovalRequest."""
-    try:
-        args_json = json.dumps(request.tool_args, sort_keys=True, default=str)
-    except (TypeError, ValueError):
-        args_json = json.dumps(str(request.tool_args))
-    return request.tool_name, args_json
+    return request.tool_name, normalize_tool_args(request.tool_args)
 
 
 def _ensure_decision(value: Any) -> ApprovalDecision:
@@ -156,9 +327,9 @@ def resolve_approval_callback(policy: RunApprovalPolicy) -> ApprovalCallback:
     return make_tui_approval_callback(policy.approval_callback, approve_all=False, reject_all=False, cache=policy.cache)
 
 
-def wrap_toolsets_for_approval(toolsets: list[AbstractToolset[Any]], approval_callback: ApprovalCallback, *, return_permission_errors: bool = False) -> list[AbstractToolset[Any]]:
+def wrap_toolsets_for_approval(toolsets: list[AbstractToolset[Any]], approval_callback: ApprovalCallback, *, return_permission_errors: bool = False, capability_policy: CapabilityPolicy | None = None) -> list[AbstractToolset[Any]]:
     """Wrap toolsets with approval handling."""
-    return AgentApprovalPolicy(approval_callback=approval_callback, return_permission_errors=return_permission_errors).wrap_toolsets(toolsets)
+    return AgentApprovalPolicy(approval_callback=approval_callback, return_permission_errors=return_permission_errors, capability_policy=capability_policy).wrap_toolsets(toolsets)
 
 
 def resolve_agent_call_approval(
@@ -13,8 +13,12 @@ from pydantic_ai.toolsets._dynamic import DynamicToolset
 from pydantic_ai.usage import RunUsage
 from pydantic_ai_blocking_approval import ApprovalToolset
 
-from .approval import ApprovalDeniedResultToolset, wrap_toolsets_for_approval
-from .contracts import AgentSpec, CallContextProtocol, ModelType
+from .approval import (
+    ApprovalContextToolset,
+    ApprovalDeniedResultToolset,
+    wrap_toolsets_for_approval,
+)
+from .contracts import AgentSpec, CallContextProtocol, EventCallback, ModelType
 from .tooling import ToolDef, ToolsetDef, tool_def_name
 
 logger = logging.getLogger(__name__)
@@ -30,7 +34,10 @@ def _toolset_registry_name(toolset: AbstractToolset[Any]) -> str:
 def _unwrap_approval_toolset(toolset: AbstractToolset[Any]) -> AbstractToolset[Any]:
     current = toolset
     while isinstance(current, (ApprovalDeniedResultToolset, ApprovalToolset)):
-        current = getattr(current, "_inner", current)
+        if isinstance(current, ApprovalContextToolset):
+            current = current.inner
+        else:
+            current = getattr(current, "_inner", current)
     return current
 
 
@@ -56,6 +63,7 @@ def _wrap_toolset_func_for_approval(
     *,
     approval_callback: Any,
     return_permission_errors: bool,
+    capability_policy: Any = None,
 ) -> Any:
     label = _toolset_func_label(toolset_func)
 
@@ -74,6 +82,7 @@ def _wrap_toolset_func_for_approval(
             [toolset],
             approval_callback,
             return_permission_errors=return_permission_errors,
+            capability_policy=capability_policy,
         )[0]
         return wrapped
 
@@ -81,48 +90,98 @@ def _wrap_toolset_func_for_approval(
     return _wrapped
 
 
-def _prepare_toolsets_for_run(
-    toolsets: Sequence[ToolsetDef],
+def _prepare_toolset_for_run(
+    toolset: ToolsetDef,
     *,
     approval_callback: Any,
     return_permission_errors: bool,
-) -> list[AbstractToolset[Any]]:
-    prepared: list[AbstractToolset[Any]] = []
-    for toolset in toolsets:
-        if isinstance(toolset, DynamicToolset):
-            wrapped_func = _wrap_toolset_func_for_approval(
-                toolset.toolset_func,
-                approval_callback=approval_callback,
-                return_permission_errors=return_permission_errors,
-            )
-            dynamic = DynamicToolset(
-                toolset_func=wrapped_func,
-                per_run_step=toolset.per_run_step,
-            )
-            _copy_registry_name(toolset, dynamic)
-            prepared.append(dynamic)
-            continue
-
-        if isinstance(toolset, AbstractToolset):
-            wrapped = wrap_toolsets_for_approval(
-                [toolset],
-                approval_callback,
-                return_permission_errors=return_permission_errors,
-            )[0]
-            _copy_registry_name(toolset, wrapped)
-            prepared.append(wrapped)
-            continue
-
+    capability_policy: Any = None,
+) -> AbstractToolset[Any]:
+    if isinstance(toolset, DynamicToolset):
         wrapped_func = _wrap_toolset_func_for_approval(
-            toolset,
+            toolset.toolset_func,
             approval_callback=approval_callback,
             return_permission_errors=return_permission_errors,
+            capability_policy=capability_policy,
+        )
+        dynamic = DynamicToolset(
+            toolset_func=wrapped_func,
+            per_run_step=toolset.per_run_step,
         )
-        dynamic = DynamicToolset(toolset_func=wrapped_func, per_run_step=False)
         _copy_registry_name(toolset, dynamic)
-        prepared.append(dynamic)
+        return dynamic
+
+    if isinstance(toolset, AbstractToolset):
+        wrapped = wrap_toolsets_for_approval(
+            [toolset],
+            approval_callback,
+            return_permission_errors=return_permission_errors,
+            capability_policy=capability_policy,
+        )[0]
+        _copy_registry_name(toolset, wrapped)
+        return wrapped
+
+    wrapped_func = _wrap_toolset_func_for_approval(
+        toolset,
+        approval_callback=approval_callback,
+        return_permission_errors=return_permission_errors,
+        capability_policy=capability_policy,
+    )
+    dynamic = DynamicToolset(toolset_func=wrapped_func, per_run_step=False)
+    _copy_registry_name(toolset, dynamic)
+    return dynamic
+
+
+class ToolsetLinker:
+    """Approval-wrapped toolsets, built once per toolset definition.
 
-    return prepared
+    Wrapping depends only on runtime-level approval settings, so each
+    ToolsetDef is wrapped the first time it is linked and the wrapper is reused
+    for every later call. Dynamic toolsets stay safe to share: PydanticAI copies
+    ``DynamicToolset`` instances per agent run.
+    """
+
+    def __init__(
+        self,
+        *,
+        approval_callback: Any,
+        return_permission_errors: bool,
+        capability_policy: Any = None,
+    ) -> None:
+        self._approval_callback = approval_callback
+        self._return_permission_errors = return_permission_errors
+        self._capability_policy = capability_policy
+        # Keyed by id(); the definition is kept alive alongside its wrapper.
+        self._linked: dict[int, tuple[ToolsetDef, AbstractToolset[Any]]] = {}
+
+    def link(self, toolsets: Sequence[ToolsetDef]) -> list[AbstractToolset[Any]]:
+        linked: list[AbstractToolset[Any]] = []
+        for toolset in toolsets:
+            entry = self._linked.get(id(toolset))
+            if entry is None or entry[0] is not toolset:
+                wrapped = _prepare_toolset_for_run(
+                    toolset,
+                    approval_callback=self._approval_callback,
+                    return_permission_errors=self._return_permission_errors,
+                    capability_policy=self._capability_policy,
+                )
+                entry = (toolset, wrapped)
+                self._linked[id(toolset)] = entry
+            linked.append(entry[1])
+        return linked
+
+    def forget(self, toolsets: Sequence[ToolsetDef]) -> None:
+        """Drop the wrappers of ``toolsets`` (e.g. of an evicted dynamic agent)."""
+        for toolset in toolsets:
+            entry = self._linked.get(id(toolset))
+            if entry is not None and entry[0] is toolset:
+                del self._linked[id(toolset)]
+
+    def retain(self, toolsets: Sequence[ToolsetDef]) -> None:
+        """Forget wrappers of every definition not in ``toolsets``."""
+        keep = {id(toolset) for toolset in toolsets}
+        for key in [key for key in self._linked if key not in keep]:
+            del self._linked[key]
 
 
 def _add_source(sources: dict[str, list[str]], name: str, source: str) -> None:
@@ -137,6 +196,8 @@ class CallConfig:
     model: ModelType
     depth: int = 0
     invocation_name: str = ""
+    # Run-scoped listener (see Runtime.run_entry(on_event=...)), inherited by children.
+    event_sink: EventCallback | None = None
 
     def fork(
         self,
@@ -151,6 +212,7 @@ class CallConfig:
             model=model,
             depth=self.depth + 1,
             invocation_name=invocation_name,
+            event_sink=self.event_sink,
         )
 
 
@@ -163,6 +225,11 @@ class CallFrame:
     # Mutable fields (required for runtime behavior)
     prompt: str = ""
     messages: list[Any] = field(default_factory=list)
+    _toolset_state: dict[int, dict[str, Any]] = field(default_factory=dict, repr=False)
+
+    def toolset_state(self, toolset: object) -> dict[str, Any]:
+        """Return call-scoped scratch state for a (possibly shared) toolset."""
+        return self._toolset_state.setdefault(id(toolset), {})
 
     def fork(
         self,
@@ -191,11 +258,7 @@ class CallScope:
 
     @classmethod
     def for_agent(cls, parent: CallContextProtocol, spec: AgentSpec) -> "CallScope":
-        toolsets = _prepare_toolsets_for_run(
-            spec.toolsets,
-            approval_callback=parent.config.approval_callback,
-            return_permission_errors=parent.config.return_permission_errors,
-        )
+        toolsets = parent.link_toolsets(spec.toolsets)
         child_runtime = parent.spawn_child(
             active_toolsets=toolsets,
             model=spec.model,
@@ -0,0 +1,220 @@
+"""Capability-based approval policy.
+
+Toolsets describe each call with capability strings (``fs.write.within_base``,
+``proc.exec.pre_approved``); a ``CapabilityPolicy`` maps those to allow / deny /
+prompt outcomes. Rules are compiled once into a dict keyed by capability, so a
+check is a handful of dict lookups (one per dotted segment) plus a memo hit for
+capability sets that were already evaluated.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+CapabilityDecision = Literal["allow", "deny", "prompt"]
+
+_DECISION_RANK: dict[str, int] = {"allow": 0, "prompt": 1, "deny": 2}
+_GRANTS_VERSION = 1
+_PATTERN_RE = re.compile(r"^(\*|[A-Za-z0-9_-]+(\.[A-Za-z0-9_-]+)*(\.\*)?)$")
+
+
+@dataclass(frozen=True, slots=True)
+class CapabilityRule:
+    """Map a capability pattern to a decision.
+
+    ``fs.write`` matches ``fs.write`` and every refinement (``fs.write.*``);
+    ``*`` matches everything. The most specific matching rule wins.
+    """
+
+    capability: str
+    decision: CapabilityDecision
+
+    def __post_init__(self) -> None:
+        if not _PATTERN_RE.match(self.capability):
+            raise ValueError(f"Invalid capability pattern: {self.capability!r}")
+        if self.decision not in _DECISION_RANK:
+            raise ValueError(f"Invalid capability decision: {self.decision!r}")
+
+
+def _normalize_pattern(pattern: str) -> str:
+    return pattern[:-2] if pattern.endswith(".*") else pattern
+
+
+def _ancestors(capability: str) -> Iterable[str]:
+    current = capability
+    while True:
+        yield current
+        head, dot, _tail = current.rpartition(".")
+        if not dot:
+            break
+        current = head
+    yield "*"
+
+
+def _leaf_capabilities(capabilities: frozenset[str]) -> list[str]:
+    """Drop capabilities refined by a more specific one in the same set."""
+    return [
+        cap
+        for cap in capabilities
+        if not any(other.startswith(cap + ".") for other in capabilities)
+    ]
+
+
+def capability_key(capabilities: Iterable[str]) -> str:
+    """Stable string key for a capability set."""
+    return ",".join(sorted(set(capabilities)))
+
+
+def normalize_tool_args(tool_args: Any) -> str:
+    """Stable JSON rendering of tool arguments, for approval caches and grants."""
+    try:
+        return json.dumps(tool_args, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return json.dumps(str(tool_args))
+
+
+def grant_key(tool_name: str, tool_args: Any) -> str:
+    """Key of a remembered approval: one tool call, not a capability class."""
+    return json.dumps([tool_name, normalize_tool_args(tool_args)])
+
+
+class CapabilityPolicy:
+    """Compiled capability rules plus remembered approvals.
+
+    Grants cover one exact call (tool name plus normalized args), so approving
+    ``rm a`` says nothing about ``rm b``. Session grants stay in memory;
+    only grants made with ``persist=True`` are written to ``decisions_path``.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[CapabilityRule] = (),
+        *,
+        decisions_path: Path | None = None,
+    ) -> None:
+        self._rules = tuple(rules)
+        self._index: dict[str, CapabilityDecision] = {}
+        for rule in self._rules:
+            pattern = _normalize_pattern(rule.capability)
+            # First rule for a pattern wins, mirroring shell rule ordering.
+            self._index.setdefault(pattern, rule.decision)
+        self._memo: dict[frozenset[str], CapabilityDecision | None] = {}
+        self._decisions_path = decisions_path
+        self._lock = threading.Lock()
+        self._session_grants: set[str] = set()
+        self._persisted_grants: set[str] = set()
+        if decisions_path is not None:
+            self._persisted_grants = _load_grants(decisions_path)
+
+    @classmethod
+    def from_config(
+        cls,
+        rules: Sequence[CapabilityRule | Mapping[str, Any] | Any],
+        *,
+        decisions_path: str | Path | None = None,
+    ) -> "CapabilityPolicy":
+        """Build a policy from rule objects, mappings, or pydantic models."""
+        compiled: list[CapabilityRule] = []
+        for rule in rules:
+            if isinstance(rule, CapabilityRule):
+                compiled.append(rule)
+                continue
+            if hasattr(rule, "model_dump"):
+                rule = rule.model_dump()
+            if not isinstance(rule, Mapping):
+                raise TypeError("capability rules must be mappings or CapabilityRule")
+            compiled.append(
+                CapabilityRule(capability=rule["capability"], decision=rule["decision"])
+            )
+        path = Path(decisions_path).expanduser() if decisions_path is not None else None
+        return cls(compiled, decisions_path=path)
+
+    @property
+    def rules(self) -> tuple[CapabilityRule, ...]:
+        return self._rules
+
+    @property
+    def decisions_path(self) -> Path | None:
+        return self._decisions_path
+
+    def evaluate(self, capabilities: Iterable[str]) -> CapabilityDecision | None:
+        """Return the policy decision for a call, or None when no rule matches.
+
+        Each leaf capability takes its most specific matching rule; across
+        leaves the strictest decision wins (deny > prompt > allow).
+        """
+        key = capabilities if isinstance(capabilities, frozenset) else frozenset(capabilities)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        decision: CapabilityDecision | None = None
+        for leaf in _leaf_capabilities(key):
+            leaf_decision = self._lookup(leaf)
+            if leaf_decision is None:
+                continue
+            if decision is None or _DECISION_RANK[leaf_decision] > _DECISION_RANK[decision]:
+                decision = leaf_decision
+        self._memo[key] = decision
+        return decision
+
+    def _lookup(self, capability: str) -> CapabilityDecision | None:
+        index = self._index
+        for candidate in _ancestors(capability):
+            decision = index.get(candidate)
+            if decision is not None:
+                return decision
+        return None
+
+    def is_granted(self, tool_name: str, tool_args: Any) -> bool:
+        """Return True if the user previously approved this exact call."""
+        key = grant_key(tool_name, tool_args)
+        return key in self._session_grants or key in self._persisted_grants
+
+    def grant(self, tool_name: str, tool_args: Any, *, persist: bool = False) -> None:
+        """Remember an approval for this call; ``persist`` also saves it to ``decisions_path``."""
+        key = grant_key(tool_name, tool_args)
+        with self._lock:
+            self._session_grants.add(key)
+            if not persist or self._decisions_path is None or key in self._persisted_grants:
+                return
+            self._persisted_grants.add(key)
+            _save_grants(self._decisions_path, self._persisted_grants)
+
+
+def _load_grants(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return set()
+    if not isinstance(data, dict) or data.get("version") != _GRANTS_VERSION:
+        return set()
+    granted = data.get("granted")
+    if not isinstance(granted, list):
+        return set()
+    return {item for item in granted if isinstance(item, str) and item}
+
+
+def _save_grants(path: Path, granted: set[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = json.dumps({"version": _GRANTS_VERSION, "granted": sorted(granted)}, indent=2)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
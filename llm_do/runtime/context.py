@@ -2,16 +2,20 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 from pydantic_ai.toolsets import AbstractToolset
 
+from ..models import ModelCache
 from .agent_runner import run_agent
 from .call import CallFrame, CallScope
-from .contracts import AgentSpec, ModelType
-from .runtime import Runtime, RuntimeConfig
+from .contracts import AgentSpec, EventCallback, ModelType
+from .events import AgentFinishEvent, AgentStartEvent, RuntimeEvent, SystemEvent
+from .runtime import DynamicAgentRegistry, Runtime, RuntimeConfig
 from .tooling import ToolDef, ToolsetDef
 
+_T = TypeVar("_T")
+
 
 class CallContext:
     """Dispatches agent runs, managing call-scoped state.
@@ -50,13 +54,54 @@ class CallContext:
         return self.runtime.toolset_registry
 
     @property
-    def dynamic_agents(self) -> dict[str, AgentSpec]:
+    def dynamic_agents(self) -> DynamicAgentRegistry:
         return self.runtime.dynamic_agents
 
+    @property
+    def model_cache(self) -> ModelCache:
+        return self.runtime.model_cache
+
     def log_messages(self, agent_name: str, depth: int, messages: list[Any]) -> None:
         """Record messages for diagnostic logging."""
         self.runtime.log_messages(agent_name, depth, messages)
 
+    def link_toolsets(self, toolsets: Sequence[ToolsetDef]) -> list[AbstractToolset[Any]]:
+        """Return the runtime's approval-wrapped instances of ``toolsets``."""
+        return self.runtime.link_toolsets(toolsets)
+
+    def resource(self, key: str, factory: Callable[[], _T]) -> _T:
+        """Return a runtime-scoped shared object (see ``Runtime.resource``)."""
+        return self.runtime.resource(key, factory)
+
+    @property
+    def on_event(self) -> EventCallback | None:
+        """Callback for this call's events: the runtime's ``on_event`` plus the run's sink."""
+        runtime_sink = self.config.on_event
+        run_sink = self.frame.config.event_sink
+        if run_sink is None:
+            return runtime_sink
+        if runtime_sink is None:
+            return run_sink
+
+        def both(event: RuntimeEvent) -> None:
+            runtime_sink(event)
+            run_sink(event)
+
+        return both
+
+    def emit_event(self, event: SystemEvent) -> None:
+        """Send a system event to this call's event listeners, if any."""
+        on_event = self.on_event
+        if on_event is None:
+            return
+        on_event(
+            RuntimeEvent(
+                agent=self.frame.config.invocation_name,
+                depth=self.frame.config.depth,
+                event=event,
+            )
+        )
+
     def spawn_child(
         self,
         active_toolsets: Sequence[AbstractToolset[Any]],
@@ -101,9 +146,15 @@ class CallContext:
             )
 
         async with CallScope.for_agent(self, spec) as scope:
-            output, _messages = await run_agent(
-                spec,
-                scope.runtime,
-                input_data,
-            )
+            scope.runtime.emit_event(AgentStartEvent())
+            try:
+                output, _messages = await run_agent(
+                    spec,
+                    scope.runtime,
+                    input_data,
+                )
+            except Exception as exc:
+                scope.runtime.emit_event(AgentFinishEvent(error=str(exc) or type(exc).__name__))
+                raise
+            scope.runtime.emit_event(AgentFinishEvent(output=output))
             return output
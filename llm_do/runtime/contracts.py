@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Protocol, TypeAlias
+from typing import TYPE_CHECKING, Any, Protocol, TypeAlias, TypeVar
 
 from pydantic import BaseModel
 from pydantic_ai.models import Model  # Used in ModelType
@@ -16,16 +16,18 @@ from pydantic_ai.settings import ModelSettings
 from pydantic_ai.toolsets import AbstractToolset  # Used in CallContextProtocol
 
 from .args import AgentArgs, PromptInput
-from .events import RuntimeEvent
+from .events import RuntimeEvent, SystemEvent
 from .tooling import ToolDef, ToolsetDef, is_tool_def, is_toolset_def
 
 if TYPE_CHECKING:
+    from ..models import ModelCache
     from .call import CallFrame
-    from .runtime import RuntimeConfig
+    from .runtime import DynamicAgentRegistry, RuntimeConfig
 
 ModelType: TypeAlias = Model
 EventCallback: TypeAlias = Callable[[RuntimeEvent], None]
 MessageLogCallback: TypeAlias = Callable[[str, int, list[Any]], None]
+_T = TypeVar("_T")
 
 
 class CallContextProtocol(Protocol):
@@ -46,6 +48,17 @@ class CallContextProtocol(Protocol):
 
     def log_messages(self, agent_name: str, depth: int, messages: list[Any]) -> None: ...
 
+    def link_toolsets(
+        self, toolsets: Sequence[ToolsetDef]
+    ) -> list[AbstractToolset[Any]]: ...
+
+    def resource(self, key: str, factory: Callable[[], _T]) -> _T: ...
+
+    @property
+    def on_event(self) -> EventCallback | None: ...
+
+    def emit_event(self, event: SystemEvent) -> None: ...
+
     def spawn_child(
         self,
         active_toolsets: Sequence[AbstractToolset[Any]],
@@ -70,7 +83,10 @@ class CallContextProtocol(Protocol):
     def toolset_registry(self) -> dict[str, ToolsetDef]: ...
 
     @property
-    def dynamic_agents(self) -> dict[str, "AgentSpec"]: ...
+    def dynamic_agents(self) -> "DynamicAgentRegistry": ...
+
+    @property
+    def model_cache(self) -> "ModelCache": ...
 
 
 class Entry:
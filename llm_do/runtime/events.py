@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic_ai.messages import AgentStreamEvent
 
@@ -15,10 +15,40 @@ class UserMessageEvent:
     event_kind: Literal["user_message"] = "user_message"
 
 
+@dataclass(frozen=True, slots=True)
+class ToolOutputEvent:
+    """Live output from a running tool (e.g. a shell command's stdout)."""
+
+    tool_name: str
+    tool_call_id: str
+    stream: str  # "stdout" or "stderr"
+    content: str
+    event_kind: Literal["tool_output"] = "tool_output"
+
+
+@dataclass(frozen=True, slots=True)
+class AgentStartEvent:
+    """An agent call is starting (emitted at the callee's depth)."""
+
+    event_kind: Literal["agent_start"] = "agent_start"
+
+
+@dataclass(frozen=True, slots=True)
+class AgentFinishEvent:
+    """An agent call returned ``output`` or failed with ``error``."""
+
+    output: Any = None
+    error: str | None = None
+    event_kind: Literal["agent_finish"] = "agent_finish"
+
+
+SystemEvent = UserMessageEvent | ToolOutputEvent | AgentStartEvent | AgentFinishEvent
+
+
 @dataclass(frozen=True, slots=True)
 class RuntimeEvent:
     """Envelope for runtime callbacks (raw PydanticAI + system events)."""
 
     agent: str  # agent name
     depth: int
-    event: AgentStreamEvent | UserMessageEvent
+    event: AgentStreamEvent | SystemEvent
@@ -3,24 +3,32 @@ from __future__ import annotations
 
 import asyncio
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
+    AsyncGenerator,
     Awaitable,
     Callable,
+    Iterator,
     Literal,
     Mapping,
+    MutableMapping,
     Protocol,
     Sequence,
     TypeAlias,
+    TypeVar,
 )
 
+from pydantic_ai.toolsets import AbstractToolset
 from pydantic_ai.usage import RunUsage
 
-from ..models import ModelInput, resolve_model
+from ..models import ModelCache, ModelInput, resolve_model
 from .approval import ApprovalCallback, RunApprovalPolicy, resolve_approval_callback
+from .call import ToolsetLinker
+from .capabilities import CapabilityPolicy
 from .contracts import (
     AgentSpec,
     Entry,
@@ -31,6 +39,11 @@ from .tooling import ToolDef, ToolsetDef
 
 if TYPE_CHECKING:
     from .context import CallContext
+    from .streaming import StreamEvent
+
+_T = TypeVar("_T")
+
+DEFAULT_MAX_DYNAMIC_AGENTS = 64
 
 
 class RegistryProtocol(Protocol):
@@ -78,6 +91,97 @@ class UsageCollector:
             return list(self._usages)
 
 
+class ResourceStore:
+    """Thread-safe, runtime-scoped objects created on first use by key."""
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resources: dict[str, Any] = {}
+
+    def get_or_create(self, key: str, factory: Callable[[], _T]) -> _T:
+        with self._lock:
+            if key not in self._resources:
+                self._resources[key] = factory()
+            return self._resources[key]
+
+    def all(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._resources)
+
+
+class DynamicAgentRegistry(MutableMapping[str, AgentSpec]):
+    """Agents created during runs, bounded to the ``max_agents`` most recently used.
+
+    Each entry keeps the digest of the definition it was built from, so
+    ``agent_create`` can tell an identical re-creation from a name clash.
+    ``creation_lock`` serializes check-build-add sequences; lookups don't take it.
+    ``on_evict`` is called (outside the lock) with every spec that is evicted,
+    replaced or deleted.
+    """
+    def __init__(
+        self,
+        max_agents: int = DEFAULT_MAX_DYNAMIC_AGENTS,
+        on_evict: Callable[[AgentSpec], None] | None = None,
+    ) -> None:
+        self.max_agents = max_agents
+        self.creation_lock = threading.RLock()
+        self._on_evict = on_evict
+        self._lock = threading.Lock()
+        self._agents: OrderedDict[str, tuple[AgentSpec, str | None]] = OrderedDict()
+
+    def add(self, name: str, spec: AgentSpec, digest: str | None = None) -> None:
+        evicted: list[AgentSpec] = []
+        with self._lock:
+            previous = self._agents.get(name)
+            if previous is not None and previous[0] is not spec:
+                evicted.append(previous[0])
+            self._agents[name] = (spec, digest)
+            self._agents.move_to_end(name)
+            while len(self._agents) > self.max_agents:
+                evicted.append(self._agents.popitem(last=False)[1][0])
+        self._evicted(evicted)
+
+    def _evicted(self, specs: list[AgentSpec]) -> None:
+        if self._on_evict is not None:
+            for spec in specs:
+                self._on_evict(spec)
+
+    def digest(self, name: str) -> str | None:
+        with self._lock:
+            entry = self._agents.get(name)
+            return entry[1] if entry is not None else None
+
+    def __getitem__(self, name: str) -> AgentSpec:
+        with self._lock:
+            spec, _ = self._agents[name]
+            self._agents.move_to_end(name)
+            return spec
+
+    def __setitem__(self, name: str, spec: AgentSpec) -> None:
+        self.add(name, spec)
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            spec, _ = self._agents.pop(name)
+        self._evicted([spec])
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._agents
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._agents))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._agents)
+
+    def specs(self) -> list[AgentSpec]:
+        """Snapshot of the registered specs, without touching recency."""
+        with self._lock:
+            return [spec for spec, _ in self._agents.values()]
+
+
 class MessageAccumulator:
     """Thread-safe sink for capturing messages across agents."""
     def __init__(self) -> None:
@@ -151,6 +255,7 @@ class RuntimeConfig:
     on_event: EventCallback | None = None
     message_log_callback: MessageLogCallback | None = None
     verbosity: int = 0
+    capability_policy: CapabilityPolicy | None = None
 
 
 class Runtime:
@@ -172,6 +277,9 @@ class Runtime:
         on_event: EventCallback | None = None,
         message_log_callback: MessageLogCallback | None = None,
         verbosity: int = 0,
+        capability_policy: CapabilityPolicy | None = None,
+        max_dynamic_agents: int = DEFAULT_MAX_DYNAMIC_AGENTS,
+        model_cache: ModelCache | None = None,
     ) -> None:
         policy = run_approval_policy or RunApprovalPolicy(mode="approve_all")
         resolved_generated_dir = _resolve_generated_agents_dir(
@@ -195,13 +303,24 @@ class Runtime:
             on_event=on_event,
             message_log_callback=message_log_callback,
             verbosity=verbosity,
+            capability_policy=capability_policy,
+        )
+        self._toolset_linker = ToolsetLinker(
+            approval_callback=approval_callback,
+            return_permission_errors=policy.return_permission_errors,
+            capability_policy=capability_policy,
         )
         self._usage = UsageCollector()
         self._message_log = MessageAccumulator()
+        self._resources = ResourceStore()
         self._agent_registry: dict[str, AgentSpec] = {}
         self._tool_registry: dict[str, ToolDef] = {}
         self._toolset_registry: dict[str, ToolsetDef] = {}
-        self._dynamic_agents: dict[str, AgentSpec] = {}
+        self._dynamic_agents = DynamicAgentRegistry(
+            max_dynamic_agents, on_evict=self._unlink_agent_toolsets
+        )
+        self._registered_toolset_ids: set[int] = set()
+        self._model_cache = model_cache if model_cache is not None else ModelCache()
 
     @property
     def config(self) -> RuntimeConfig:
@@ -223,6 +342,10 @@ class Runtime:
     def message_log(self) -> list[tuple[str, int, Any]]:
         return self._message_log.all()
 
+    @property
+    def resources(self) -> dict[str, Any]:
+        return self._resources.all()
+
     @property
     def agent_registry(self) -> dict[str, AgentSpec]:
         return self._agent_registry
@@ -236,11 +359,48 @@ class Runtime:
         return self._toolset_registry
 
     @property
-    def dynamic_agents(self) -> dict[str, AgentSpec]:
+    def dynamic_agents(self) -> DynamicAgentRegistry:
         return self._dynamic_agents
 
+    @property
+    def model_cache(self) -> ModelCache:
+        """Model instances shared by every agent on this runtime, by model string."""
+        return self._model_cache
+
     def register_agents(self, agents: Mapping[str, AgentSpec]) -> None:
         self._agent_registry = dict(agents)
+        for spec in self._agent_registry.values():
+            # Later lookups of the same string (dynamic agents) share the registry's model.
+            if spec.model_id is not None:
+                self._model_cache.add(spec.model_id, spec.model)
+        toolsets = [toolset for spec in self._agent_registry.values() for toolset in spec.toolsets]
+        toolset_ids = {id(toolset) for toolset in toolsets}
+        if self._registered_toolset_ids - toolset_ids:
+            # A reload replaced toolsets: drop their wrappers (and the modules they pin).
+            dynamic = [toolset for spec in self._dynamic_agents.specs() for toolset in spec.toolsets]
+            self._toolset_linker.retain(toolsets + dynamic)
+        self._registered_toolset_ids = toolset_ids
+        self._toolset_linker.link(toolsets)
+
+    def _unlink_agent_toolsets(self, spec: AgentSpec) -> None:
+        # Wrappers of an evicted dynamic agent would otherwise live as long as the runtime.
+        specs = [*self._agent_registry.values(), *self._dynamic_agents.specs()]
+        in_use = {id(toolset) for other in specs for toolset in other.toolsets}
+        self._toolset_linker.forget(
+            [toolset for toolset in spec.toolsets if id(toolset) not in in_use]
+        )
+
+    def link_toolsets(self, toolsets: Sequence[ToolsetDef]) -> list[AbstractToolset[Any]]:
+        """Return approval-wrapped toolsets, reusing wrappers built at registration."""
+        return self._toolset_linker.link(toolsets)
+
+    def resource(self, key: str, factory: Callable[[], _T]) -> _T:
+        """Return the runtime-scoped object for ``key``, creating it on first use.
+
+        Lets toolsets share state (caches, pools) across every run and call
+        depth on this runtime without the runtime knowing their types.
+        """
+        return self._resources.get_or_create(key, factory)
 
     def register_tools(self, tools: Mapping[str, ToolDef]) -> None:
         self._tool_registry = dict(tools)
@@ -270,17 +430,19 @@ class Runtime:
         model: ModelInput,
         invocation_name: str,
         depth: int,
+        event_sink: EventCallback | None = None,
     ) -> "CallContext":
         """Create a CallContext with a new CallFrame."""
         from .call import CallConfig, CallFrame
         from .context import CallContext
 
-        resolved_model = resolve_model(model)
+        resolved_model = resolve_model(model, cache=self._model_cache)
         call_config = CallConfig(
             active_toolsets=tuple(active_toolsets),
             model=resolved_model,
             depth=depth,
             invocation_name=invocation_name,
+            event_sink=event_sink,
         )
         frame = CallFrame(config=call_config)
         return CallContext(runtime=self, frame=frame)
@@ -291,29 +453,28 @@ class Runtime:
         input_data: Any,
         *,
         message_history: list[Any] | None = None,
+        on_event: EventCallback | None = None,
     ) -> tuple[Any, CallContext]:
-        """Run an entry with this runtime."""
+        """Run an entry with this runtime.
+
+        ``on_event`` receives only this run's events, in addition to the
+        runtime-wide ``on_event``; agents in the run stream model output to it.
+        """
         from ..models import NULL_MODEL
         from .args import get_display_text, normalize_input
-        from .events import RuntimeEvent, UserMessageEvent
+        from .events import UserMessageEvent
 
         input_args, messages = normalize_input(entry.input_model, input_data)
         display_text = get_display_text(messages)
-        if self.config.on_event is not None:
-            self.config.on_event(
-                RuntimeEvent(
-                    agent=entry.name,
-                    depth=0,
-                    event=UserMessageEvent(content=display_text),
-                )
-            )
 
         call_runtime = self.spawn_call_runtime(
             active_toolsets=[],
             model=NULL_MODEL,
             invocation_name=entry.name,
             depth=0,
+            event_sink=on_event,
         )
+        call_runtime.emit_event(UserMessageEvent(content=display_text))
         if message_history:
             call_runtime.frame.messages[:] = list(message_history)
         call_runtime.frame.prompt = display_text
@@ -322,6 +483,31 @@ class Runtime:
 
         return result, call_runtime
 
+    def stream_entry(
+        self,
+        entry: Entry,
+        input_data: Any,
+        *,
+        message_history: list[Any] | None = None,
+    ) -> AsyncGenerator["StreamEvent", None]:
+        """Run an entry, yielding its events as they happen.
+
+        Yields ``TextDelta``, ``ToolCall``, ``ToolResult``, ``ToolOutput``,
+        ``AgentStart`` and ``AgentFinish`` events for this run only, then a
+        final ``RunResult``. If the run fails, its exception is raised after
+        the events that preceded it. Closing the iterator early cancels the run.
+        """
+        from .streaming import stream_run
+
+        return stream_run(
+            lambda sink: self.run_entry(
+                entry,
+                input_data,
+                message_history=message_history,
+                on_event=sink,
+            )
+        )
+
     def run(
         self,
         entry: Entry,
@@ -0,0 +1,248 @@
+"""Typed per-run event streams for embedders (see ``Runtime.stream_entry``).
+
+``RuntimeEvent`` wraps raw PydanticAI events for the UI; the stream types here
+flatten them into the few shapes an embedder forwards to its clients: text
+deltas, tool calls and results, live tool output, agent start/finish and the
+final result.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+from collections import deque
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias
+
+from pydantic_ai.messages import (
+    BuiltinToolCallEvent,
+    BuiltinToolResultEvent,
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    RetryPromptPart,
+    TextPart,
+    TextPartDelta,
+)
+
+from .contracts import EventCallback
+from .events import AgentFinishEvent, AgentStartEvent, RuntimeEvent, ToolOutputEvent
+
+if TYPE_CHECKING:
+    from .context import CallContext
+
+MAX_PENDING_EVENTS = 1000
+"""Events ``stream_run`` holds for a slow consumer before it sheds live tool output."""
+
+
+@dataclass(frozen=True, slots=True)
+class TextDelta:
+    """A chunk of model text."""
+
+    agent: str
+    depth: int
+    content: str
+    event_kind: Literal["text_delta"] = "text_delta"
+
+
+@dataclass(frozen=True, slots=True)
+class ToolCall:
+    """A tool is about to run."""
+
+    agent: str
+    depth: int
+    tool_name: str
+    tool_call_id: str
+    args: dict[str, Any] | str | None
+    event_kind: Literal["tool_call"] = "tool_call"
+
+
+@dataclass(frozen=True, slots=True)
+class ToolResult:
+    """A tool returned (``is_error`` for retry prompts sent back to the model)."""
+
+    agent: str
+    depth: int
+    tool_name: str
+    tool_call_id: str
+    content: Any
+    is_error: bool = False
+    event_kind: Literal["tool_result"] = "tool_result"
+
+
+@dataclass(frozen=True, slots=True)
+class ToolOutput:
+    """Live output from a running tool (e.g. a shell command's stdout)."""
+
+    agent: str
+    depth: int
+    tool_name: str
+    tool_call_id: str
+    stream: str
+    content: str
+    event_kind: Literal["tool_output"] = "tool_output"
+
+
+@dataclass(frozen=True, slots=True)
+class AgentStart:
+    """An agent call started."""
+
+    agent: str
+    depth: int
+    event_kind: Literal["agent_start"] = "agent_start"
+
+
+@dataclass(frozen=True, slots=True)
+class AgentFinish:
+    """An agent call returned ``output`` or failed with ``error``."""
+
+    agent: str
+    depth: int
+    output: Any = None
+    error: str | None = None
+    event_kind: Literal["agent_finish"] = "agent_finish"
+
+
+@dataclass(frozen=True, slots=True)
+class RunResult:
+    """Last event of a stream: the entry's output and its call context."""
+
+    output: Any
+    context: CallContext
+    event_kind: Literal["run_result"] = "run_result"
+
+
+StreamEvent: TypeAlias = (
+    TextDelta | ToolCall | ToolResult | ToolOutput | AgentStart | AgentFinish | RunResult
+)
+
+
+def _tool_args(part: Any) -> dict[str, Any] | str | None:
+    try:
+        return part.args_as_dict()
+    except Exception:
+        return part.args
+
+
+def to_stream_event(event: RuntimeEvent) -> StreamEvent | None:
+    """Convert a runtime event into its stream event, or None if it has none."""
+    payload = event.event
+    agent, depth = event.agent, event.depth
+
+    if isinstance(payload, PartDeltaEvent):
+        delta = payload.delta
+        if isinstance(delta, TextPartDelta) and delta.content_delta:
+            return TextDelta(agent=agent, depth=depth, content=delta.content_delta)
+        return None
+
+    if isinstance(payload, PartStartEvent):
+        # A text part may start with content; later chunks arrive as deltas.
+        if isinstance(payload.part, TextPart) and payload.part.content:
+            return TextDelta(agent=agent, depth=depth, content=payload.part.content)
+        return None
+
+    if isinstance(payload, (FunctionToolCallEvent, BuiltinToolCallEvent)):
+        part = payload.part
+        return ToolCall(
+            agent=agent,
+            depth=depth,
+            tool_name=part.tool_name,
+            tool_call_id=part.tool_call_id,
+            args=_tool_args(part),
+        )
+
+    if isinstance(payload, (FunctionToolResultEvent, BuiltinToolResultEvent)):
+        result = payload.result
+        return ToolResult(
+            agent=agent,
+            depth=depth,
+            tool_name=result.tool_name or "",
+            tool_call_id=result.tool_call_id,
+            content=result.content,
+            is_error=isinstance(result, RetryPromptPart),
+        )
+
+    if isinstance(payload, ToolOutputEvent):
+        return ToolOutput(
+            agent=agent,
+            depth=depth,
+            tool_name=payload.tool_name,
+            tool_call_id=payload.tool_call_id,
+            stream=payload.stream,
+            content=payload.content,
+        )
+
+    if isinstance(payload, AgentStartEvent):
+        return AgentStart(agent=agent, depth=depth)
+
+    if isinstance(payload, AgentFinishEvent):
+        return AgentFinish(agent=agent, depth=depth, output=payload.output, error=payload.error)
+
+    return None
+
+
+async def stream_run(
+    run: Callable[[EventCallback], Awaitable[tuple[Any, CallContext]]],
+) -> AsyncGenerator[StreamEvent, None]:
+    """Start ``run(sink)`` as a task and yield what reaches ``sink``, then the result.
+
+    Events emitted from worker threads (sync tools) are handed to the loop
+    thread. Once ``MAX_PENDING_EVENTS`` are waiting, a ``ToolOutput`` is
+    merged into the last pending event when that is output of the same call
+    and stream, and dropped otherwise; other events are always kept.
+    Closing the iterator before the end cancels the task.
+    """
+    loop = asyncio.get_running_loop()
+    loop_thread = threading.get_ident()
+    pending: deque[StreamEvent] = deque()
+    ready = asyncio.Event()
+    finished = False
+
+    def push(stream_event: StreamEvent) -> None:
+        if len(pending) >= MAX_PENDING_EVENTS and isinstance(stream_event, ToolOutput):
+            last = pending[-1]
+            if (
+                isinstance(last, ToolOutput)
+                and last.tool_call_id == stream_event.tool_call_id
+                and last.stream == stream_event.stream
+            ):
+                pending[-1] = replace(last, content=last.content + stream_event.content)
+            return
+        pending.append(stream_event)
+        ready.set()
+
+    def sink(event: RuntimeEvent) -> None:
+        stream_event = to_stream_event(event)
+        if stream_event is None:
+            return
+        if threading.get_ident() == loop_thread:
+            push(stream_event)
+        else:
+            loop.call_soon_threadsafe(push, stream_event)
+
+    def on_done(_: asyncio.Future[Any]) -> None:
+        nonlocal finished
+        finished = True
+        ready.set()
+
+    task = asyncio.ensure_future(run(sink))
+    task.add_done_callback(on_done)
+    try:
+        while True:
+            while pending:
+                yield pending.popleft()
+            if finished:
+                break
+            ready.clear()
+            await ready.wait()
+        output, context = task.result()
+        yield RunResult(output=output, context=context)
+    finally:
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        elif not task.cancelled():
+            task.exception()  # mark retrieved when the caller stopped early
@@ -1,7 +1,7 @@
 """Runtime-owned tool and toolset type surface."""
 from __future__ import annotations
 
-from typing import Any, TypeAlias
+from typing import Any, TypeAlias, TypeVar
 
 from pydantic_ai.tools import Tool, ToolFuncEither
 from pydantic_ai.toolsets import AbstractToolset, ToolsetFunc
@@ -9,6 +9,10 @@ from pydantic_ai.toolsets import AbstractToolset, ToolsetFunc
 ToolDef: TypeAlias = Tool[Any] | ToolFuncEither[Any, ...]
 ToolsetDef: TypeAlias = AbstractToolset[Any] | ToolsetFunc[Any]
 
+SHAREABLE_TOOLSET_ATTR = "__llm_do_shareable__"
+
+_ToolsetClass = TypeVar("_ToolsetClass", bound=type)
+
 
 def tool_def_name(tool: ToolDef) -> str:
     """Return the callable name for a tool definition."""
@@ -23,3 +27,17 @@ def is_tool_def(value: Any) -> bool:
 
 def is_toolset_def(value: Any) -> bool:
     return isinstance(value, AbstractToolset) or callable(value)
+
+
+def shareable_toolset(cls: _ToolsetClass) -> _ToolsetClass:
+    """Mark a toolset class whose instances may be reused across calls.
+
+    Shareable toolsets keep no mutable per-call state on the instance; anything
+    call-scoped goes through ``CallFrame.toolset_state()``.
+    """
+    setattr(cls, SHAREABLE_TOOLSET_ATTR, True)
+    return cls
+
+
+def is_shareable_toolset(toolset: Any) -> bool:
+    return getattr(toolset, SHAREABLE_TOOLSET_ATTR, False) is True
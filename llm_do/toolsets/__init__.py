@@ -2,9 +2,15 @@
 
 from .filesystem import FileSystemToolset, ReadOnlyFileSystemToolset
 from .shell import ShellToolset
+from .validators import ArgsSchema, ValidatedArgs, args_model, args_schema, args_tool
 
 __all__ = [
+    "ArgsSchema",
     "FileSystemToolset",
     "ReadOnlyFileSystemToolset",
     "ShellToolset",
+    "ValidatedArgs",
+    "args_model",
+    "args_schema",
+    "args_tool",
 ]
@@ -4,16 +4,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-from pydantic_ai.tools import RunContext, ToolDefinition
+from pydantic_ai.tools import RunContext
 from pydantic_ai.toolsets import AbstractToolset, ToolsetTool
 from pydantic_ai.toolsets._dynamic import DynamicToolset
 from pydantic_ai_blocking_approval import ApprovalResult
 
 from ..runtime.approval import resolve_agent_call_approval
-from ..runtime.args import Attachment, has_attachments, normalize_input
+from ..runtime.args import Attachment, has_attachments
 from ..runtime.contracts import AgentSpec, CallContextProtocol
 from ..runtime.tooling import ToolsetDef
-from ..toolsets.validators import DictValidator
+from ..toolsets.validators import args_model, args_tool
 
 
 @dataclass
@@ -33,8 +33,7 @@ class AgentToolset(AbstractToolset[Any]):
 
     def _messages_from_args(self, tool_args: dict[str, Any]) -> list[Any] | None:
         try:
-            _, messages = normalize_input(self.spec.input_model, tool_args)
-            return messages
+            return args_model(tool_args, self.spec.input_model).prompt_messages()
         except Exception:
             return None
 
@@ -58,11 +57,21 @@ class AgentToolset(AbstractToolset[Any]):
                 return ApprovalResult.pre_approved()
             return ApprovalResult.needs_approval()
 
+        runtime_config = getattr(getattr(ctx, "deps", None), "config", None)
+        # Only attachments can change the outcome; skip input validation when
+        # even an attachment-carrying call would be pre-approved.
+        upper_bound = resolve_agent_call_approval(
+            runtime_config,
+            self.spec.name,
+            has_attachments=True,
+        )
+        if upper_bound.is_pre_approved:
+            return upper_bound
+
         messages = self._messages_from_args(tool_args)
         has_attach = has_attachments(messages) if messages is not None else bool(
             tool_args.get("attachments")
         )
-        runtime_config = getattr(getattr(ctx, "deps", None), "config", None)
         return resolve_agent_call_approval(
             runtime_config,
             self.spec.name,
@@ -87,20 +96,7 @@ class AgentToolset(AbstractToolset[Any]):
         tool_name = self.tool_name or self.spec.name
         desc = self.spec.description or self.spec.instructions
         desc = desc[:200] + "..." if len(desc) > 200 else desc
-        schema = self.spec.input_model
-        tool_def = ToolDefinition(
-            name=tool_name,
-            description=desc,
-            parameters_json_schema=schema.model_json_schema(),
-        )
-        return {
-            tool_name: ToolsetTool(
-                toolset=self,
-                tool_def=tool_def,
-                max_retries=0,
-                args_validator=DictValidator(schema),
-            )
-        }
+        return {tool_name: args_tool(self, tool_name, desc, self.spec.input_model, max_retries=0)}
 
     async def call_tool(
         self,
@@ -109,7 +105,7 @@ class AgentToolset(AbstractToolset[Any]):
         run_ctx: RunContext[CallContextProtocol],
         tool: ToolsetTool[Any],
     ) -> Any:
-        return await run_ctx.deps.call_agent(self.spec, tool_args)
+        return await run_ctx.deps.call_agent(self.spec, args_model(tool_args, self.spec.input_model))
 
 
 def agent_as_toolset(spec: AgentSpec, *, tool_name: str | None = None) -> ToolsetDef:
@@ -8,7 +8,7 @@ from pydantic_ai.tools import RunContext
 from pydantic_ai.toolsets import AbstractToolset
 from pydantic_ai.toolsets._dynamic import DynamicToolset
 
-from ..runtime.tooling import ToolsetDef
+from ..runtime.tooling import ToolsetDef, is_shareable_toolset
 from .dynamic_agents import DynamicAgentsToolset
 from .filesystem import FileSystemToolset, ReadOnlyFileSystemToolset
 from .shell import ShellToolset
@@ -27,9 +27,9 @@ _SHELL_READONLY_RULES = [
     {"pattern": "uniq", "approval_required": False},
     {"pattern": "cat", "approval_required": False},
     {"pattern": "ls", "approval_required": False},
-    {"pattern": "git log", "approval_required": False},
+    {"pattern": "git log", "approval_required": False, "cacheable": True},
     {"pattern": "git diff", "approval_required": False},
-    {"pattern": "git show", "approval_required": False},
+    {"pattern": "git show", "approval_required": False, "cacheable": True},
     {"pattern": "git status", "approval_required": False},
 ]
 
@@ -54,6 +54,14 @@ def _per_run_toolset(factory: Callable[[], AbstractToolset[Any]]) -> ToolsetDef:
     return DynamicToolset(toolset_func=build, per_run_step=False)
 
 
+def _builtin_toolset(factory: Callable[[], AbstractToolset[Any]]) -> ToolsetDef:
+    """Reuse one instance for shareable toolsets; build per run otherwise."""
+    toolset = factory()
+    if is_shareable_toolset(toolset):
+        return toolset
+    return _per_run_toolset(factory)
+
+
 def build_builtin_toolsets(
     cwd: Path,
     project_root: Path | None,
@@ -74,13 +82,13 @@ def build_builtin_toolsets(
                 return ReadOnlyFileSystemToolset(config=dict(config))
             return FileSystemToolset(config=dict(config))
 
-        return _per_run_toolset(factory)
+        return _builtin_toolset(factory)
 
     def shell_factory(rules: list[dict[str, Any]]) -> ToolsetDef:
         def factory() -> AbstractToolset[Any]:
             return ShellToolset(config={"rules": [dict(rule) for rule in rules]})
 
-        return _per_run_toolset(factory)
+        return _builtin_toolset(factory)
 
     return {
         "filesystem_cwd": filesystem_factory(cwd_config, read_only=False),
@@ -89,5 +97,5 @@ def build_builtin_toolsets(
         "filesystem_project_ro": filesystem_factory(project_config, read_only=True),
         "shell_readonly": shell_factory(_SHELL_READONLY_RULES),
         "shell_file_ops": shell_factory(_SHELL_FILE_OPS_RULES),
-        "dynamic_agents": _per_run_toolset(lambda: DynamicAgentsToolset()),
+        "dynamic_agents": _builtin_toolset(DynamicAgentsToolset),
     }
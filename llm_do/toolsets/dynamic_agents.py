@@ -1,6 +1,7 @@
 """Dynamic agent creation and invocation toolset."""
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 from dataclasses import dataclass
@@ -8,7 +9,6 @@ from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel, Field
-from pydantic_ai.tools import ToolDefinition
 from pydantic_ai.toolsets import AbstractToolset, ToolsetTool
 from pydantic_ai_blocking_approval import (
     ApprovalConfig,
@@ -17,14 +17,32 @@ from pydantic_ai_blocking_approval import (
 )
 
 from ..models import select_model_with_id
-from ..project.agent_file import build_agent_definition, load_agent_file_parts
+from ..project.agent_file import (
+    AgentDefinition,
+    build_agent_definition,
+    load_agent_file_parts,
+)
 from ..project.tool_resolution import resolve_tool_defs, resolve_toolset_defs
 from ..runtime.approval import resolve_agent_call_approval
+from ..runtime.args import PromptInput
 from ..runtime.contracts import AgentSpec, CallContextProtocol
-from ..toolsets.validators import DictValidator
+from ..runtime.tooling import shareable_toolset
+from .file_edits import atomic_write_text
+from .validators import args_model, args_tool
 
-_DEFAULT_GENERATED_DIR = Path("/tmp/llm-do/generated")
 _AGENT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+_DIGEST_CHARS = 16
+
+
+def _persisted_file_name(name: str, digest: str) -> str:
+    return f"{name}-{digest[:_DIGEST_CHARS]}.agent"
+
+
+def _generated_dir(ctx: CallContextProtocol) -> Path | None:
+    value = getattr(ctx.config, "generated_agents_dir", None)
+    if value is None:
+        return None
+    return value if isinstance(value, Path) else Path(value).expanduser().resolve()
 
 
 class AgentCreateArgs(BaseModel):
@@ -58,6 +76,7 @@ class AgentCallArgs(BaseModel):
     )
 
 
+@shareable_toolset
 @dataclass
 class DynamicAgentsToolset(AbstractToolset[Any]):
     """Toolset exposing agent_create/agent_call for dynamic agents."""
@@ -118,27 +137,22 @@ class DynamicAgentsToolset(AbstractToolset[Any]):
 
     async def get_tools(self, ctx: Any) -> dict[str, ToolsetTool[Any]]:
         return {
-            "agent_create": ToolsetTool(
-                toolset=self,
-                tool_def=ToolDefinition(
-                    name="agent_create",
-                    description="Create a new agent definition for this session.",
-                    parameters_json_schema=AgentCreateArgs.model_json_schema(),
-                    sequential=True,
-                ),
+            "agent_create": args_tool(
+                self,
+                "agent_create",
+                "Create a new agent definition for this session.",
+                AgentCreateArgs,
                 max_retries=self._max_retries,
-                args_validator=DictValidator(AgentCreateArgs),
+                # A step that creates agents runs its tool calls in order, so
+                # an agent_call next to the agent_create it depends on sees it.
+                sequential=True,
             ),
-            "agent_call": ToolsetTool(
-                toolset=self,
-                tool_def=ToolDefinition(
-                    name="agent_call",
-                    description="Call a dynamically created agent by name.",
-                    parameters_json_schema=AgentCallArgs.model_json_schema(),
-                    sequential=True,
-                ),
+            "agent_call": args_tool(
+                self,
+                "agent_call",
+                "Call a dynamically created agent by name.",
+                AgentCallArgs,
                 max_retries=self._max_retries,
-                args_validator=DictValidator(AgentCallArgs),
             ),
         }
 
@@ -154,11 +168,9 @@ class DynamicAgentsToolset(AbstractToolset[Any]):
             raise TypeError("dynamic_agents tools require CallContext deps")
 
         if name == "agent_create":
-            create_args = AgentCreateArgs.model_validate(tool_args)
-            return self._agent_create(call_ctx, create_args)
+            return self._agent_create(call_ctx, args_model(tool_args, AgentCreateArgs))
         if name == "agent_call":
-            call_args = AgentCallArgs.model_validate(tool_args)
-            return await self._agent_call(call_ctx, call_args)
+            return await self._agent_call(call_ctx, args_model(tool_args, AgentCallArgs))
         raise ValueError(f"Unknown tool: {name}")
 
     def _agent_create(
@@ -173,84 +185,105 @@ class DynamicAgentsToolset(AbstractToolset[Any]):
             raise ValueError(
                 "Agent name must contain only letters, numbers, '_' or '-'"
             )
-        if name in ctx.dynamic_agents:
-            raise ValueError(f"Dynamic agent '{name}' already exists")
-        if name in ctx.agent_registry:
-            raise ValueError(f"Agent name '{name}' conflicts with a registered agent")
-
         instructions = args.instructions.strip()
         if not instructions:
             raise ValueError("agent_create requires non-empty instructions")
 
-        generated_dir = self._resolve_generated_dir(ctx)
-        generated_dir.mkdir(parents=True, exist_ok=True)
-        agent_path = generated_dir / f"{name}.agent"
-        if agent_path.exists():
-            raise FileExistsError(f"Agent file already exists: {agent_path}")
-
-        frontmatter = self._render_frontmatter(
-            name=name,
-            description=args.description,
-            model=args.model,
-            tools=args.tools,
-            toolsets=args.toolsets,
-        )
-        content = f"{frontmatter}\n\n{instructions}\n"
-        agent_path.write_text(content, encoding="utf-8")
-
-        try:
-            parsed_frontmatter, parsed_instructions = load_agent_file_parts(agent_path)
-            agent_def = build_agent_definition(
-                parsed_frontmatter,
-                parsed_instructions,
+        content = self._render_agent_file(name, args, instructions)
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        # Runs sharing this runtime, and agent_call loading persisted agents, may race here.
+        with ctx.dynamic_agents.creation_lock:
+            if name in ctx.dynamic_agents:
+                if ctx.dynamic_agents.digest(name) == digest:
+                    return name
+                raise ValueError(f"Dynamic agent '{name}' already exists")
+            if name in ctx.agent_registry:
+                raise ValueError(f"Agent name '{name}' conflicts with a registered agent")
+
+            agent_def = AgentDefinition(
+                name=name,
+                description=args.description or None,
+                instructions=instructions,
+                model=args.model or None,
+                tools=list(args.tools),
+                toolsets=list(args.toolsets),
             )
-            resolved_toolsets = []
-            tool_defs = []
-            if agent_def.tools:
-                available_tools = ctx.tool_registry
-                if not available_tools:
-                    raise ValueError(
-                        "Tool registry unavailable; cannot validate tools."
-                    )
-                tool_defs = resolve_tool_defs(
-                    agent_def.tools,
-                    available_tools=available_tools,
-                    agent_name=agent_def.name,
-                )
-            if agent_def.toolsets:
-                available_toolsets = ctx.toolset_registry
-                if not available_toolsets:
-                    raise ValueError(
-                        "Toolset registry unavailable; cannot validate toolsets."
-                    )
-                resolved_toolsets = resolve_toolset_defs(
-                    agent_def.toolsets,
-                    available_toolsets=available_toolsets,
-                    agent_name=agent_def.name,
+            spec = self._build_spec(ctx, agent_def)
+
+            generated_dir = _generated_dir(ctx)
+            if generated_dir is not None:
+                agent_path = generated_dir / _persisted_file_name(name, digest)
+                if not agent_path.exists():
+                    atomic_write_text(agent_path, content)
+
+            ctx.dynamic_agents.add(name, spec, digest)
+        return name
+
+    def _build_spec(self, ctx: CallContextProtocol, agent_def: AgentDefinition) -> AgentSpec:
+        resolved_toolsets = []
+        tool_defs = []
+        if agent_def.tools:
+            available_tools = ctx.tool_registry
+            if not available_tools:
+                raise ValueError(
+                    "Tool registry unavailable; cannot validate tools."
                 )
-            selection = select_model_with_id(
-                agent_model=agent_def.model,
-                compatible_models=agent_def.compatible_models,
+            tool_defs = resolve_tool_defs(
+                agent_def.tools,
+                available_tools=available_tools,
                 agent_name=agent_def.name,
             )
-            spec = AgentSpec(
-                name=agent_def.name,
-                instructions=agent_def.instructions,
-                description=agent_def.description,
-                model=selection.model,
-                model_id=selection.model_id,
-                tools=tool_defs,
-                toolsets=resolved_toolsets,
+        if agent_def.toolsets:
+            available_toolsets = ctx.toolset_registry
+            if not available_toolsets:
+                raise ValueError(
+                    "Toolset registry unavailable; cannot validate toolsets."
+                )
+            resolved_toolsets = resolve_toolset_defs(
+                agent_def.toolsets,
+                available_toolsets=available_toolsets,
+                agent_name=agent_def.name,
             )
-        except Exception:
-            try:
-                agent_path.unlink()
-            except FileNotFoundError:
-                pass
-            raise
-
-        ctx.dynamic_agents[name] = spec
-        return name
+        selection = select_model_with_id(
+            agent_model=agent_def.model,
+            compatible_models=agent_def.compatible_models,
+            agent_name=agent_def.name,
+            cache=ctx.model_cache,
+        )
+        return AgentSpec(
+            name=agent_def.name,
+            instructions=agent_def.instructions,
+            description=agent_def.description,
+            model=selection.model,
+            model_id=selection.model_id,
+            tools=tool_defs,
+            toolsets=resolved_toolsets,
+        )
+
+    def _load_persisted(self, ctx: CallContextProtocol, name: str) -> AgentSpec | None:
+        """Rebuild an agent persisted by an earlier run (or evicted from the registry)."""
+        generated_dir = _generated_dir(ctx)
+        if generated_dir is None or name in ctx.agent_registry or not generated_dir.is_dir():
+            return None
+        pattern = re.compile(rf"^{re.escape(name)}-([0-9a-f]{{{_DIGEST_CHARS}}})\.agent$")
+        candidates = [path for path in generated_dir.iterdir() if pattern.match(path.name)]
+        if not candidates:
+            return None
+        with ctx.dynamic_agents.creation_lock:
+            if name in ctx.dynamic_agents:
+                return ctx.dynamic_agents[name]
+            return self._load_file(ctx, name, max(candidates, key=lambda path: path.stat().st_mtime_ns))
+
+    def _load_file(self, ctx: CallContextProtocol, name: str, agent_path: Path) -> AgentSpec | None:
+        # Hash what is on disk: a hand-edited file then differs from any re-creation.
+        digest = hashlib.sha256(agent_path.read_bytes()).hexdigest()
+        parsed_frontmatter, parsed_instructions = load_agent_file_parts(agent_path)
+        agent_def = build_agent_definition(parsed_frontmatter, parsed_instructions)
+        if agent_def.name != name:
+            return None
+        spec = self._build_spec(ctx, agent_def)
+        ctx.dynamic_agents.add(name, spec, digest)
+        return spec
 
     async def _agent_call(
         self,
@@ -260,26 +293,32 @@ class DynamicAgentsToolset(AbstractToolset[Any]):
         name = args.agent.strip()
         if not name:
             raise ValueError("agent_call requires a non-empty agent name")
-        try:
-            spec = ctx.dynamic_agents[name]
-        except KeyError as exc:
+        spec = ctx.dynamic_agents.get(name) or self._load_persisted(ctx, name)
+        if spec is None:
             available = sorted(ctx.dynamic_agents.keys())
             raise ValueError(
                 f"Dynamic agent '{name}' not found. Available: {available}"
-            ) from exc
+            )
 
+        if spec.input_model is PromptInput:
+            # Same fields and types as AgentCallArgs, already validated.
+            prompt = PromptInput.model_construct(input=args.input, attachments=list(args.attachments))
+            return await ctx.call_agent(spec, prompt)
         input_data: dict[str, Any] = {"input": args.input}
         if args.attachments:
             input_data["attachments"] = list(args.attachments)
         return await ctx.call_agent(spec, input_data)
 
-    def _resolve_generated_dir(self, ctx: CallContextProtocol) -> Path:
-        value = getattr(ctx.config, "generated_agents_dir", None)
-        if value is None:
-            return _DEFAULT_GENERATED_DIR
-        if isinstance(value, Path):
-            return value
-        return Path(value).expanduser().resolve()
+    def _render_agent_file(self, name: str, args: AgentCreateArgs, instructions: str) -> str:
+        """Render the ``.agent`` file for ``args``; its hash identifies the definition."""
+        frontmatter = self._render_frontmatter(
+            name=name,
+            description=args.description,
+            model=args.model,
+            tools=args.tools,
+            toolsets=args.toolsets,
+        )
+        return f"{frontmatter}\n\n{instructions}\n"
 
     def _render_frontmatter(
         self,
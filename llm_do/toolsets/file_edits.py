@@ -0,0 +1,170 @@
+"""Text edit primitives for ``edit_file``/``append_file``: patches, hashes, atomic writes."""
+from __future__ import annotations
+
+import difflib
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+MAX_DIFF_PREVIEW_CHARS = 4_000
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class EditConflictError(ValueError):
+    """The file changed since the caller last saw it."""
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def read_text_exact(path: Path) -> str:
+    """Read UTF-8 text without newline translation, so edits keep line endings."""
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write via a temp file in the same directory and ``os.replace`` it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _match_line_endings(text: str, fragment: str) -> str:
+    if "\r\n" in text and "\r\n" not in fragment:
+        return fragment.replace("\n", "\r\n")
+    return fragment
+
+
+def replace_exact(text: str, old: str, new: str, *, replace_all: bool = False) -> str:
+    """Replace ``old`` with ``new``; ``old`` must occur exactly once unless ``replace_all``."""
+    if not old:
+        raise ValueError("old_text must not be empty")
+    count = text.count(old)
+    if count == 0:
+        old, new = _match_line_endings(text, old), _match_line_endings(text, new)
+        count = text.count(old)
+    if count == 0:
+        raise ValueError("old_text not found in file")
+    if count > 1 and not replace_all:
+        raise ValueError(
+            f"old_text occurs {count} times; add surrounding context or set replace_all"
+        )
+    return text.replace(old, new)
+
+
+@dataclass(frozen=True, slots=True)
+class _Hunk:
+    old_start: int
+    old_lines: list[str]
+    new_lines: list[str]
+
+
+def _parse_hunks(diff: str) -> list[_Hunk]:
+    # Hunk line counts are ignored: model-written diffs often get them wrong.
+    lines = diff.replace("\r\n", "\n").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    hunks: list[_Hunk] = []
+    current: _Hunk | None = None
+    i = 0
+    while i < len(lines):
+        raw = lines[i]
+        i += 1
+        if raw.startswith("--- ") and i < len(lines) and lines[i].startswith("+++ "):
+            current = None
+            i += 1
+            continue
+        header = _HUNK_HEADER.match(raw)
+        if header:
+            current = _Hunk(old_start=int(header.group(1)), old_lines=[], new_lines=[])
+            hunks.append(current)
+            continue
+        if current is None or raw.startswith("\\"):
+            continue
+        tag, line = (raw[:1], raw[1:]) if raw else (" ", "")
+        if tag == " ":
+            current.old_lines.append(line)
+            current.new_lines.append(line)
+        elif tag == "-":
+            current.old_lines.append(line)
+        elif tag == "+":
+            current.new_lines.append(line)
+        else:
+            raise ValueError(f"Invalid diff line: {raw!r}")
+    if not hunks:
+        raise ValueError("diff contains no hunks")
+    return hunks
+
+
+def _find_hunk(lines: list[str], hunk: _Hunk, start: int, hint: int) -> int:
+    """Locate ``hunk.old_lines`` at or after ``start``, nearest to ``hint``."""
+    size = len(hunk.old_lines)
+    if size == 0:
+        return max(start, min(hint, len(lines)))
+    positions = [
+        i for i in range(start, len(lines) - size + 1)
+        if lines[i:i + size] == hunk.old_lines
+    ]
+    if not positions:
+        raise ValueError(f"Hunk at line {hunk.old_start} does not match the file")
+    return min(positions, key=lambda i: abs(i - hint))
+
+
+def apply_unified_diff(text: str, diff: str) -> str:
+    """Apply a unified diff to ``text``, allowing hunks to have shifted."""
+    newline = "\r\n" if "\r\n" in text else "\n"
+    trailing = text.endswith(newline)
+    body = text[: -len(newline)] if trailing else text
+    lines = body.split(newline) if text else []
+    out: list[str] = []
+    cursor = 0
+    for hunk in _parse_hunks(diff):
+        # "@@ -N,0" inserts after line N; otherwise N is the first old line.
+        hint = hunk.old_start if not hunk.old_lines else max(hunk.old_start - 1, 0)
+        position = _find_hunk(lines, hunk, cursor, hint)
+        out.extend(lines[cursor:position])
+        out.extend(hunk.new_lines)
+        cursor = position + len(hunk.old_lines)
+    out.extend(lines[cursor:])
+    result = newline.join(out)
+    if out and (trailing or not text):
+        result += newline
+    return result
+
+
+def diff_preview(path: str, before: str, after: str) -> str:
+    """Unified diff for approval prompts, capped at ``MAX_DIFF_PREVIEW_CHARS``."""
+    diff = "".join(
+        difflib.unified_diff(
+            before.splitlines(keepends=True),
+            after.splitlines(keepends=True),
+            fromfile=f"a/{path}",
+            tofile=f"b/{path}",
+        )
+    )
+    if len(diff) > MAX_DIFF_PREVIEW_CHARS:
+        diff = diff[:MAX_DIFF_PREVIEW_CHARS] + f"\n... ({len(diff) - MAX_DIFF_PREVIEW_CHARS} more chars)"
+    return diff or "(no changes)"
@@ -0,0 +1,327 @@
+"""Ignore-aware, paginated directory walking for ``list_files``.
+
+The walker uses ``os.scandir`` and visits directories depth-first with entries
+sorted by name, so results come out in a stable order: each path sorts after
+everything before it when compared component by component. A cursor is simply
+the last path returned; the next page resumes after it and skips every
+subtree that sorts entirely before it.
+
+Ignore rules use a practical subset of ``.gitignore`` syntax (``*``, ``**``,
+``?``, ``[...]``, leading ``/`` anchors, trailing ``/`` for directories, ``!``
+negation). Ignored directories are pruned, never scanned. ``.gitignore`` files
+are honoured from the listing root downwards. Symlinked directories are listed
+as entries but not followed.
+
+``DirectoryIndex`` optionally caches each directory's sorted listing and parsed
+``.gitignore``, keyed by the directory's mtime, so repeated listings of a large
+tree only rescan directories whose entries changed.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+DEFAULT_IGNORE_PATTERNS: tuple[str, ...] = (".git/", "node_modules/", "__pycache__/", ".venv/")
+DIR_INDEX_RESOURCE = "llm_do.filesystem.dir_index"
+MAX_INDEXED_DIRS = 200_000
+
+
+def _translate_class(pattern: str, start: int) -> tuple[str, int] | None:
+    end = start + 1
+    if end < len(pattern) and pattern[end] in "!^":
+        end += 1
+    if end < len(pattern) and pattern[end] == "]":
+        end += 1
+    end = pattern.find("]", end)
+    if end < 0:
+        return None
+    body = pattern[start + 1:end].replace("\\", "\\\\")
+    if body[:1] in ("!", "^"):
+        body = "^" + body[1:]
+    return f"[{body}]", end + 1
+
+
+@lru_cache(maxsize=1024)
+def glob_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a ``/``-separated glob where ``**`` spans directories."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if i < n and pattern[i] == "/":
+                    out.append("(?:.*/)?")
+                    i += 1
+                else:
+                    out.append(".*")
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            translated = _translate_class(pattern, i)
+            if translated is not None:
+                out.append(translated[0])
+                i = translated[1]
+                continue
+            out.append(re.escape(c))
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out), re.DOTALL)
+
+
+@dataclass(frozen=True, slots=True)
+class IgnoreRule:
+    """One ``.gitignore`` line, matched relative to the directory defining it."""
+
+    base: str
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+    @classmethod
+    def parse(cls, line: str, base: str = "") -> "IgnoreRule | None":
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            return None
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+        anchored = "/" in line
+        return cls(
+            base=base,
+            regex=glob_regex(line.lstrip("/")),
+            negate=negate,
+            dir_only=dir_only,
+            anchored=anchored,
+        )
+
+    def matches(self, rel: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel.startswith(self.base + "/"):
+                return False
+            rel = rel[len(self.base) + 1:]
+        target = rel if self.anchored else name
+        return self.regex.fullmatch(target) is not None
+
+
+@lru_cache(maxsize=4096)
+def _parse_ignore_lines(lines: tuple[str, ...], base: str) -> tuple[IgnoreRule, ...]:
+    rules = (IgnoreRule.parse(line, base) for line in lines)
+    return tuple(rule for rule in rules if rule is not None)
+
+
+def parse_ignore_lines(lines: Sequence[str], base: str = "") -> tuple[IgnoreRule, ...]:
+    return _parse_ignore_lines(tuple(lines), base)
+
+
+def is_ignored(rules: Sequence[IgnoreRule], rel: str, name: str, is_dir: bool) -> bool:
+    ignored = False
+    for rule in rules:
+        if rule.negate == ignored and rule.matches(rel, name, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+@dataclass(frozen=True, slots=True)
+class DirListing:
+    """Sorted entry names of one directory and its ``.gitignore`` lines."""
+
+    mtime_ns: int
+    files: tuple[str, ...]
+    dirs: tuple[str, ...]
+    gitignore: tuple[str, ...]
+    gitignore_mtime_ns: int | None
+
+
+def scan_directory(path: Path) -> DirListing:
+    # Stat first so a change made during the scan invalidates this listing.
+    mtime_ns = path.stat().st_mtime_ns
+    files: list[str] = []
+    dirs: list[str] = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+            except OSError:
+                continue
+    gitignore: tuple[str, ...] = ()
+    gitignore_mtime: int | None = None
+    if ".gitignore" in files:
+        gitignore_path = path / ".gitignore"
+        try:
+            gitignore_mtime = gitignore_path.stat().st_mtime_ns
+            gitignore = tuple(gitignore_path.read_text(encoding="utf-8", errors="replace").splitlines())
+        except OSError:
+            gitignore_mtime = None
+    return DirListing(
+        mtime_ns=mtime_ns,
+        files=tuple(sorted(files)),
+        dirs=tuple(sorted(dirs)),
+        gitignore=gitignore,
+        gitignore_mtime_ns=gitignore_mtime,
+    )
+
+
+class DirectoryIndex:
+    """Cache of ``DirListing`` per directory, refreshed when its mtime changes.
+
+    A lookup costs one ``stat`` of the directory (plus its ``.gitignore``, if
+    any) instead of a full ``scandir``. Content-only edits to files do not
+    change a directory's mtime, which is fine: listings only depend on names.
+    """
+
+    def __init__(self, max_dirs: int = MAX_INDEXED_DIRS) -> None:
+        self.max_dirs = max_dirs
+        self._listings: dict[Path, DirListing] = {}
+        self._lock = threading.Lock()
+        self.scans = 0
+        self.reuses = 0
+
+    def listing(self, path: Path) -> DirListing:
+        cached = self._listings.get(path)
+        if cached is not None and self._is_fresh(path, cached):
+            self.reuses += 1
+            return cached
+        listing = scan_directory(path)
+        with self._lock:
+            self.scans += 1
+            if len(self._listings) >= self.max_dirs and path not in self._listings:
+                self._listings.clear()
+            self._listings[path] = listing
+        return listing
+
+    @staticmethod
+    def _is_fresh(path: Path, listing: DirListing) -> bool:
+        try:
+            if path.stat().st_mtime_ns != listing.mtime_ns:
+                return False
+            if listing.gitignore_mtime_ns is not None:
+                return (path / ".gitignore").stat().st_mtime_ns == listing.gitignore_mtime_ns
+        except OSError:
+            return False
+        return True
+
+
+@dataclass(frozen=True, slots=True)
+class WalkPage:
+    files: list[str]
+    truncated: bool
+    total_files: int
+    next_cursor: str | None
+
+
+def _parts(rel: str) -> tuple[str, ...]:
+    return tuple(rel.split("/")) if rel else ()
+
+
+def _pattern_depth(pattern: str) -> int | None:
+    if "**" in pattern:
+        return None
+    return pattern.strip("/").count("/") + 1
+
+
+def walk_files(
+    root: Path,
+    *,
+    pattern: str = "**/*",
+    ignore: Sequence[str] = DEFAULT_IGNORE_PATTERNS,
+    use_gitignore: bool = True,
+    max_depth: int | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    count_remaining: bool = True,
+    listing: Callable[[Path], DirListing] = scan_directory,
+) -> WalkPage:
+    """Return one page of files under ``root`` whose relative path matches ``pattern``.
+
+    ``max_depth`` counts directory levels (1 = direct children only). When the
+    page is full the walk keeps counting matches for ``total_files`` unless
+    ``count_remaining`` is false, in which case ``total_files`` is a lower bound.
+    """
+    matcher = glob_regex(pattern.lstrip("/")).fullmatch
+    implied = _pattern_depth(pattern)
+    if implied is not None:
+        max_depth = implied if max_depth is None else min(max_depth, implied)
+    cursor_parts = _parts(cursor.strip("/")) if cursor else ()
+    page: list[str] = []
+    total = 0
+    truncated = False
+
+    base_rules = parse_ignore_lines(ignore)
+
+    def open_dir(
+        dir_rel: str, rules: tuple[IgnoreRule, ...]
+    ) -> tuple[str, tuple[IgnoreRule, ...], Iterator[tuple[str, bool]]] | None:
+        try:
+            entries = listing(root / dir_rel if dir_rel else root)
+        except OSError:
+            return None
+        if use_gitignore and entries.gitignore:
+            rules = rules + parse_ignore_lines(entries.gitignore, dir_rel)
+        merged = sorted(
+            [(name, False) for name in entries.files] + [(name, True) for name in entries.dirs]
+        )
+        return dir_rel, rules, iter(merged)
+
+    def visit() -> Iterator[str]:
+        opened = open_dir("", base_rules)
+        stack = [opened] if opened is not None else []
+        while stack:
+            dir_rel, rules, entries = stack[-1]
+            item = next(entries, None)
+            if item is None:
+                stack.pop()
+                continue
+            name, is_dir = item
+            child = f"{dir_rel}/{name}" if dir_rel else name
+            if is_ignored(rules, child, name, is_dir):
+                continue
+            if cursor_parts:
+                child_parts = _parts(child)
+                if is_dir and child_parts < cursor_parts[:len(child_parts)]:
+                    continue
+                if not is_dir and child_parts <= cursor_parts:
+                    continue
+            if is_dir:
+                if max_depth is None or len(stack) < max_depth:
+                    opened = open_dir(child, rules)
+                    if opened is not None:
+                        stack.append(opened)
+                continue
+            if matcher(child):
+                yield child
+
+    for rel in visit():
+        total += 1
+        if limit is not None and len(page) >= limit:
+            truncated = True
+            if not count_remaining:
+                break
+            continue
+        page.append(rel)
+    next_cursor = page[-1] if truncated and page else None
+    return WalkPage(files=page, truncated=truncated, total_files=total, next_cursor=next_cursor)
@@ -1,22 +1,52 @@
 """Simple filesystem toolset for llm-do agents."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 from pathlib import Path
-from typing import Any, Optional, cast
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field
-from pydantic_ai.tools import ToolDefinition
 from pydantic_ai.toolsets import AbstractToolset, ToolsetTool
-from pydantic_ai.toolsets.abstract import SchemaValidatorProt
 from pydantic_ai_blocking_approval import (
     ApprovalConfig,
     ApprovalResult,
     needs_approval_from_config,
 )
 
-from .validators import DictValidator
+from ..runtime.tooling import shareable_toolset
+from .file_edits import (
+    EditConflictError,
+    apply_unified_diff,
+    atomic_write_text,
+    content_hash,
+    diff_preview,
+    read_text_exact,
+    replace_exact,
+)
+from .file_walk import (
+    DEFAULT_IGNORE_PATTERNS,
+    DIR_INDEX_RESOURCE,
+    DirectoryIndex,
+    scan_directory,
+    walk_files,
+)
+from .read_cache import DEFAULT_READ_CACHE_BYTES, FileReadCache, runtime_read_cache
+from .search_index import (
+    DEFAULT_INDEX_DIR,
+    DEFAULT_MAX_FILE_BYTES,
+    get_search_index,
+    notify_file_changed,
+)
+from .text_index import decode_text, get_char_index
+from .validators import args_tool
 
 DEFAULT_MAX_READ_CHARS = 20_000
+DEFAULT_LIST_LIMIT = 1_000
+DEFAULT_BATCH_READ_CHARS = 100_000
+MAX_BATCH_FILES = 50
+BATCH_READ_CONCURRENCY = 8
+_WRITE_TOOLS = ("write_file", "edit_file", "append_file")
 
 
 class ReadResult(BaseModel):
@@ -25,6 +55,54 @@ class ReadResult(BaseModel):
     total_chars: int = Field(description="Total file size in characters")
     offset: int = Field(description="Starting character position")
     chars_read: int = Field(description="Characters returned")
+    sha256: Optional[str] = Field(default=None, description="SHA-256 of the file (files under 1 MB); pass to edit_file/append_file as expected_sha256")
+
+
+class FileContent(BaseModel):
+    path: str = Field(description="The path as requested (or relative to path for globs)")
+    content: str = Field(default="", description="The file content read")
+    truncated: bool = Field(default=False, description="True if more content exists")
+    total_chars: int = Field(default=0, description="Total file size in characters")
+    chars_read: int = Field(default=0, description="Characters returned")
+    sha256: Optional[str] = Field(default=None, description="SHA-256 of the file (files under 1 MB)")
+    error: Optional[str] = Field(default=None, description="Why the file could not be read")
+
+
+class ReadFilesResult(BaseModel):
+    files: list[FileContent] = Field(description="One entry per file, in request order")
+    truncated: bool = Field(description="True if any file was cut short or files were left out")
+    chars_read: int = Field(description="Characters returned across all files")
+    files_omitted: int = Field(
+        default=0, description="Glob matches not read because of max_files (at least; the walk stops early)"
+    )
+
+
+class ListResult(BaseModel):
+    files: list[str] = Field(description="Matching file paths, relative to the listed directory")
+    truncated: bool = Field(description="True if more matching files exist")
+    total_files: int = Field(
+        description="Matching files from this page onward; a lower bound (page + 1) when truncated"
+    )
+    next_cursor: Optional[str] = Field(default=None, description="Pass as cursor to get the next page")
+
+
+class SearchMatch(BaseModel):
+    path: str = Field(description="File path, relative to the searched directory")
+    line: int = Field(description="1-based line number")
+    text: str = Field(description="The matching line")
+    before: list[str] = Field(default_factory=list, description="Context lines before the match")
+    after: list[str] = Field(default_factory=list, description="Context lines after the match")
+
+
+class SearchResult(BaseModel):
+    matches: list[SearchMatch] = Field(description="Matching lines in path order")
+    truncated: bool = Field(description="True if more matches exist")
+    files_searched: int = Field(description="Files scanned after index filtering")
+    files_indexed: int = Field(description="Files in the search index")
+    skipped: list[str] = Field(
+        default_factory=list,
+        description="Files not searched because they exceed the size limit",
+    )
 
 
 class ReadFileArgs(BaseModel):
@@ -33,24 +111,67 @@ class ReadFileArgs(BaseModel):
     offset: int = Field(default=0, description="Character position to start reading from")
 
 
+class ReadFilesArgs(BaseModel):
+    paths: list[str] = Field(default_factory=list, description="Paths of the files to read")
+    glob: Optional[str] = Field(default=None, description="Also read files matching this glob under path, e.g. 'src/**/*.py'")
+    path: str = Field(default=".", description="Directory the glob is relative to")
+    max_total_chars: int = Field(default=DEFAULT_BATCH_READ_CHARS, ge=1, description="Character budget shared by all files, in order")
+    max_files: int = Field(default=MAX_BATCH_FILES, ge=1, le=200, description="Maximum number of files to read")
+
+
 class WriteFileArgs(BaseModel):
     path: str = Field(description="Path to the file to write")
     content: str = Field(description="Content to write to the file")
 
 
+class EditFileArgs(BaseModel):
+    path: str = Field(description="Path to the file to edit")
+    old_text: Optional[str] = Field(default=None, description="Exact text to replace; must occur once unless replace_all")
+    new_text: str = Field(default="", description="Replacement for old_text")
+    replace_all: bool = Field(default=False, description="Replace every occurrence of old_text")
+    diff: Optional[str] = Field(default=None, description="Unified diff to apply instead of old_text/new_text")
+    expected_sha256: Optional[str] = Field(default=None, description="sha256 from read_file; fails if the file changed since")
+
+
+class AppendFileArgs(BaseModel):
+    path: str = Field(description="Path to the file to append to (created if missing)")
+    content: str = Field(description="Text to append")
+    expected_sha256: Optional[str] = Field(default=None, description="sha256 from read_file; fails if the file changed since")
+
+
 class ListFilesArgs(BaseModel):
     path: str = Field(default=".", description="Directory to search in")
     pattern: str = Field(default="**/*", description="Glob pattern to match")
+    limit: int = Field(default=DEFAULT_LIST_LIMIT, ge=1, description="Maximum files to return")
+    cursor: Optional[str] = Field(default=None, description="next_cursor from a previous truncated listing")
+    max_depth: Optional[int] = Field(default=None, ge=1, description="Maximum directory depth (1 = only direct children)")
+
+
+class SearchFilesArgs(BaseModel):
+    query: str = Field(description="Text or regular expression to search for")
+    path: str = Field(default=".", description="Directory to search in")
+    regex: bool = Field(default=False, description="Treat query as a Python regular expression")
+    ignore_case: bool = Field(default=False, description="Case-insensitive matching")
+    glob: Optional[str] = Field(default=None, description="Only search files matching this glob, e.g. '**/*.py'")
+    max_results: int = Field(default=100, ge=1, description="Maximum matching lines to return")
+    context_lines: int = Field(default=0, ge=0, le=20, description="Lines of context before and after each match")
 
 
+@shareable_toolset
 class FileSystemToolset(AbstractToolset[Any]):
-    """Simple file I/O toolset: read_file, write_file, list_files."""
+    """File I/O toolset: read/write/edit/append, list and search files."""
 
     def __init__(self, config: dict, id: Optional[str] = None, max_retries: int = 1):
         self._config = config
         self._base_path: Path | None = Path(config["base_path"]).expanduser().resolve() if "base_path" in config else None
         self._read_approval = config.get("read_approval", False)
         self._write_approval = config.get("write_approval", True)
+        self._read_cache_bytes = int(config.get("read_cache_bytes", DEFAULT_READ_CACHE_BYTES))
+        self._ignore = tuple(config.get("ignore", DEFAULT_IGNORE_PATTERNS))
+        self._use_gitignore = config.get("use_gitignore", True)
+        self._list_index = config.get("list_index", False)
+        self._search_index_dir = Path(config.get("search_index_dir", DEFAULT_INDEX_DIR)).expanduser()
+        self._search_max_file_bytes = int(config.get("search_max_file_bytes", DEFAULT_MAX_FILE_BYTES))
         self._toolset_id = id
         self._max_retries = max_retries
 
@@ -82,8 +203,12 @@ class FileSystemToolset(AbstractToolset[Any]):
 
         approval_required = {
             "read_file": self._read_approval,
+            "read_files": self._read_approval,
             "list_files": self._read_approval,
+            "search_files": self._read_approval,
             "write_file": self._write_approval,
+            "edit_file": self._write_approval,
+            "append_file": self._write_approval,
         }.get(name)
         if approval_required is None:
             return ApprovalResult.needs_approval()
@@ -93,12 +218,19 @@ class FileSystemToolset(AbstractToolset[Any]):
         self, name: str, tool_args: dict[str, Any], ctx: Any
     ) -> str:
         path = tool_args.get("path", "")
-        if name == "write_file":
-            return f"Write {len(tool_args.get('content', ''))} chars to {path}"
+        if name in _WRITE_TOOLS:
+            return self._describe_write(name, tool_args)
         if name == "read_file":
             return f"Read from {path}"
+        if name == "read_files":
+            targets = list(tool_args.get("paths") or [])
+            if tool_args.get("glob"):
+                targets.append(f"{tool_args.get('path', '.')}/{tool_args['glob']}")
+            return f"Read {len(targets)} path(s): {', '.join(targets)}"
         if name == "list_files":
             return f"List files matching {tool_args.get('pattern', '**/*')} in {tool_args.get('path', '.')}"
+        if name == "search_files":
+            return f"Search for {tool_args.get('query', '')!r} in {tool_args.get('path', '.')}"
         return f"{name}({path})"
 
     def get_capabilities(
@@ -108,34 +240,51 @@ class FileSystemToolset(AbstractToolset[Any]):
         ctx: Any,
         config: ApprovalConfig | None = None,
     ) -> set[str]:
-        if name == "read_file":
+        if name in ("read_file", "read_files", "search_files"):
             base = "fs.read"
         elif name == "list_files":
             base = "fs.list"
-        elif name == "write_file":
+        elif name in _WRITE_TOOLS:
             base = "fs.write"
         else:
             return set()
 
         caps = {base}
-        path = tool_args.get("path")
-        if not path or self._base_path is None:
+        if self._base_path is None:
             return caps
-
-        try:
-            resolved = self._resolve_path(str(path))
-        except Exception:
-            return caps
-
-        try:
-            resolved.relative_to(self._base_path)
-        except ValueError:
-            caps.add(f"{base}.outside_base")
-        else:
-            caps.add(f"{base}.within_base")
+        paths = [tool_args.get("path")]
+        if name == "read_files":
+            paths = list(tool_args.get("paths") or [])
+            if tool_args.get("glob"):
+                paths.append(tool_args.get("path", "."))
+        for path in paths:
+            if not path:
+                continue
+            try:
+                resolved = self._resolve_path(str(path))
+            except Exception:
+                continue
+            try:
+                resolved.relative_to(self._base_path)
+            except ValueError:
+                caps.add(f"{base}.outside_base")
+            else:
+                caps.add(f"{base}.within_base")
         return caps
 
-    def read_file(self, path: str, max_chars: int = DEFAULT_MAX_READ_CHARS, offset: int = 0) -> ReadResult:
+    def _read_cache(self, ctx: Any) -> FileReadCache | None:
+        if self._read_cache_bytes <= 0:
+            return None
+        return runtime_read_cache(ctx, self._read_cache_bytes)
+
+    def read_file(
+        self,
+        path: str,
+        max_chars: int = DEFAULT_MAX_READ_CHARS,
+        offset: int = 0,
+        *,
+        cache: FileReadCache | None = None,
+    ) -> ReadResult:
         """Read text file with optional seeking support."""
         resolved = self._resolve_path(path)
         if not resolved.exists():
@@ -144,75 +293,360 @@ class FileSystemToolset(AbstractToolset[Any]):
             raise IsADirectoryError(f"Not a file: {path}")
 
         # For small files (< 1MB), just read the whole thing
-        if resolved.stat().st_size < 1024 * 1024:
-            text = resolved.read_text(encoding="utf-8")
+        st = resolved.stat()
+        if st.st_size < 1024 * 1024:
+            cached = cache.get(resolved, st) if cache is not None else None
+            if cached is not None:
+                text, digest = cached.text, cached.sha256
+            else:
+                data = resolved.read_bytes()
+                text, digest = decode_text(data), hashlib.sha256(data).hexdigest()
+                if cache is not None:
+                    cache.put(resolved, st, text, digest)
             total_chars = len(text)
             text = text[offset:] if offset > 0 else text
             truncated = len(text) > max_chars
-            return ReadResult(content=text[:max_chars], truncated=truncated, total_chars=total_chars, offset=offset, chars_read=min(len(text), max_chars))
-
-        # For larger files, use streaming approach
-        with open(resolved, "r", encoding="utf-8") as f:
-            if offset > 0:
-                skipped = 0
-                while skipped < offset:
-                    chunk = f.read(min(8192, offset - skipped))
-                    if not chunk:
-                        return ReadResult(content="", truncated=False, total_chars=skipped, offset=offset, chars_read=0)
-                    skipped += len(chunk)
-
-            text = f.read(max_chars + 1)
-            truncated = len(text) > max_chars
-            if truncated:
-                text = text[:max_chars]
-            remaining = sum(len(chunk) for chunk in iter(lambda: f.read(65536), ""))
-            total_chars = offset + len(text) + remaining + (1 if truncated else 0)
+            return ReadResult(content=text[:max_chars], truncated=truncated, total_chars=total_chars, offset=offset, chars_read=min(len(text), max_chars), sha256=digest)
 
-        return ReadResult(content=text, truncated=truncated, total_chars=total_chars, offset=offset, chars_read=len(text))
+        # For larger files, seek via a cached character-offset index
+        index = get_char_index(resolved, st)
+        text, truncated = index.read(offset, max_chars)
+        return ReadResult(content=text, truncated=truncated, total_chars=index.total_chars, offset=offset, chars_read=len(text))
 
-    def write_file(self, path: str, content: str) -> str:
-        """Write text file."""
+    async def read_files(
+        self,
+        paths: list[str] | None = None,
+        *,
+        glob: str | None = None,
+        path: str = ".",
+        max_total_chars: int = DEFAULT_BATCH_READ_CHARS,
+        max_files: int = MAX_BATCH_FILES,
+        cache: FileReadCache | None = None,
+    ) -> ReadFilesResult:
+        """Read several files concurrently in worker threads under one character budget.
+
+        Each file is read with the whole remaining budget as its limit, then the
+        budget is handed out in request order, so early files are complete and
+        later ones are cut short or left empty once it runs out.
+        """
+        targets = list(paths or [])
+        omitted = 0
+        if glob:
+            base = self._resolve_path(path)
+            if base.is_dir():
+                page = walk_files(
+                    base,
+                    pattern=glob,
+                    ignore=self._ignore,
+                    use_gitignore=self._use_gitignore,
+                    limit=max_files,
+                    count_remaining=False,
+                )
+                prefix = "" if path in ("", ".") else path.rstrip("/") + "/"
+                targets.extend(prefix + rel for rel in page.files)
+                omitted = page.total_files - len(page.files)
+        targets = list(dict.fromkeys(targets))
+        omitted += max(len(targets) - max_files, 0)
+        targets = targets[:max_files]
+        semaphore = asyncio.Semaphore(BATCH_READ_CONCURRENCY)
+
+        async def read_one(target: str) -> FileContent:
+            async with semaphore:
+                try:
+                    result = await asyncio.to_thread(self.read_file, target, max_total_chars, 0, cache=cache)
+                except (OSError, UnicodeDecodeError) as exc:
+                    return FileContent(path=target, error=str(exc))
+            return FileContent(
+                path=target,
+                content=result.content,
+                truncated=result.truncated,
+                total_chars=result.total_chars,
+                chars_read=result.chars_read,
+                sha256=result.sha256,
+            )
+
+        entries = await asyncio.gather(*(read_one(target) for target in targets))
+        remaining = max_total_chars
+        for entry in entries:
+            if entry.error is not None:
+                continue
+            if len(entry.content) > remaining:
+                entry.content = entry.content[:remaining]
+                entry.truncated = True
+            entry.chars_read = len(entry.content)
+            remaining -= entry.chars_read
+        return ReadFilesResult(
+            files=list(entries),
+            truncated=omitted > 0 or any(entry.truncated for entry in entries),
+            chars_read=max_total_chars - remaining,
+            files_omitted=omitted,
+        )
+
+    def _after_write(self, resolved: Path, cache: FileReadCache | None) -> None:
+        if cache is not None:
+            cache.invalidate(resolved)
+        notify_file_changed(resolved)
+
+    def write_file(self, path: str, content: str, *, cache: FileReadCache | None = None) -> str:
+        """Write text file (atomically, via a temp file and rename)."""
         resolved = self._resolve_path(path)
-        resolved.parent.mkdir(parents=True, exist_ok=True)
-        resolved.write_text(content, encoding="utf-8")
+        atomic_write_text(resolved, content)
+        self._after_write(resolved, cache)
         return f"Written {len(content)} characters to {path}"
 
-    def list_files(self, path: str = ".", pattern: str = "**/*") -> list[str]:
-        """List files matching pattern in a directory."""
+    @staticmethod
+    def _check_expected(path: str, current: str, expected_sha256: str | None) -> str:
+        digest = content_hash(current)
+        if expected_sha256 is not None and expected_sha256 != digest:
+            raise EditConflictError(f"{path} changed since it was read (sha256 {digest[:12]}...); read it again")
+        return digest
+
+    @staticmethod
+    def _edited_text(current: str, tool_args: dict[str, Any]) -> str:
+        diff = tool_args.get("diff")
+        old_text = tool_args.get("old_text")
+        if (diff is None) == (old_text is None):
+            raise ValueError("Provide either old_text/new_text or diff")
+        if diff is not None:
+            return apply_unified_diff(current, diff)
+        return replace_exact(
+            current,
+            old_text,
+            tool_args.get("new_text", ""),
+            replace_all=tool_args.get("replace_all", False),
+        )
+
+    def edit_file(
+        self,
+        path: str,
+        old_text: str | None = None,
+        new_text: str = "",
+        *,
+        replace_all: bool = False,
+        diff: str | None = None,
+        expected_sha256: str | None = None,
+        cache: FileReadCache | None = None,
+    ) -> str:
+        """Apply a search/replace or unified diff edit atomically."""
+        resolved = self._resolve_path(path)
+        if not resolved.is_file():
+            raise FileNotFoundError(f"File not found: {path}")
+        current = read_text_exact(resolved)
+        digest = self._check_expected(path, current, expected_sha256)
+        updated = self._edited_text(
+            current,
+            {"old_text": old_text, "new_text": new_text, "replace_all": replace_all, "diff": diff},
+        )
+        if updated == current:
+            return f"No changes to {path}"
+        # Guard against writes that landed while this edit was computed.
+        self._check_expected(path, read_text_exact(resolved), digest)
+        atomic_write_text(resolved, updated)
+        self._after_write(resolved, cache)
+        return f"Edited {path} (sha256 {content_hash(updated)})"
+
+    def append_file(
+        self,
+        path: str,
+        content: str,
+        *,
+        expected_sha256: str | None = None,
+        cache: FileReadCache | None = None,
+    ) -> str:
+        """Append text to a file, creating it if missing."""
+        resolved = self._resolve_path(path)
+        if expected_sha256 is not None:
+            current = read_text_exact(resolved) if resolved.exists() else ""
+            self._check_expected(path, current, expected_sha256)
+        resolved.parent.mkdir(parents=True, exist_ok=True)
+        with open(resolved, "a", encoding="utf-8", newline="") as f:
+            f.write(content)
+        self._after_write(resolved, cache)
+        return f"Appended {len(content)} characters to {path}"
+
+    def _describe_write(self, name: str, tool_args: dict[str, Any]) -> str:
+        path = str(tool_args.get("path", ""))
+        try:
+            resolved = self._resolve_path(path)
+            current = read_text_exact(resolved) if resolved.is_file() else ""
+            if name == "write_file":
+                updated = tool_args.get("content", "")
+            elif name == "append_file":
+                updated = current + tool_args.get("content", "")
+            else:
+                updated = self._edited_text(current, tool_args)
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            return f"{name} {path} (preview unavailable: {exc})"
+        verb = {"write_file": "Write", "edit_file": "Edit", "append_file": "Append to"}[name]
+        return f"{verb} {path}\n{diff_preview(path, current, updated)}"
+
+    def _dir_index(self, ctx: Any) -> DirectoryIndex | None:
+        if not self._list_index:
+            return None
+        resource = getattr(getattr(ctx, "deps", None), "resource", None)
+        if resource is None:
+            return None
+        return resource(DIR_INDEX_RESOURCE, DirectoryIndex)
+
+    def list_files(
+        self,
+        path: str = ".",
+        pattern: str = "**/*",
+        limit: int = DEFAULT_LIST_LIMIT,
+        cursor: str | None = None,
+        max_depth: int | None = None,
+        *,
+        index: DirectoryIndex | None = None,
+    ) -> ListResult:
+        """List files matching pattern in a directory, skipping ignored paths.
+
+        The walk stops one match past ``limit``, so a truncated page reports
+        ``total_files`` as a lower bound instead of counting the whole tree.
+        """
         base = self._resolve_path(path)
-        results = []
-        for match in base.glob(pattern):
-            if match.is_file():
-                try:
-                    results.append(str(match.relative_to(base)))
-                except ValueError:
-                    results.append(str(match))
-        return sorted(results)
+        if not base.is_dir():
+            return ListResult(files=[], truncated=False, total_files=0)
+        page = walk_files(
+            base,
+            pattern=pattern,
+            ignore=self._ignore,
+            use_gitignore=self._use_gitignore,
+            max_depth=max_depth,
+            limit=limit,
+            cursor=cursor,
+            count_remaining=False,
+            listing=index.listing if index is not None else scan_directory,
+        )
+        return ListResult(
+            files=page.files,
+            truncated=page.truncated,
+            total_files=page.total_files,
+            next_cursor=page.next_cursor,
+        )
 
-    def _make_tool(self, name: str, desc: str, args_cls: type[BaseModel]) -> ToolsetTool[Any]:
-        return ToolsetTool(
-            toolset=self,
-            tool_def=ToolDefinition(name=name, description=desc, parameters_json_schema=args_cls.model_json_schema()),
-            max_retries=self._max_retries,
-            args_validator=cast(SchemaValidatorProt, DictValidator(args_cls)),
+    def _search_root(self) -> Path:
+        return self._base_path or Path.cwd().resolve()
+
+    def search_files(
+        self,
+        query: str,
+        path: str = ".",
+        *,
+        regex: bool = False,
+        ignore_case: bool = False,
+        glob: str | None = None,
+        max_results: int = 100,
+        context_lines: int = 0,
+    ) -> SearchResult:
+        """Search file contents through the persistent trigram index."""
+        root = self._search_root()
+        target = self._resolve_path(path)
+        if not target.is_dir():
+            raise NotADirectoryError(f"Not a directory: {path}")
+        if target.is_relative_to(root):
+            prefix = target.relative_to(root).as_posix()
+        else:
+            root, prefix = target, ""
+        index = get_search_index(
+            root,
+            index_dir=self._search_index_dir,
+            ignore=self._ignore,
+            use_gitignore=self._use_gitignore,
+            max_file_bytes=self._search_max_file_bytes,
+        )
+        page = index.search(
+            query,
+            regex=regex,
+            ignore_case=ignore_case,
+            path_prefix="" if prefix == "." else prefix,
+            glob=glob,
+            max_results=max_results,
+            context_lines=context_lines,
+        )
+        return SearchResult(
+            matches=[
+                SearchMatch(path=hit.path, line=hit.line, text=hit.text, before=hit.before, after=hit.after)
+                for hit in page.hits
+            ],
+            truncated=page.truncated,
+            files_searched=page.files_searched,
+            files_indexed=page.files_indexed,
+            skipped=page.skipped,
         )
 
+    def _make_tool(self, name: str, desc: str, args_cls: type[BaseModel]) -> ToolsetTool[Any]:
+        return args_tool(self, name, desc, args_cls, max_retries=self._max_retries)
+
     async def get_tools(self, ctx: Any) -> dict[str, ToolsetTool[Any]]:
         return {
             "read_file": self._make_tool("read_file", "Read a text file. Do not use on binary files - pass them as attachments instead.", ReadFileArgs),
+            "read_files": self._make_tool("read_files", "Read several text files in one call (a list of paths and/or a glob) under a shared character budget.", ReadFilesArgs),
             "write_file": self._make_tool("write_file", "Write a text file.", WriteFileArgs),
-            "list_files": self._make_tool("list_files", "List files in a directory matching a glob pattern.", ListFilesArgs),
+            "edit_file": self._make_tool("edit_file", "Edit a text file in place: replace old_text with new_text, or apply a unified diff. Prefer this over write_file for small changes.", EditFileArgs),
+            "append_file": self._make_tool("append_file", "Append text to the end of a file.", AppendFileArgs),
+            "search_files": self._make_tool("search_files", "Search file contents for text or a regex (like grep -rn) using a fast index. Supports globs and context lines.", SearchFilesArgs),
+            "list_files": self._make_tool("list_files", "List files in a directory matching a glob pattern. Ignored paths (.gitignore, .git, node_modules) are skipped; results are paginated.", ListFilesArgs),
         }
 
     async def call_tool(
         self, name: str, tool_args: dict[str, Any], ctx: Any, tool: ToolsetTool[Any]
     ) -> Any:
         if name == "read_file":
-            return self.read_file(tool_args["path"], tool_args.get("max_chars", DEFAULT_MAX_READ_CHARS), tool_args.get("offset", 0))
+            return self.read_file(
+                tool_args["path"],
+                tool_args.get("max_chars", DEFAULT_MAX_READ_CHARS),
+                tool_args.get("offset", 0),
+                cache=self._read_cache(ctx),
+            )
+        if name == "read_files":
+            return await self.read_files(
+                tool_args.get("paths"),
+                glob=tool_args.get("glob"),
+                path=tool_args.get("path", "."),
+                max_total_chars=tool_args.get("max_total_chars", DEFAULT_BATCH_READ_CHARS),
+                max_files=tool_args.get("max_files", MAX_BATCH_FILES),
+                cache=self._read_cache(ctx),
+            )
         if name == "write_file":
-            return self.write_file(tool_args["path"], tool_args["content"])
+            return self.write_file(tool_args["path"], tool_args["content"], cache=self._read_cache(ctx))
+        if name == "edit_file":
+            return self.edit_file(
+                tool_args["path"],
+                tool_args.get("old_text"),
+                tool_args.get("new_text", ""),
+                replace_all=tool_args.get("replace_all", False),
+                diff=tool_args.get("diff"),
+                expected_sha256=tool_args.get("expected_sha256"),
+                cache=self._read_cache(ctx),
+            )
+        if name == "append_file":
+            return self.append_file(
+                tool_args["path"],
+                tool_args["content"],
+                expected_sha256=tool_args.get("expected_sha256"),
+                cache=self._read_cache(ctx),
+            )
         if name == "list_files":
-            return self.list_files(tool_args.get("path", "."), tool_args.get("pattern", "**/*"))
+            return await asyncio.to_thread(
+                self.list_files,
+                tool_args.get("path", "."),
+                tool_args.get("pattern", "**/*"),
+                tool_args.get("limit", DEFAULT_LIST_LIMIT),
+                tool_args.get("cursor"),
+                tool_args.get("max_depth"),
+                index=self._dir_index(ctx),
+            )
+        if name == "search_files":
+            return await asyncio.to_thread(
+                self.search_files,
+                tool_args["query"],
+                tool_args.get("path", "."),
+                regex=tool_args.get("regex", False),
+                ignore_case=tool_args.get("ignore_case", False),
+                glob=tool_args.get("glob"),
+                max_results=tool_args.get("max_results", 100),
+                context_lines=tool_args.get("context_lines", 0),
+            )
         raise ValueError(f"Unknown tool: {name}")
 
 
@@ -226,13 +660,14 @@ class ReadOnlyFileSystemToolset(FileSystemToolset):
         ctx: Any,
         config: ApprovalConfig | None = None,
     ) -> ApprovalResult:
-        if name == "write_file":
-            return ApprovalResult.blocked("write_file is disabled for read-only filesystem")
+        if name in _WRITE_TOOLS:
+            return ApprovalResult.blocked(f"{name} is disabled for read-only filesystem")
         return super().needs_approval(name, tool_args, ctx, config)
 
     async def get_tools(self, ctx: Any) -> dict[str, ToolsetTool[Any]]:
         tools = await super().get_tools(ctx)
-        tools.pop("write_file", None)
+        for name in _WRITE_TOOLS:
+            tools.pop(name, None)
         return tools
 
     async def call_tool(
@@ -242,6 +677,6 @@ class ReadOnlyFileSystemToolset(FileSystemToolset):
         ctx: Any,
         tool: ToolsetTool[Any],
     ) -> Any:
-        if name == "write_file":
-            raise PermissionError("write_file is disabled for read-only filesystem")
+        if name in _WRITE_TOOLS:
+            raise PermissionError(f"{name} is disabled for read-only filesystem")
         return await super().call_tool(name, tool_args, ctx, tool)
@@ -0,0 +1,133 @@
+"""Runtime-scoped cache of decoded file contents for filesystem toolsets.
+
+Every ``FileSystemToolset`` in a runtime shares one cache, so a file read by a
+parent agent is served from memory when a sub-agent reads it again. Entries
+are keyed by resolved path and validated against the file's mtime and size on
+every lookup; writes through a filesystem toolset drop the entry eagerly. The
+cache is an LRU bounded by the total size of the cached files in bytes.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import stat_result
+from pathlib import Path
+from typing import Any
+
+DEFAULT_READ_CACHE_BYTES = 32 * 1024 * 1024
+READ_CACHE_RESOURCE = "llm_do.filesystem.read_cache"
+
+
+@dataclass(frozen=True, slots=True)
+class CachedFile:
+    """Decoded text of one file version plus the SHA-256 of its bytes."""
+
+    mtime_ns: int
+    size: int
+    text: str
+    sha256: str
+
+
+@dataclass(frozen=True, slots=True)
+class ReadCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"read cache: {self.hits} hits, {self.misses} misses "
+            f"({self.hit_rate:.0%} hit rate), {self.entries} files, "
+            f"{self.bytes}/{self.max_bytes} bytes"
+        )
+
+
+class FileReadCache:
+    """Byte-bounded LRU of file texts validated by mtime and size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_READ_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Path, CachedFile] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, path: Path, st: stat_result) -> CachedFile | None:
+        """Return the cached file for ``path`` if it matches ``st``, else None."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._entries.move_to_end(path)
+                self._hits += 1
+                return entry
+            if entry is not None:
+                self._drop(path)
+            self._misses += 1
+            return None
+
+    def put(self, path: Path, st: stat_result, text: str, sha256: str = "") -> None:
+        if st.st_size > self.max_bytes:
+            return
+        with self._lock:
+            if path in self._entries:
+                self._drop(path)
+            self._entries[path] = CachedFile(st.st_mtime_ns, st.st_size, text, sha256)
+            self._bytes += st.st_size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def invalidate(self, path: Path) -> None:
+        with self._lock:
+            if path in self._entries:
+                self._drop(path)
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> ReadCacheStats:
+        with self._lock:
+            return ReadCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def _drop(self, path: Path) -> None:
+        entry = self._entries.pop(path)
+        self._bytes -= entry.size
+
+
+def runtime_read_cache(
+    ctx: Any, max_bytes: int = DEFAULT_READ_CACHE_BYTES
+) -> FileReadCache | None:
+    """Return the read cache shared by the runtime behind ``ctx``, if any.
+
+    ``ctx`` is a PydanticAI ``RunContext`` whose deps expose ``resource()``;
+    direct calls without a runtime get no cache.
+    """
+    resource = getattr(getattr(ctx, "deps", None), "resource", None)
+    if resource is None:
+        return None
+    return resource(READ_CACHE_RESOURCE, lambda: FileReadCache(max_bytes))
@@ -0,0 +1,403 @@
+"""Persistent trigram index behind the ``search_files`` tool.
+
+The index maps every 3-byte sequence of a file's case-folded UTF-8 text to
+the files containing it, stored in SQLite so it survives across runs. A query
+is reduced to the literal runs every match must contain; only files holding
+all of their trigrams are opened and scanned line by line with the real
+regex. The trigram step only narrows the candidates; matched lines always
+come from the file as it is on disk.
+
+The index is built lazily on the first search and refreshed incrementally:
+files are re-read only when their mtime or size changed, and deleted files
+are dropped. Refreshes are throttled to one per ``REFRESH_INTERVAL_S`` unless
+a write through a filesystem toolset marked the index dirty, so files created
+or edited outside llm-do can be missed for up to that long. Files over
+``max_file_bytes`` are not indexed and are reported as skipped.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from .file_walk import glob_regex, walk_files
+
+try:  # Python 3.11 moved the regex parser to re._parser.
+    import re._constants as _sre_constants  # type: ignore[import-not-found]
+    import re._parser as _sre_parse  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    import sre_constants as _sre_constants  # type: ignore[no-redef]
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+INDEX_VERSION = "1"
+DEFAULT_INDEX_DIR = Path.home() / ".llm-do" / "search-index"
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+REFRESH_INTERVAL_S = 2.0
+MAX_QUERY_TRIGRAMS = 32
+MAX_LINE_CHARS = 500
+_BINARY_SNIFF_BYTES = 8192
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    grams BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    trigram INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, file_id)
+) WITHOUT ROWID;
+"""
+
+
+def trigrams(text: str) -> set[int]:
+    """Case-folded UTF-8 trigrams of ``text`` packed into 24-bit ints."""
+    data = text.casefold().encode("utf-8")
+    return {(a << 16) | (b << 8) | c for a, b, c in set(zip(data, data[1:], data[2:]))}
+
+
+_REPEATS = {_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT}
+if hasattr(_sre_constants, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(_sre_constants.POSSESSIVE_REPEAT)
+
+
+def _literal_runs(parsed: Any) -> list[str]:
+    runs: list[str] = []
+    current: list[str] = []
+
+    def flush() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    for op, av in parsed:
+        if op is _sre_constants.LITERAL:
+            current.append(chr(av))
+            continue
+        flush()
+        if op is _sre_constants.SUBPATTERN:
+            runs.extend(_literal_runs(av[-1]))
+        elif op in _REPEATS and av[0] >= 1:
+            runs.extend(_literal_runs(av[2]))
+    flush()
+    return runs
+
+
+def required_literals(query: str, *, regex: bool) -> list[str]:
+    """Literal substrings that every match of ``query`` must contain."""
+    if not regex:
+        return [query]
+    try:
+        parsed = _sre_parse.parse(query)
+    except Exception:
+        return []
+    return _literal_runs(parsed)
+
+
+def query_trigrams(query: str, *, regex: bool) -> set[int]:
+    grams: set[int] = set()
+    for literal in required_literals(query, regex=regex):
+        grams |= trigrams(literal)
+    return grams
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    path: str
+    line: int
+    text: str
+    before: list[str] = field(default_factory=list)
+    after: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchPage:
+    hits: list[SearchHit]
+    truncated: bool
+    files_searched: int
+    files_indexed: int
+    skipped: list[str] = field(default_factory=list)
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS] + "..."
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if b"\0" in data[:_BINARY_SNIFF_BYTES]:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+class TrigramIndex:
+    """SQLite-backed trigram index over the text files below ``root``."""
+
+    def __init__(
+        self,
+        root: Path,
+        db_path: Path,
+        *,
+        ignore: Sequence[str],
+        use_gitignore: bool = True,
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    ) -> None:
+        self.root = root
+        self.db_path = db_path
+        self.ignore = tuple(ignore)
+        self.use_gitignore = use_gitignore
+        self.max_file_bytes = max_file_bytes
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._dirty = True
+        self._oversized: list[str] = []
+        self.files_reindexed = 0
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        self._db.executescript(_SCHEMA)
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != INDEX_VERSION:
+            with self._db:
+                self._db.execute("DELETE FROM postings")
+                self._db.execute("DELETE FROM files")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                    (INDEX_VERSION,),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def _scan_tree(self) -> dict[str, tuple[int, int]]:
+        page = walk_files(
+            self.root,
+            ignore=self.ignore,
+            use_gitignore=self.use_gitignore,
+        )
+        current: dict[str, tuple[int, int]] = {}
+        oversized: list[str] = []
+        for rel in page.files:
+            try:
+                st = os.stat(self.root / rel)
+            except OSError:
+                continue
+            if st.st_size <= self.max_file_bytes:
+                current[rel] = (st.st_mtime_ns, st.st_size)
+            else:
+                oversized.append(rel)
+        self._oversized = sorted(oversized)
+        return current
+
+    def refresh(self, *, force: bool = False) -> int:
+        """Re-index new or changed files and drop deleted ones; return files re-read."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and not self._dirty and now - self._last_refresh < REFRESH_INTERVAL_S:
+                return 0
+            self._dirty = False
+            current = self._scan_tree()
+            known = {
+                path: (file_id, mtime_ns, size)
+                for file_id, path, mtime_ns, size in self._db.execute(
+                    "SELECT id, path, mtime_ns, size FROM files"
+                )
+            }
+            reindexed = 0
+            postings: list[tuple[int, int]] = []
+            with self._db:
+                for path, (file_id, _, _) in known.items():
+                    if path not in current:
+                        self._delete(file_id)
+                for path, (mtime_ns, size) in current.items():
+                    entry = known.get(path)
+                    if entry is not None and entry[1:] == (mtime_ns, size):
+                        continue
+                    if entry is not None:
+                        self._delete(entry[0])
+                    text = _read_text(self.root / path)
+                    grams = array("I", sorted(trigrams(text)) if text is not None else ())
+                    cursor = self._db.execute(
+                        "INSERT INTO files (path, mtime_ns, size, grams) VALUES (?, ?, ?, ?)",
+                        (path, mtime_ns, size, grams.tobytes()),
+                    )
+                    file_id = cursor.lastrowid
+                    postings.extend((gram, file_id) for gram in grams)
+                    reindexed += 1
+                # Inserting in key order keeps the B-tree appends cheap on full builds.
+                postings.sort()
+                self._db.executemany(
+                    "INSERT INTO postings (trigram, file_id) VALUES (?, ?)", postings
+                )
+            self.files_reindexed += reindexed
+            self._last_refresh = time.monotonic()
+            return reindexed
+
+    def _delete(self, file_id: int) -> None:
+        # Postings are keyed (trigram, file_id); the file row keeps its trigram
+        # list so deletes hit the primary key without a second index.
+        (blob,) = self._db.execute("SELECT grams FROM files WHERE id = ?", (file_id,)).fetchone()
+        grams = array("I")
+        grams.frombytes(blob)
+        self._db.executemany(
+            "DELETE FROM postings WHERE trigram = ? AND file_id = ?",
+            ((gram, file_id) for gram in grams),
+        )
+        self._db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def candidates(self, grams: Iterable[int]) -> list[str]:
+        """Indexed paths (sorted) containing every trigram in ``grams``."""
+        selected = sorted(grams)[:MAX_QUERY_TRIGRAMS]
+        with self._lock:
+            if not selected:
+                rows = self._db.execute("SELECT path FROM files ORDER BY path")
+                return [path for (path,) in rows]
+            placeholders = ",".join("?" * len(selected))
+            rows = self._db.execute(
+                "SELECT f.path FROM postings p JOIN files f ON f.id = p.file_id "
+                f"WHERE p.trigram IN ({placeholders}) "
+                "GROUP BY p.file_id HAVING COUNT(*) = ? ORDER BY f.path",
+                (*selected, len(selected)),
+            )
+            return [path for (path,) in rows]
+
+    def file_count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def search(
+        self,
+        query: str,
+        *,
+        regex: bool = False,
+        ignore_case: bool = False,
+        path_prefix: str = "",
+        glob: str | None = None,
+        max_results: int = 100,
+        context_lines: int = 0,
+    ) -> SearchPage:
+        flags = re.IGNORECASE if ignore_case else 0
+        matcher = re.compile(query if regex else re.escape(query), flags)
+        self.refresh()
+        glob_match = glob_regex(glob.lstrip("/")).fullmatch if glob else None
+        prefix = path_prefix.strip("/")
+
+        def scoped(rel: str) -> str | None:
+            if prefix and not rel.startswith(prefix + "/"):
+                return None
+            sub = rel[len(prefix) + 1:] if prefix else rel
+            if glob_match is not None and not glob_match(sub):
+                return None
+            return sub
+
+        hits: list[SearchHit] = []
+        searched = 0
+        truncated = False
+        for rel in self.candidates(query_trigrams(query, regex=regex)):
+            sub = scoped(rel)
+            if sub is None:
+                continue
+            text = _read_text(self.root / rel)
+            if text is None:
+                continue
+            searched += 1
+            lines = text.splitlines()
+            for number, line in enumerate(lines):
+                if not matcher.search(line):
+                    continue
+                if len(hits) >= max_results:
+                    truncated = True
+                    break
+                hits.append(
+                    SearchHit(
+                        path=sub,
+                        line=number + 1,
+                        text=_clip(line),
+                        before=[_clip(x) for x in lines[max(0, number - context_lines):number]],
+                        after=[_clip(x) for x in lines[number + 1:number + 1 + context_lines]],
+                    )
+                )
+            if truncated:
+                break
+        return SearchPage(
+            hits=hits,
+            truncated=truncated,
+            files_searched=searched,
+            files_indexed=self.file_count(),
+            skipped=[sub for rel in self._oversized if (sub := scoped(rel)) is not None],
+        )
+
+
+_INDEXES: dict[Path, TrigramIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_path_for(
+    root: Path, index_dir: Path, ignore: Sequence[str], use_gitignore: bool
+) -> Path:
+    key = "\0".join([str(root), *ignore, str(use_gitignore)])
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:20]
+    return index_dir / f"{root.name or 'root'}-{digest}.sqlite"
+
+
+def get_search_index(
+    root: Path,
+    *,
+    index_dir: Path = DEFAULT_INDEX_DIR,
+    ignore: Sequence[str],
+    use_gitignore: bool = True,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> TrigramIndex:
+    """Return the process-wide index for ``root`` and its ignore settings."""
+    db_path = index_path_for(root, index_dir, ignore, use_gitignore)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(db_path)
+        if index is None:
+            index = TrigramIndex(
+                root,
+                db_path,
+                ignore=ignore,
+                use_gitignore=use_gitignore,
+                max_file_bytes=max_file_bytes,
+            )
+            _INDEXES[db_path] = index
+        return index
+
+
+def notify_file_changed(path: Path) -> None:
+    """Mark every open index whose tree contains ``path`` as needing a refresh."""
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        if path.is_relative_to(index.root):
+            index.mark_dirty()
+
+
+def close_search_indexes() -> None:
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+        _INDEXES.clear()
+    for index in indexes:
+        index.close()
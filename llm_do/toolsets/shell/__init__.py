@@ -17,9 +17,11 @@ from .execution import (
     ShellError,
     check_metacharacters,
     execute_shell,
+    execute_shell_async,
     match_shell_rules,
     parse_command,
 )
+from .rules import CompiledShellRules
 from .toolset import ShellToolset
 from .types import ShellDefault, ShellResult, ShellRule
 
@@ -37,8 +39,10 @@ __all__ = [
     "ShellBlockedError",
     "ShellError",
     # Execution
+    "CompiledShellRules",
     "check_metacharacters",
     "execute_shell",
+    "execute_shell_async",
     "match_shell_rules",
     "parse_command",
 ]
@@ -1,18 +1,26 @@
 """Shell command execution with whitelist-based approval."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import selectors
 import shlex
+import signal
 import subprocess
+import time
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+from .output import OutputCallback, StreamCapture
 from .types import ShellResult
 
 logger = logging.getLogger(__name__)
 BLOCKED_METACHARACTERS = frozenset(['|', '>', '<', ';', '&', '`', '$(', '${'])
 MAX_OUTPUT_BYTES = 50 * 1024
 DEFAULT_TIMEOUT = 30
+KILL_GRACE_SECONDS = 2.0
+READ_CHUNK_BYTES = 64 * 1024
 
 
 class ShellError(Exception):
@@ -64,31 +72,184 @@ def match_shell_rules(command: str, args: List[str], rules: List[dict], default:
     return (False, True)
 
 
-def _decode_output(data: bytes) -> str:
+def _signal_group(proc: asyncio.subprocess.Process, sig: int) -> None:
+    if proc.returncode is not None:
+        return
     try:
-        return data.decode('utf-8', errors='replace')
-    except Exception:
-        return str(data)
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, sig)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
 
 
-def _truncate_output(text: str) -> tuple[str, bool]:
-    if len(text) > MAX_OUTPUT_BYTES:
-        return text[:MAX_OUTPUT_BYTES] + "\n... (output truncated)", True
-    return text, False
+async def _terminate_group(proc: asyncio.subprocess.Process, grace: float) -> None:
+    """SIGTERM the command's process group, then SIGKILL it after ``grace`` seconds."""
+    _signal_group(proc, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(proc.wait(), grace)
+        return
+    except asyncio.TimeoutError:
+        pass
+    _signal_group(proc, signal.SIGKILL)
+    await proc.wait()
+
+
+async def _pump(
+    reader: asyncio.StreamReader, capture: StreamCapture, limit_hit: asyncio.Event, stop_on_limit: bool
+) -> None:
+    # Keep draining after the limit so the pipe reaches EOF once the command is killed.
+    while chunk := await reader.read(READ_CHUNK_BYTES):
+        capture.feed(chunk)
+        if stop_on_limit and capture.buffer.truncated:
+            limit_hit.set()
+    capture.close()
+
+
+async def execute_shell_async(
+    command: str,
+    working_dir: Optional[Path] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    env: Optional[dict] = None,
+    kill_grace: float = KILL_GRACE_SECONDS,
+    *,
+    max_output_bytes: int = MAX_OUTPUT_BYTES,
+    stop_on_output_limit: bool = False,
+    on_output: Optional[OutputCallback] = None,
+    argv: Optional[Sequence[str]] = None,
+) -> ShellResult:
+    """Run ``command`` without blocking the event loop.
+
+    The command runs in its own session, so on timeout or cancellation the
+    whole process group is killed, including anything it spawned. Output is
+    read incrementally; each stream keeps its first and last
+    ``max_output_bytes / 2`` bytes, and ``on_output`` gets the first
+    ``max_output_bytes`` of each stream live, batched per interval.
+    With ``stop_on_output_limit`` the command is killed as soon as a stream
+    goes over the limit. ``argv`` skips re-parsing when the caller already
+    tokenized ``command``.
+    """
+    args = list(argv) if argv else parse_command(command)
+    if not args:
+        raise ShellBlockedError("Empty command")
+    logger.info(f"Executing shell command: {args}")
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=working_dir,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+    except FileNotFoundError:
+        return ShellResult(stdout="", stderr=f"Command not found: {args[0]}", exit_code=127, truncated=False)
+    except PermissionError:
+        return ShellResult(stdout="", stderr=f"Permission denied: {args[0]}", exit_code=126, truncated=False)
+    except Exception as e:
+        raise ShellError(f"Failed to execute command: {e}")
+
+    assert proc.stdout is not None and proc.stderr is not None
+    out = StreamCapture("stdout", max_output_bytes, on_output)
+    err = StreamCapture("stderr", max_output_bytes, on_output)
+    limit_hit = asyncio.Event()
+    finished = asyncio.ensure_future(asyncio.gather(
+        _pump(proc.stdout, out, limit_hit, stop_on_output_limit),
+        _pump(proc.stderr, err, limit_hit, stop_on_output_limit),
+        proc.wait(),
+    ))
+    limit_wait = asyncio.ensure_future(limit_hit.wait())
+    note = ""
+    try:
+        await asyncio.wait({finished, limit_wait}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if limit_hit.is_set():
+            note = f"Command stopped: output exceeded {max_output_bytes} bytes"
+        elif not finished.done():
+            note = f"Command timed out after {timeout} seconds"
+        if note:
+            await _terminate_group(proc, kill_grace)
+            # Collect output flushed before the kill; a child that left the
+            # process group may still hold the pipes open, so don't wait long.
+            await asyncio.wait({finished}, timeout=kill_grace)
+            exit_code = -1
+        else:
+            finished.result()
+            exit_code = proc.returncode or 0
+    except BaseException:
+        # Cancelled (or failed) while running: don't leave the command behind,
+        # and give the pipes a moment to close so the transport is released.
+        _signal_group(proc, signal.SIGKILL)
+        await asyncio.wait({finished}, timeout=kill_grace)
+        raise
+    finally:
+        limit_wait.cancel()
+        finished.cancel()
+        out.close()
+        err.close()
+
+    stderr = err.buffer.render()
+    if note:
+        stderr = f"{stderr}\n{note}" if stderr else note
+    return ShellResult(
+        stdout=out.buffer.render(),
+        stderr=stderr,
+        exit_code=exit_code,
+        truncated=out.buffer.truncated or err.buffer.truncated,
+        stdout_bytes=out.buffer.total_bytes,
+        stderr_bytes=err.buffer.total_bytes,
+        stopped_early=limit_hit.is_set(),
+    )
+
+
+def _read_pipes(selector: selectors.BaseSelector, deadline: float) -> bool:
+    """Feed registered pipes into their captures until EOF or ``deadline``; True on EOF."""
+    while selector.get_map():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        for key, _ in selector.select(remaining):
+            chunk = os.read(key.fd, READ_CHUNK_BYTES)
+            if chunk:
+                key.data.feed(chunk)
+            else:
+                selector.unregister(key.fileobj)
+    return True
 
 
 def execute_shell(
-    command: str, working_dir: Optional[Path] = None, timeout: int = DEFAULT_TIMEOUT, env: Optional[dict] = None
+    command: str,
+    working_dir: Optional[Path] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    env: Optional[dict] = None,
+    kill_grace: float = KILL_GRACE_SECONDS,
+    *,
+    max_output_bytes: int = MAX_OUTPUT_BYTES,
 ) -> ShellResult:
+    """Blocking counterpart of ``execute_shell_async`` for code without an event loop.
+
+    Plain ``subprocess``, so it also works when a loop is running (it blocks
+    that loop until the command finishes). The command runs in its own
+    session and the process group is killed on timeout. Both pipes are read
+    incrementally into the same bounded head and tail as the async version.
+    """
     args = parse_command(command)
     if not args:
         raise ShellBlockedError("Empty command")
     logger.info(f"Executing shell command: {args}")
 
     try:
-        result = subprocess.run(args, cwd=working_dir, capture_output=True, timeout=timeout, env=env, shell=False)
-    except subprocess.TimeoutExpired:
-        return ShellResult(stdout="", stderr=f"Command timed out after {timeout} seconds", exit_code=-1, truncated=False)
+        proc = subprocess.Popen(
+            args,
+            cwd=working_dir,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
     except FileNotFoundError:
         return ShellResult(stdout="", stderr=f"Command not found: {args[0]}", exit_code=127, truncated=False)
     except PermissionError:
@@ -96,6 +257,41 @@ def execute_shell(
     except Exception as e:
         raise ShellError(f"Failed to execute command: {e}")
 
-    stdout, trunc1 = _truncate_output(_decode_output(result.stdout))
-    stderr, trunc2 = _truncate_output(_decode_output(result.stderr))
-    return ShellResult(stdout=stdout, stderr=stderr, exit_code=result.returncode, truncated=trunc1 or trunc2)
+    out = StreamCapture("stdout", max_output_bytes)
+    err = StreamCapture("stderr", max_output_bytes)
+    deadline = time.monotonic() + timeout
+    note = ""
+    with proc, selectors.DefaultSelector() as selector:
+        selector.register(proc.stdout, selectors.EVENT_READ, out)
+        selector.register(proc.stderr, selectors.EVENT_READ, err)
+        try:
+            try:
+                if not _read_pipes(selector, deadline):
+                    raise subprocess.TimeoutExpired(args, timeout)
+                proc.wait(max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                note = f"Command timed out after {timeout} seconds"
+                _signal_group(proc, signal.SIGTERM)
+                try:
+                    proc.wait(kill_grace)
+                except subprocess.TimeoutExpired:
+                    _signal_group(proc, signal.SIGKILL)
+                    proc.wait()
+                # Collect output flushed before the kill; a child that left the
+                # process group may still hold the pipes open, so don't wait long.
+                _read_pipes(selector, time.monotonic() + kill_grace)
+        except BaseException:
+            _signal_group(proc, signal.SIGKILL)
+            raise
+
+    stderr = err.buffer.render()
+    if note:
+        stderr = f"{stderr}\n{note}" if stderr else note
+    return ShellResult(
+        stdout=out.buffer.render(),
+        stderr=stderr,
+        exit_code=-1 if note else proc.returncode,
+        truncated=out.buffer.truncated or err.buffer.truncated,
+        stdout_bytes=out.buffer.total_bytes,
+        stderr_bytes=err.buffer.total_bytes,
+    )
@@ -0,0 +1,130 @@
+"""Bounded capture of command output.
+
+Output is read in chunks as the command produces it. ``HeadTailBuffer`` keeps
+the first and last bytes of a stream and only counts what falls in between,
+so memory stays bounded however much a command prints. Live output is bounded
+the same way: ``StreamCapture`` forwards at most the stream's byte limit to its
+callback, batched to one call per ``LIVE_OUTPUT_INTERVAL_S``.
+"""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import time
+from typing import Callable, Optional
+
+OutputCallback = Callable[[str, str], None]
+"""Called with ``(stream, text)`` for each decoded chunk; stream is stdout/stderr."""
+
+LIVE_OUTPUT_INTERVAL_S = 0.1
+
+
+class HeadTailBuffer:
+    """Keep the first ``head_bytes`` and last ``tail_bytes`` of a byte stream."""
+
+    def __init__(self, head_bytes: int, tail_bytes: int) -> None:
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self._head = bytearray()
+        self._tail = bytearray()
+        self.total_bytes = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > self.head_bytes + self.tail_bytes
+
+    def write(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data or self.tail_bytes <= 0:
+            return
+        self._tail += data[-self.tail_bytes:]
+        excess = len(self._tail) - self.tail_bytes
+        if excess > 0:
+            del self._tail[:excess]
+
+    def render(self) -> str:
+        """Decode the kept bytes, marking the omitted middle if there is one."""
+        head = self._head.decode("utf-8", errors="replace")
+        tail = self._tail.decode("utf-8", errors="replace")
+        if not self.truncated:
+            return head + tail
+        omitted = self.total_bytes - len(self._head) - len(self._tail)
+        return f"{head}\n... ({omitted} bytes omitted) ...\n{tail}"
+
+
+class StreamCapture:
+    """One output stream: bounded buffer plus optional live callback.
+
+    The callback sees at most ``limit`` bytes of the stream, then one notice
+    that live output stopped; the buffer keeps counting. Text is batched and
+    sent at most once per ``interval`` seconds (a timer flushes a quiet
+    stream when an event loop is running); ``close()`` sends the rest.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        on_output: Optional[OutputCallback] = None,
+        *,
+        interval: float = LIVE_OUTPUT_INTERVAL_S,
+    ) -> None:
+        self.name = name
+        self.buffer = HeadTailBuffer(limit - limit // 2, limit // 2)
+        self._on_output = on_output
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._limit = limit
+        self._live_left = limit
+        self._interval = interval
+        self._pending: list[str] = []
+        self._last_sent = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._closed = False
+
+    def feed(self, data: bytes) -> None:
+        self.buffer.write(data)
+        if self._on_output is None or self._live_left < 0:
+            return
+        live = data[:self._live_left]
+        self._live_left -= len(live)
+        text = self._decoder.decode(live)
+        if len(live) < len(data):
+            self._live_left = -1
+            text += self._decoder.decode(b"", final=True)
+            text += f"\n... (live output stopped after {self._limit} bytes) ...\n"
+        if not text:
+            return
+        self._pending.append(text)
+        wait = self._last_sent + self._interval - time.monotonic()
+        if wait <= 0:
+            self._flush()
+        elif self._timer is None:
+            try:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._flush)
+            except RuntimeError:  # no event loop: nothing could flush later
+                self._flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._on_output is not None and self._live_left >= 0:
+            text = self._decoder.decode(b"", final=True)
+            if text:
+                self._pending.append(text)
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self._on_output is None:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._last_sent = time.monotonic()
+        self._on_output(self.name, text)
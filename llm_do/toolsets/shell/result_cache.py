@@ -0,0 +1,195 @@
+"""Runtime-scoped cache of results for read-only shell commands.
+
+Only commands matching a rule with ``cacheable: true`` are cached. Entries are
+keyed by argv and working directory and carry a fingerprint of the directory's
+state: inside a git work tree that is HEAD, the index, ``packed-refs``,
+``FETCH_HEAD`` and the mtimes of the directories under ``refs/`` (git rewrites
+a ref by renaming a lock file into its directory, so fetches, new tags and
+``reset --soft`` all show up); elsewhere it is the mtimes of the directory and
+its direct subdirectories. For linked worktrees the refs are read from the
+shared ``commondir``. A lookup recomputes the fingerprint (a few dozen
+``stat`` calls) and misses when it changed. By default entries live as long as the runtime; with a TTL they
+also expire after that many seconds, for long-lived runtimes.
+
+The fingerprint does not see edits to file contents, so only flag commands
+whose output depends on committed state or on file names (``git log``,
+``git show``).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from .types import ShellResult
+
+SHELL_CACHE_RESOURCE = "llm_do.shell.result_cache"
+MAX_CACHED_RESULTS = 128
+MAX_FINGERPRINT_DIRS = 256
+
+Fingerprint = tuple[Any, ...]
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _find_git_dir(cwd: Path) -> Path | None:
+    for directory in (cwd, *cwd.parents):
+        candidate = directory / ".git"
+        if candidate.is_dir():
+            return candidate
+        if candidate.is_file():
+            # Worktrees and submodules: ".git" is a file pointing at the real dir.
+            try:
+                text = candidate.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if text.startswith("gitdir:"):
+                return (directory / text[len("gitdir:"):].strip()).resolve()
+            return None
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """Directory holding refs shared by all worktrees (``git_dir`` itself outside worktrees)."""
+    try:
+        text = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    return (git_dir / text).resolve()
+
+
+def _refs_fingerprint(refs_dir: Path) -> tuple[tuple[str, int], ...]:
+    mtimes: list[tuple[str, int]] = []
+    for root, dirs, _files in os.walk(refs_dir):
+        if len(mtimes) > MAX_FINGERPRINT_DIRS:
+            break
+        try:
+            mtimes.append((root, os.stat(root).st_mtime_ns))
+        except OSError:
+            dirs.clear()
+    return tuple(mtimes)
+
+
+def _git_fingerprint(git_dir: Path) -> Fingerprint:
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        head = ""
+    common = _common_dir(git_dir)
+    ref_state: Any = None
+    if head.startswith("ref:"):
+        ref_state = _stat_key(common / head[len("ref:"):].strip())
+    return (
+        "git",
+        head,
+        ref_state,
+        _stat_key(git_dir / "index"),
+        _stat_key(common / "packed-refs"),
+        _stat_key(common / "FETCH_HEAD"),
+        _refs_fingerprint(common / "refs"),
+    )
+
+
+def _dir_fingerprint(cwd: Path) -> Fingerprint:
+    mtimes: list[tuple[str, int]] = []
+    try:
+        mtimes.append(("", cwd.stat().st_mtime_ns))
+        with os.scandir(cwd) as it:
+            for entry in it:
+                if len(mtimes) > MAX_FINGERPRINT_DIRS:
+                    break
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        mtimes.append((entry.name, entry.stat(follow_symlinks=False).st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return ("dirs", tuple(sorted(mtimes)))
+
+
+def repo_fingerprint(cwd: Path) -> Fingerprint:
+    """Cheap fingerprint of the state a read-only command in ``cwd`` may depend on."""
+    git_dir = _find_git_dir(cwd)
+    if git_dir is not None:
+        return _git_fingerprint(git_dir)
+    return _dir_fingerprint(cwd)
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    fingerprint: Fingerprint
+    stored_at: float
+    result: ShellResult
+
+
+@dataclass(frozen=True, slots=True)
+class ShellCacheStats:
+    hits: int
+    misses: int
+    entries: int
+
+    def summary(self) -> str:
+        return f"shell cache: {self.hits} hits, {self.misses} misses, {self.entries} results"
+
+
+class ShellResultCache:
+    """LRU of shell results validated by a repository fingerprint and optional TTL."""
+
+    def __init__(self, ttl: float | None = None, max_entries: int = MAX_CACHED_RESULTS) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[tuple[str, ...], str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, argv: Sequence[str], cwd: Path, fingerprint: Fingerprint) -> ShellResult | None:
+        key = (tuple(argv), str(cwd))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint and not self._expired(entry):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.result
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, argv: Sequence[str], cwd: Path, fingerprint: Fingerprint, result: ShellResult) -> None:
+        key = (tuple(argv), str(cwd))
+        with self._lock:
+            self._entries[key] = _Entry(fingerprint, time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> ShellCacheStats:
+        with self._lock:
+            return ShellCacheStats(hits=self._hits, misses=self._misses, entries=len(self._entries))
+
+    def _expired(self, entry: _Entry) -> bool:
+        return self.ttl is not None and time.monotonic() - entry.stored_at > self.ttl
+
+
+def runtime_shell_cache(ctx: Any, ttl: float | None = None) -> ShellResultCache | None:
+    """Return the shell result cache of the runtime behind ``ctx``, if any."""
+    resource = getattr(getattr(ctx, "deps", None), "resource", None)
+    if resource is None:
+        return None
+    return resource(SHELL_CACHE_RESOURCE, lambda: ShellResultCache(ttl))
@@ -0,0 +1,161 @@
+"""Shell rules compiled into a token-prefix trie.
+
+``match_shell_rules`` re-tokenizes every pattern on every check. A
+``CompiledShellRules`` tokenizes the patterns once and indexes them by their
+tokens, so matching a command walks at most ``len(args)`` trie nodes however
+many rules there are. First-match-wins ordering is kept by remembering each
+rule's position in the config.
+"""
+from __future__ import annotations
+
+import shlex
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
+from .execution import ShellBlockedError, check_metacharacters, parse_command
+
+MAX_CACHED_COMMANDS = 256
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    index: int
+    pattern: str
+    approval_required: bool
+    approval_required_if_args: frozenset[str]
+    cacheable: bool = False
+
+    def requires_approval(self, args: Sequence[str]) -> bool:
+        if self.approval_required_if_args and not self.approval_required_if_args.isdisjoint(args):
+            return True
+        return self.approval_required
+
+    @classmethod
+    def from_config(cls, index: int, rule: dict) -> "CompiledRule":
+        required_if_args = rule.get("approval_required_if_args") or ()
+        if not isinstance(required_if_args, (list, tuple, set)):
+            required_if_args = [required_if_args]
+        return cls(
+            index=index,
+            pattern=rule.get("pattern", ""),
+            approval_required=rule.get("approval_required", True),
+            approval_required_if_args=frozenset(str(item) for item in required_if_args),
+            cacheable=bool(rule.get("cacheable", False)),
+        )
+
+
+@dataclass(slots=True)
+class _Node:
+    children: dict[str, "_Node"] = field(default_factory=dict)
+    rule: CompiledRule | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ShellDecision:
+    """Outcome of checking one command string against the rules."""
+
+    args: tuple[str, ...]
+    blocked_reason: str | None = None
+    allowed: bool = False
+    approval_required: bool = True
+    cacheable: bool = False
+
+
+class CompiledShellRules:
+    """Rules and default of a shell config, compiled once."""
+
+    def __init__(self, rules: Sequence[dict], default: Optional[dict]) -> None:
+        self._root = _Node()
+        # Patterns shlex can't split keep the old first-token prefix match.
+        self._fallback: list[CompiledRule] = []
+        self._default_approval: bool | None = (
+            None if default is None else default.get("approval_required", True)
+        )
+        for index, rule in enumerate(rules):
+            compiled = CompiledRule.from_config(index, rule)
+            if not compiled.pattern:
+                continue
+            try:
+                tokens = shlex.split(compiled.pattern)
+            except ValueError:
+                self._fallback.append(compiled)
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.children.setdefault(token, _Node())
+            if node.rule is None:
+                node.rule = compiled
+
+    def match(self, args: Sequence[str]) -> CompiledRule | None:
+        """Return the first configured rule whose tokens prefix ``args``."""
+        if not args:
+            return None
+        best = self._root.rule  # a whitespace-only pattern matches everything
+        node = self._root
+        for token in args:
+            node = node.children.get(token)  # type: ignore[assignment]
+            if node is None:
+                break
+            if node.rule is not None and (best is None or node.rule.index < best.index):
+                best = node.rule
+        for rule in self._fallback:
+            if best is not None and rule.index > best.index:
+                break
+            if args[0] == rule.pattern or args[0].startswith(rule.pattern + " "):
+                best = rule
+                break
+        return best
+
+    def decide(self, args: Sequence[str]) -> tuple[bool, bool]:
+        """Return ``(allowed, approval_required)`` like ``match_shell_rules``."""
+        rule = self.match(args)
+        if rule is not None:
+            return True, rule.requires_approval(args)
+        if self._default_approval is not None:
+            return True, self._default_approval
+        return False, True
+
+
+class ShellCommandCache:
+    """LRU of ``ShellDecision`` by command string.
+
+    Approval, capability checks and execution of one tool call all look up the
+    same command, so it is tokenized and matched once per call.
+    """
+
+    def __init__(self, rules: CompiledShellRules, max_entries: int = MAX_CACHED_COMMANDS) -> None:
+        self._rules = rules
+        self._max_entries = max_entries
+        self._decisions: OrderedDict[str, ShellDecision] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decide(self, command: Any) -> ShellDecision:
+        command = command if isinstance(command, str) else str(command)
+        with self._lock:
+            decision = self._decisions.get(command)
+            if decision is not None:
+                self._decisions.move_to_end(command)
+                return decision
+        decision = self._evaluate(command)
+        with self._lock:
+            self._decisions[command] = decision
+            if len(self._decisions) > self._max_entries:
+                self._decisions.popitem(last=False)
+        return decision
+
+    def _evaluate(self, command: str) -> ShellDecision:
+        try:
+            check_metacharacters(command)
+            args = tuple(parse_command(command))
+        except ShellBlockedError as e:
+            return ShellDecision(args=(), blocked_reason=str(e))
+        rule = self._rules.match(args)
+        allowed, approval_required = self._rules.decide(args)
+        return ShellDecision(
+            args=args,
+            allowed=allowed,
+            approval_required=approval_required,
+            cacheable=rule is not None and rule.cacheable,
+        )
@@ -10,37 +10,91 @@ Whitelist model:
 - Commands must match a rule OR have a default to be allowed
 - No rule + no default = command is blocked
 
+Rules are compiled into a token-prefix trie when the toolset is built, and
+each command string is tokenized and matched once; approval, capability checks
+and execution share the result.
+
+Results of commands matching a ``cacheable`` rule are reused within the
+runtime while the repository fingerprint is unchanged (see ``result_cache``);
+``cache_ttl`` (seconds) also expires them, for long-lived runtimes.
+
+Commands run as asyncio subprocesses, so the event loop stays free while they
+run. At most ``max_concurrent`` commands (config, default 4) run at once across
+all shell toolsets of a runtime; the first toolset to run a command sets the
+limit.
+
+Output is read as it is produced. Each stream keeps its first and last
+``max_output_bytes / 2`` bytes (config, default 50 KB) and reports the total
+bytes written; with ``stop_on_output_limit`` the command is killed once a
+stream goes over. While a command runs its output is sent to the UI as
+``ToolOutputEvent``s.
+
 Security note: Pattern rules are UX only, not security. For kernel-level
 isolation, run llm-do in a Docker container.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
-from typing import Any, Optional, cast
+from pathlib import Path
+from typing import Any, AsyncContextManager, Optional
 
 from pydantic import BaseModel, Field
-from pydantic_ai.tools import ToolDefinition
 from pydantic_ai.toolsets import AbstractToolset, ToolsetTool
-from pydantic_ai.toolsets.abstract import SchemaValidatorProt
 from pydantic_ai_blocking_approval import (
     ApprovalConfig,
     ApprovalResult,
     needs_approval_from_config,
 )
 
-from ..validators import DictValidator
+from ...runtime.events import ToolOutputEvent
+from ...runtime.tooling import shareable_toolset
+from ..validators import args_tool
 from .execution import (
+    MAX_OUTPUT_BYTES,
     ShellBlockedError,
-    check_metacharacters,
-    execute_shell,
-    match_shell_rules,
-    parse_command,
+    execute_shell_async,
 )
+from .output import OutputCallback
+from .result_cache import repo_fingerprint, runtime_shell_cache
+from .rules import CompiledShellRules, ShellCommandCache
 from .types import ShellResult
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONCURRENT = 4
+COMMAND_SLOTS_RESOURCE = "llm_do.shell.command_slots"
+
+
+def _command_slots(ctx: Any, limit: int) -> AsyncContextManager[Any]:
+    """Return the runtime-wide semaphore capping concurrent commands.
+
+    Direct calls without a runtime are not limited.
+    """
+    resource = getattr(getattr(ctx, "deps", None), "resource", None)
+    if resource is None:
+        return contextlib.nullcontext()
+    return resource(COMMAND_SLOTS_RESOURCE, lambda: asyncio.Semaphore(limit))
+
+
+def _output_events(ctx: Any, tool_name: str) -> OutputCallback | None:
+    """Forward live command output to the runtime's event callback.
+
+    ``StreamCapture`` already caps and batches what reaches ``on_output``, so
+    this emits a bounded number of events per command.
+    """
+    emit = getattr(getattr(ctx, "deps", None), "emit_event", None)
+    if emit is None:
+        return None
+    tool_call_id = getattr(ctx, "tool_call_id", None) or ""
+
+    def on_output(stream: str, text: str) -> None:
+        emit(ToolOutputEvent(tool_name=tool_name, tool_call_id=tool_call_id, stream=stream, content=text))
+
+    return on_output
+
 
 class ShellArgs(BaseModel):
     """Arguments for shell."""
@@ -52,6 +106,7 @@ class ShellArgs(BaseModel):
     )
 
 
+@shareable_toolset
 class ShellToolset(AbstractToolset[Any]):
     """Shell command execution toolset with pattern-based approval (whitelist model).
 
@@ -75,13 +130,21 @@ class ShellToolset(AbstractToolset[Any]):
         """Initialize shell toolset.
 
         Args:
-            config: Shell toolset configuration dict (rules, default)
+            config: Shell toolset configuration dict (rules, default,
+                max_concurrent, max_output_bytes, stop_on_output_limit, cache_ttl)
             id: Optional toolset ID for durable execution.
             max_retries: Maximum retries for tool calls.
         """
         self._config = config
         self._id = id
         self._max_retries = max_retries
+        self._max_concurrent = max(int(config.get("max_concurrent", DEFAULT_MAX_CONCURRENT)), 1)
+        self._max_output_bytes = max(int(config.get("max_output_bytes", MAX_OUTPUT_BYTES)), 2)
+        self._stop_on_output_limit = bool(config.get("stop_on_output_limit", False))
+        cache_ttl = config.get("cache_ttl")
+        self._cache_ttl = float(cache_ttl) if cache_ttl is not None else None
+        self._rules = CompiledShellRules(config.get("rules", []), config.get("default"))
+        self._commands = ShellCommandCache(self._rules)
 
     @property
     def id(self) -> str | None:
@@ -103,20 +166,12 @@ class ShellToolset(AbstractToolset[Any]):
             return ApprovalResult.needs_approval()
 
         command = tool_args.get("command", "")
-        try:
-            check_metacharacters(command)
-            args = parse_command(command)
-        except ShellBlockedError as e:
-            return ApprovalResult.blocked(str(e))
-
-        allowed, approval_required = match_shell_rules(
-            command=command, args=args,
-            rules=self._config.get("rules", []),
-            default=self._config.get("default"),
-        )
-        if not allowed:
+        decision = self._commands.decide(command)
+        if decision.blocked_reason is not None:
+            return ApprovalResult.blocked(decision.blocked_reason)
+        if not decision.allowed:
             return ApprovalResult.blocked(f"Command not in whitelist: {command}")
-        return ApprovalResult.needs_approval() if approval_required else ApprovalResult.pre_approved()
+        return ApprovalResult.needs_approval() if decision.approval_required else ApprovalResult.pre_approved()
 
     def get_approval_description(self, name: str, tool_args: dict, ctx: Any) -> str:
         if name != "shell":
@@ -134,23 +189,10 @@ class ShellToolset(AbstractToolset[Any]):
         if name != "shell":
             return set()
         caps = {"proc.exec"}
-        command = tool_args.get("command", "")
-        try:
-            check_metacharacters(command)
-            args = parse_command(command)
-        except ShellBlockedError:
-            caps.add("proc.exec.unlisted")
-            return caps
-
-        allowed, approval_required = match_shell_rules(
-            command=command, args=args,
-            rules=self._config.get("rules", []),
-            default=self._config.get("default"),
-        )
-        if not allowed:
+        decision = self._commands.decide(tool_args.get("command", ""))
+        if decision.blocked_reason is not None or not decision.allowed:
             caps.add("proc.exec.unlisted")
-            return caps
-        if approval_required:
+        elif decision.approval_required:
             caps.add("proc.exec.needs_approval")
         else:
             caps.add("proc.exec.pre_approved")
@@ -158,15 +200,12 @@ class ShellToolset(AbstractToolset[Any]):
 
     async def get_tools(self, ctx: Any) -> dict[str, ToolsetTool]:
         return {
-            "shell": ToolsetTool(
-                toolset=self,
-                tool_def=ToolDefinition(
-                    name="shell",
-                    description="Execute a shell command. Shell metacharacters (|, >, <, ;, &, `, $()) are blocked.",
-                    parameters_json_schema=ShellArgs.model_json_schema(),
-                ),
+            "shell": args_tool(
+                self,
+                "shell",
+                "Execute a shell command. Shell metacharacters (|, >, <, ;, &, `, $()) are blocked.",
+                ShellArgs,
                 max_retries=self._max_retries,
-                args_validator=cast(SchemaValidatorProt, DictValidator(ShellArgs)),
             )
         }
 
@@ -174,7 +213,26 @@ class ShellToolset(AbstractToolset[Any]):
         self, name: str, tool_args: dict[str, Any], ctx: Any, tool: ToolsetTool[Any]
     ) -> ShellResult:
         timeout = min(max(tool_args.get("timeout", 30), 1), 300)
+        decision = self._commands.decide(tool_args["command"])
+        cache = runtime_shell_cache(ctx, self._cache_ttl) if decision.cacheable else None
+        if cache is not None:
+            cwd = Path.cwd()
+            fingerprint = repo_fingerprint(cwd)
+            cached = cache.get(decision.args, cwd, fingerprint)
+            if cached is not None:
+                return cached.model_copy()
         try:
-            return execute_shell(command=tool_args["command"], timeout=timeout)
+            async with _command_slots(ctx, self._max_concurrent):
+                result = await execute_shell_async(
+                    command=tool_args["command"],
+                    timeout=timeout,
+                    max_output_bytes=self._max_output_bytes,
+                    stop_on_output_limit=self._stop_on_output_limit,
+                    on_output=_output_events(ctx, name),
+                    argv=decision.args,
+                )
         except ShellBlockedError as e:
             return ShellResult(stdout="", stderr=str(e), exit_code=1, truncated=False)
+        if cache is not None and result.exit_code >= 0 and not result.stopped_early:
+            cache.put(decision.args, cwd, fingerprint, result)
+        return result
@@ -17,6 +17,9 @@ class ShellResult(BaseModel):
     stderr: str
     exit_code: int
     truncated: bool = False  # True if output exceeded limit
+    stdout_bytes: int = 0  # Total bytes the command wrote, kept or not
+    stderr_bytes: int = 0
+    stopped_early: bool = False  # Killed because output exceeded the limit
 
 
 class ShellRule(BaseModel):
@@ -37,6 +40,12 @@ class ShellRule(BaseModel):
             "Require approval if any of these args appear in the parsed command."
         ),
     )
+    cacheable: bool = Field(
+        default=False,
+        description=(
+            "Reuse results of read-only commands while the repository state is unchanged."
+        ),
+    )
 
 
 class ShellDefault(BaseModel):
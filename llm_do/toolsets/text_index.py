@@ -0,0 +1,135 @@
+"""Character-offset index for seeking in large UTF-8 text files.
+
+``read_file`` works in characters (universal newlines, like ``open(..., "r")``)
+while files are stored as bytes. The index splits a file into blocks of about
+``block_bytes`` bytes, cut on character and ``\\r\\n`` boundaries, and records
+the character offset at which each block starts. A seek is then a bisect over
+the block table plus decoding at most one block before the requested range,
+independent of file size. Indexes are built once with an mmap scan and cached
+by path, mtime and size.
+"""
+from __future__ import annotations
+
+import mmap
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from os import stat_result
+from pathlib import Path
+
+DEFAULT_BLOCK_BYTES = 256 * 1024
+MAX_CACHED_INDEXES = 32
+
+
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 with universal newlines, matching ``open(..., "r")``."""
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _block_end(mm: mmap.mmap, start: int, size: int, block_bytes: int) -> int:
+    """Return a block end that does not split a UTF-8 sequence or ``\\r\\n``."""
+    end = min(start + block_bytes, size)
+    if end == size:
+        return end
+    cut = end
+    while cut > start and (mm[cut] & 0xC0) == 0x80:
+        cut -= 1
+    if cut > start and mm[cut - 1] == 0x0D:
+        cut -= 1
+    return cut if cut > start else end
+
+
+@dataclass(frozen=True, slots=True)
+class CharOffsetIndex:
+    """Block table mapping character offsets to byte offsets for one file version."""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    block_chars: array
+    block_bytes: array
+    total_chars: int
+
+    @classmethod
+    def build(
+        cls, path: Path, st: stat_result, *, block_bytes: int = DEFAULT_BLOCK_BYTES
+    ) -> "CharOffsetIndex":
+        starts_chars = array("q")
+        starts_bytes = array("q")
+        chars = 0
+        with open(path, "rb") as f:
+            size = st.st_size
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    size = len(mm)
+                    pos = 0
+                    while pos < size:
+                        end = _block_end(mm, pos, size, block_bytes)
+                        starts_chars.append(chars)
+                        starts_bytes.append(pos)
+                        chars += len(decode_text(mm[pos:end]))
+                        pos = end
+        starts_bytes.append(size)
+        return cls(
+            path=path,
+            mtime_ns=st.st_mtime_ns,
+            size=size,
+            block_chars=starts_chars,
+            block_bytes=starts_bytes,
+            total_chars=chars,
+        )
+
+    def matches(self, st: stat_result) -> bool:
+        return self.mtime_ns == st.st_mtime_ns and self.size == st.st_size
+
+    def read(self, offset: int, max_chars: int) -> tuple[str, bool]:
+        """Return ``(text, truncated)`` for ``max_chars`` characters at ``offset``."""
+        offset = max(offset, 0)
+        if offset >= self.total_chars:
+            return "", False
+        block = bisect_right(self.block_chars, offset) - 1
+        skip = offset - self.block_chars[block]
+        needed = skip + max_chars + 1
+        parts: list[str] = []
+        collected = 0
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                last_block = len(self.block_chars)
+                while collected < needed and block < last_block:
+                    text = decode_text(mm[self.block_bytes[block]:self.block_bytes[block + 1]])
+                    parts.append(text)
+                    collected += len(text)
+                    block += 1
+        window = "".join(parts)[skip:needed]
+        return window[:max_chars], len(window) > max_chars
+
+
+_CACHE: OrderedDict[Path, CharOffsetIndex] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def get_char_index(path: Path, st: stat_result | None = None) -> CharOffsetIndex:
+    """Return a cached index for ``path``, rebuilding it if mtime or size changed."""
+    st = st or path.stat()
+    with _CACHE_LOCK:
+        index = _CACHE.get(path)
+        if index is not None and index.matches(st):
+            _CACHE.move_to_end(path)
+            return index
+    index = CharOffsetIndex.build(path, st)
+    with _CACHE_LOCK:
+        _CACHE[path] = index
+        _CACHE.move_to_end(path)
+        while len(_CACHE) > MAX_CACHED_INDEXES:
+            _CACHE.popitem(last=False)
+    return index
+
+
+def clear_char_index_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
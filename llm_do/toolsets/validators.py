@@ -1,9 +1,53 @@
-"""Validation helpers for toolset argument schemas."""
+"""Validation helpers for toolset argument schemas.
+
+PydanticAI calls ``get_tools`` on every run step, so building a JSON schema and
+a ``TypeAdapter`` there is paid per step. ``args_schema`` builds both once per
+args model class for the whole process; ``args_tool`` wraps it into a
+``ToolsetTool`` and is meant for user toolsets as much as the built-in ones.
+Entries are weakly keyed, so models of reloaded or dynamic agents can be
+garbage collected.
+
+Validation happens once per tool call: the validator returns a
+``ValidatedArgs`` dict that keeps the model instance, and ``args_model`` hands
+that instance to approval hooks and ``call_tool`` instead of validating again.
+"""
 from __future__ import annotations
 
-from typing import Any, Literal, Type
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Literal, Mapping, Type, TypeVar, cast
 
 from pydantic import BaseModel, TypeAdapter
+from pydantic_ai.tools import ToolDefinition
+from pydantic_ai.toolsets import AbstractToolset, ToolsetTool
+from pydantic_ai.toolsets.abstract import SchemaValidatorProt
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ValidatedArgs(dict[str, Any]):
+    """Tool arguments as a plain dict, plus the model instance they were validated into.
+
+    Approval wrappers and ``call_tool`` signatures expect dicts, so this is
+    what they receive; ``args_model`` returns ``model`` without revalidating.
+    Treat it as read-only: edits to the dict are not reflected in ``model``.
+    """
+
+    __slots__ = ("model",)
+
+    def __init__(self, model: BaseModel) -> None:
+        super().__init__(model.model_dump())
+        self.model = model
+
+
+def args_model(tool_args: Mapping[str, Any] | BaseModel, model: type[ModelT]) -> ModelT:
+    """Return ``tool_args`` as a ``model`` instance, validating only if it isn't one yet."""
+    if isinstance(tool_args, model):
+        return tool_args
+    if isinstance(tool_args, ValidatedArgs) and isinstance(tool_args.model, model):
+        return tool_args.model
+    return model.model_validate(tool_args)
 
 
 class DictValidator:
@@ -15,7 +59,7 @@ class DictValidator:
 
     def _to_dict(self, result: Any) -> dict[str, Any]:
         if isinstance(result, BaseModel):
-            return result.model_dump()
+            return ValidatedArgs(result)
         return result
 
     def validate_python(
@@ -41,3 +85,50 @@ class DictValidator:
     def validate_strings(self, data: Any, **kwargs: Any) -> dict[str, Any]:
         result = self._inner.validate_strings(data, **kwargs)
         return self._to_dict(result)
+
+
+@dataclass(frozen=True, slots=True)
+class ArgsSchema:
+    """JSON schema and dict validator of one args model (treat as read-only)."""
+
+    json_schema: dict[str, Any]
+    validator: DictValidator
+
+
+_SCHEMAS: "weakref.WeakKeyDictionary[type[BaseModel], ArgsSchema]" = weakref.WeakKeyDictionary()
+_SCHEMAS_LOCK = threading.Lock()
+
+
+def args_schema(model: type[BaseModel]) -> ArgsSchema:
+    """Return the process-wide cached schema and validator for ``model``."""
+    with _SCHEMAS_LOCK:
+        cached = _SCHEMAS.get(model)
+    if cached is not None:
+        return cached
+    built = ArgsSchema(json_schema=model.model_json_schema(), validator=DictValidator(model))
+    with _SCHEMAS_LOCK:
+        return _SCHEMAS.setdefault(model, built)
+
+
+def args_tool(
+    toolset: AbstractToolset[Any],
+    name: str,
+    description: str,
+    args_model: type[BaseModel],
+    *,
+    max_retries: int = 1,
+    sequential: bool = False,
+) -> ToolsetTool[Any]:
+    """Build a ``ToolsetTool`` whose schema and validator come from ``args_schema``."""
+    schema = args_schema(args_model)
+    return ToolsetTool(
+        toolset=toolset,
+        tool_def=ToolDefinition(
+            name=name,
+            description=description,
+            parameters_json_schema=schema.json_schema,
+            sequential=sequential,
+        ),
+        max_retries=max_retries,
+        args_validator=cast(SchemaValidatorProt, schema.validator),
+    )
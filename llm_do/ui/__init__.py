@@ -17,6 +17,7 @@ from .events import (
     StatusEvent,
     TextResponseEvent,
     ToolCallEvent,
+    ToolOutputEvent,
     ToolResultEvent,
     UIEvent,
 )
@@ -37,6 +38,7 @@ __all__ = [
     "StatusEvent",
     "TextResponseEvent",
     "ToolCallEvent",
+    "ToolOutputEvent",
     "ToolResultEvent",
     "UIEvent",
     # Parser
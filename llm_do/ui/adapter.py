@@ -42,6 +42,16 @@ def adapt_event(event: runtime.RuntimeEvent) -> ui.UIEvent | None:
             content=payload.content,
         )
 
+    if isinstance(payload, runtime.ToolOutputEvent):
+        return ui.ToolOutputEvent(
+            agent=event.agent,
+            depth=event.depth,
+            tool_name=payload.tool_name,
+            tool_call_id=payload.tool_call_id,
+            stream=payload.stream,
+            content=payload.content,
+        )
+
     if isinstance(payload, PartStartEvent):
         if isinstance(payload.part, TextPart):
             return ui.TextResponseEvent(
@@ -6,6 +6,7 @@ All event discrimination happens once, in the parser.
 from __future__ import annotations
 
 import asyncio
+from dataclasses import replace
 from typing import Any, Callable, Coroutine
 
 from pydantic_ai_blocking_approval import ApprovalDecision, ApprovalRequest
@@ -15,6 +16,8 @@ from textual.binding import Binding
 from textual.containers import Vertical
 from textual.widgets import Footer, Header, TextArea
 
+from llm_do.runtime.approval import PersistentApprovalDecision
+
 from .controllers import (
     AgentRunner,
     ApprovalWorkflowController,
@@ -31,6 +34,50 @@ from .events import (
 )
 from .widgets.messages import ApprovalPanel, MessageContainer
 
+MAX_EVENTS_PER_BATCH = 512
+
+
+def drain_event_batch(
+    queue: asyncio.Queue[UIEvent | None],
+    first: UIEvent | None,
+    *,
+    limit: int = MAX_EVENTS_PER_BATCH,
+) -> list[UIEvent | None]:
+    """Return ``first`` plus any events already queued, without waiting.
+
+    The batch stops at the end-of-stream sentinel or after ``limit`` events so
+    a flood of deltas cannot starve input handling.
+    """
+    batch: list[UIEvent | None] = [first]
+    while first is not None and len(batch) < limit:
+        try:
+            event = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        batch.append(event)
+        if event is None:
+            break
+    return batch
+
+
+def coalesce_text_deltas(batch: list[UIEvent | None]) -> list[UIEvent | None]:
+    """Merge adjacent streaming deltas from the same agent into one event."""
+    merged: list[UIEvent | None] = []
+    for event in batch:
+        previous = merged[-1] if merged else None
+        if (
+            isinstance(event, TextResponseEvent)
+            and event.is_delta
+            and isinstance(previous, TextResponseEvent)
+            and previous.is_delta
+            and previous.agent == event.agent
+            and previous.depth == event.depth
+        ):
+            merged[-1] = replace(previous, content=previous.content + event.content)
+            continue
+        merged.append(event)
+    return merged
+
 
 class LlmDoApp(App[None]):
     """Main Textual application for llm-do TUI."""
@@ -75,6 +122,7 @@ class LlmDoApp(App[None]):
         Binding("q", "quit_if_idle", "Quit", show=False),
         Binding("a", "approve", "Approve", show=False),
         Binding("s", "approve_session", "Approve Session", show=False),
+        Binding("p", "approve_persistent", "Approve and Save", show=False),
         Binding("d", "deny", "Deny", show=False),
     ]
 
@@ -139,49 +187,56 @@ class LlmDoApp(App[None]):
     async def _consume_events(self) -> None:
         """Consume typed events from the queue and update UI.
 
-        This is a thin loop that delegates to MessageContainer for rendering
-        and only handles app-level state management.
+        Blocks until an event arrives, then drains everything already queued
+        and applies the batch under a single ``batch_update`` so the widget
+        tree is refreshed once per batch rather than once per event.
         """
         messages = self.query_one("#messages", MessageContainer)
 
         while not self._done:
             try:
-                event = await asyncio.wait_for(
-                    self._event_queue.get(),
-                    timeout=0.1,
-                )
-            except asyncio.TimeoutError:
-                continue
+                first = await self._event_queue.get()
             except asyncio.CancelledError:
                 break
 
-            if event is None:
-                # Sentinel - agent done
-                self._done = True
-                # Capture final result for display after exit
-                if self._messages:
-                    self.final_result = "\n".join(self._messages)
-                if self._auto_quit:
-                    self.exit()
-                else:
-                    messages.add_status("Press 'q' to exit")
-                self._event_queue.task_done()
-                break
-
-            if isinstance(event, ApprovalRequestEvent):
-                self._enqueue_approval_request(event, messages)
-            else:
-                # Let MessageContainer handle streaming and widget mounting (with error handling)
-                try:
-                    messages.handle_event(event)
-                except Exception as e:
-                    # Log display errors but don't crash the UI
-                    messages.add_status(f"Display error: {e}")
+            batch = drain_event_batch(self._event_queue, first)
+            try:
+                with self.batch_update():
+                    for event in coalesce_text_deltas(batch):
+                        if event is None:
+                            self._finish_events(messages)
+                            break
+                        self._apply_event(event, messages)
+                        if self._done:
+                            break
+            finally:
+                for _ in batch:
+                    self._event_queue.task_done()
 
-                # Handle special cases that need app state management
-                self._handle_event_state(event)
+    def _finish_events(self, messages: MessageContainer) -> None:
+        """Handle the end-of-stream sentinel."""
+        self._done = True
+        # Capture final result for display after exit
+        if self._messages:
+            self.final_result = "\n".join(self._messages)
+        if self._auto_quit:
+            self.exit()
+        else:
+            messages.add_status("Press 'q' to exit")
+
+    def _apply_event(self, event: UIEvent, messages: MessageContainer) -> None:
+        if isinstance(event, ApprovalRequestEvent):
+            self._enqueue_approval_request(event, messages)
+            return
+        # Let MessageContainer handle streaming and widget mounting (with error handling)
+        try:
+            messages.handle_event(event)
+        except Exception as e:
+            # Log display errors but don't crash the UI
+            messages.add_status(f"Display error: {e}")
 
-            self._event_queue.task_done()
+        # Handle special cases that need app state management
+        self._handle_event_state(event)
 
     def _handle_event_state(self, event: UIEvent) -> None:
         """Handle events that need app state management.
@@ -261,6 +316,10 @@ class LlmDoApp(App[None]):
         """Handle 's' key - approve for session."""
         self._resolve_approval(ApprovalDecision(approved=True, remember="session"))
 
+    def action_approve_persistent(self) -> None:
+        """Handle 'p' key - approve and save the grant (capability policy decisions_path)."""
+        self._resolve_approval(PersistentApprovalDecision(approved=True))
+
     def action_deny(self) -> None:
         """Handle 'd' key - deny."""
         self._resolve_approval(ApprovalDecision(approved=False, note="Rejected via TUI"))
@@ -38,7 +38,7 @@ class RichDisplayBackend(DisplayBackend):
     Verbosity levels:
         0 - Minimal: Only show prompts, responses, tool calls/results, status
         1 - Normal: Add progress indicators (Generating..., Complete)
-        2 - Verbose: Add streaming deltas (partial responses as they arrive)
+        2 - Verbose: Add streaming deltas and live tool output as they arrive
     """
 
     def __init__(
@@ -60,9 +60,11 @@ class RichDisplayBackend(DisplayBackend):
     def display(self, event: UIEvent) -> None:
         renderable = event.render_rich(self.verbosity)
         if renderable is not None:
-            from .events import TextResponseEvent
+            from .events import TextResponseEvent, ToolOutputEvent
 
-            if isinstance(event, TextResponseEvent) and event.is_delta:
+            if isinstance(event, ToolOutputEvent) or (
+                isinstance(event, TextResponseEvent) and event.is_delta
+            ):
                 self.console.print(renderable, end="")
             else:
                 self.console.print(renderable)
@@ -74,7 +76,7 @@ class HeadlessDisplayBackend(DisplayBackend):
     Verbosity levels:
         0 - Minimal: Only show prompts, responses, tool calls/results, status
         1 - Normal: Add progress indicators (Generating..., Complete)
-        2 - Verbose: Add streaming deltas (partial responses as they arrive)
+        2 - Verbose: Add streaming deltas and live tool output as they arrive
     """
 
     def __init__(self, stream: TextIO | None = None, verbosity: int = 0):
@@ -84,9 +86,11 @@ class HeadlessDisplayBackend(DisplayBackend):
     def display(self, event: UIEvent) -> None:
         text = event.render_text(self.verbosity)
         if text is not None:
-            from .events import TextResponseEvent
+            from .events import TextResponseEvent, ToolOutputEvent
 
-            if isinstance(event, TextResponseEvent) and event.is_delta:
+            if isinstance(event, ToolOutputEvent) or (
+                isinstance(event, TextResponseEvent) and event.is_delta
+            ):
                 self.stream.write(text)
             else:
                 self.stream.write(text + "\n")
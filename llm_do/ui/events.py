@@ -295,6 +295,26 @@ class ToolResultEvent(UIEvent):
         return ToolResultMessage(self.tool_name, self._content_as_str(), self.is_error, self.agent_tag)
 
 
+@dataclass
+class ToolOutputEvent(UIEvent):
+    """Event emitted for live output from a running tool (verbosity >= 2)."""
+    tool_name: str = ""
+    tool_call_id: str = ""
+    stream: str = "stdout"
+    content: str = ""
+
+    def render_rich(self, verbosity: int = 0) -> "RenderableType":
+        from rich.text import Text
+        return Text(self.content, style="red" if self.stream == "stderr" else "dim", end="")
+
+    def render_text(self, verbosity: int = 0) -> str:
+        return self.content
+
+    def create_widget(self) -> "Widget | None":
+        # TUI appends to a per-call ToolOutputMessage via MessageContainer
+        return None
+
+
 @dataclass
 class DeferredToolEvent(UIEvent):
     """Event emitted for deferred (async) tool status updates."""
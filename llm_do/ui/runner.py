@@ -4,6 +4,7 @@ from __future__ import annotations
 import asyncio
 import os
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Literal, Mapping, Sequence, TextIO
@@ -12,14 +13,14 @@ from pydantic_ai.exceptions import ModelHTTPError, UnexpectedModelBehavior, User
 from pydantic_ai.messages import PartDeltaEvent
 from pydantic_ai_blocking_approval import ApprovalDecision, ApprovalRequest
 
-from llm_do.project import AgentRegistry
-from llm_do.runtime import Entry, RunApprovalPolicy, Runtime
+from llm_do.project import AgentRegistry, ReloadResult
+from llm_do.runtime import CapabilityPolicy, Entry, RunApprovalPolicy, Runtime
 from llm_do.runtime.contracts import MessageLogCallback
-from llm_do.runtime.events import RuntimeEvent
+from llm_do.runtime.events import RuntimeEvent, ToolOutputEvent
 
 from .adapter import adapt_event
 from .display import DisplayBackend, HeadlessDisplayBackend, TextualDisplayBackend
-from .events import UIEvent
+from .events import ErrorEvent, StatusEvent, UIEvent
 from .parser import parse_approval_request
 
 UiMode = Literal["tui", "headless"]
@@ -28,6 +29,8 @@ AuthMode = Literal["oauth_off", "oauth_auto", "oauth_required"]
 UiEventSink = Callable[[UIEvent], None]
 RuntimeEventSink = Callable[[RuntimeEvent], None]
 EntryFactory = Callable[[], tuple[Entry, AgentRegistry]]
+EntryReloader = Callable[[], ReloadResult | None]
+ConnectionWarmup = Callable[[Entry, AgentRegistry], Awaitable[Any]]
 RuntimeFactory = Callable[..., Runtime]
 OAuthProviderResolver = Callable[[str], str | None]
 OAuthOverrideResolver = Callable[[str], Awaitable[Any | None]]
@@ -41,6 +44,10 @@ class RunConfig:
     entry: Entry | None = None
     entry_factory: EntryFactory | None = None
     agent_registry: AgentRegistry | None = None
+    # Called before each chat turn after the first; see ProjectReloader.reload
+    entry_reloader: EntryReloader | None = None
+    # Awaited once after the entry is first built, e.g. warm_up_entry
+    connection_warmup: ConnectionWarmup | None = None
     # Runtime settings
     project_root: Path | None = None
     approval_mode: ApprovalMode = "prompt"
@@ -52,6 +59,7 @@ class RunConfig:
     agent_calls_require_approval: bool = False
     agent_attachments_require_approval: bool = False
     agent_approval_overrides: Mapping[str, Any] | None = None
+    capability_policy: CapabilityPolicy | None = None
     oauth_provider_resolver: OAuthProviderResolver | None = None
     oauth_override_resolver: OAuthOverrideResolver | None = None
     message_log_callback: MessageLogCallback | None = None
@@ -114,6 +122,12 @@ def _format_run_error_message(exc: BaseException) -> str:
     return f"Unexpected error: {exc}"
 
 
+def _describe_reload(result: ReloadResult) -> str:
+    files = ", ".join(path.name for path in result.changed) or "retry"
+    rebuilt = ", ".join(sorted(result.rebuilt)) or "none"
+    return f"{files} -> rebuilt {rebuilt}"
+
+
 def _resolve_entry_factory(
     entry: Entry | None,
     entry_factory: EntryFactory | None,
@@ -150,9 +164,28 @@ def _build_runtime(
         on_event=on_event,
         message_log_callback=config.message_log_callback,
         verbosity=config.verbosity,
+        capability_policy=config.capability_policy,
     )
 
 
+def run_summary_lines(runtime: Runtime) -> list[str]:
+    """Summaries from runtime resources that report stats (e.g. the read cache)."""
+    lines: list[str] = []
+    for resource in runtime.resources.values():
+        stats = getattr(resource, "stats", None)
+        summary = getattr(stats(), "summary", None) if callable(stats) else None
+        if callable(summary):
+            lines.append(summary())
+    return lines
+
+
+def _print_run_summary(runtime: Runtime, stream: TextIO, verbosity: int) -> None:
+    if verbosity < 1:
+        return
+    for line in run_summary_lines(runtime):
+        print(f"[summary] {line}", file=stream, flush=True)
+
+
 async def _render_loop(
     queue: asyncio.Queue[UIEvent | None], backends: Sequence[DisplayBackend], *, on_close: Callable[[], None] | None = None
 ) -> None:
@@ -192,7 +225,7 @@ def _start_render_loop(
     )
 
     def on_event(event: RuntimeEvent) -> None:
-        if verbosity < 2 and isinstance(event.event, PartDeltaEvent):
+        if verbosity < 2 and isinstance(event.event, (PartDeltaEvent, ToolOutputEvent)):
             return
         ui_event = adapt_event(event)
         if ui_event is not None:
@@ -282,16 +315,44 @@ async def run_tui(
         last_error_line = f"[{entry_name}] ERROR ({error_type}): {message}"
         if config.error_stream is not None:
             print(last_error_line, file=config.error_stream, flush=True)
-        from .events import ErrorEvent
         emit_ui_event(ErrorEvent(agent=entry_name, message=message, error_type=error_type))
         exit_code = 1
 
+    def reload_entry_instance() -> None:
+        nonlocal entry_instance
+        if entry_instance is None or config.entry_reloader is None:
+            return
+        started = time.perf_counter()
+        try:
+            reloaded = config.entry_reloader()
+        except Exception as exc:
+            # Keep chatting with the last good build; the edit is retried next turn.
+            emit_ui_event(ErrorEvent(
+                agent=entry_name,
+                message=f"Reload failed, keeping previous version: {exc}",
+                error_type=type(exc).__name__,
+            ))
+            return
+        if reloaded is None:
+            return
+        entry_instance = (reloaded.entry, reloaded.registry)
+        emit_ui_event(StatusEvent(
+            agent=entry_name,
+            phase="reload",
+            state=_describe_reload(reloaded),
+            duration_sec=time.perf_counter() - started,
+        ))
+
     async def run_entry(
         input_data: Any,
     ) -> list[Any] | None:
         nonlocal message_history
 
+        reload_entry_instance()
+        first_build = entry_instance is None
         entry, registry = get_entry_instance()
+        if first_build and config.connection_warmup is not None:
+            await config.connection_warmup(entry, registry)
         runtime.register_registry(registry)
 
         result, ctx = await runtime.run_entry(
@@ -355,6 +416,7 @@ async def run_tui(
     result = result_holder[0] if result_holder else None
     if last_error_line and (config.error_stream is None or config.error_stream is sys.stderr):
         print(last_error_line, file=sys.stderr, flush=True)
+    _print_run_summary(runtime, config.error_stream or sys.stderr, config.verbosity)
     return RunUiResult(result=result, exit_code=exit_code)
 
 
@@ -392,6 +454,8 @@ async def run_headless(
                 "Headless mode cannot prompt for approvals; use approve_all or reject_all."
             )
         entry, registry = resolved_factory()
+        if config.connection_warmup is not None:
+            await config.connection_warmup(entry, registry)
         runtime.register_registry(registry)
         result, _ctx = await runtime.run_entry(entry, input)
     except KeyboardInterrupt as exc:
@@ -405,6 +469,7 @@ async def run_headless(
     finally:
         if render_state is not None:
             await render_state.close()
+    _print_run_summary(runtime, error_stream, config.verbosity)
 
     return RunUiResult(result=result, exit_code=exit_code)
 
@@ -192,6 +192,28 @@ class ToolResultMessage(BaseMessage):
         return "\n".join(lines)
 
 
+class ToolOutputMessage(BaseMessage):
+    """Widget showing the live output of a running tool, keeping only the tail."""
+
+    DEFAULT_CSS = """
+    ToolOutputMessage {
+        color: $text-muted;
+        border: dashed $warning;
+    }
+    """
+
+    MAX_CHARS = 4000
+
+    def __init__(self, tool_name: str, agent_tag: str = "", **kwargs: Any) -> None:
+        self._header = f"{agent_tag} Output: {tool_name}" if agent_tag else f"Output: {tool_name}"
+        self._content = ""
+        super().__init__(self._header, markup=False, **kwargs)
+
+    def append_text(self, text: str) -> None:
+        self._content = (self._content + text)[-self.MAX_CHARS:]
+        self.update(f"{self._header}\n{self._content}")
+
+
 class StatusMessage(BaseMessage):
     """Widget for displaying status updates."""
 
@@ -276,6 +298,7 @@ def _format_approval_request(
         [
             "[green][[a]][/green] Approve once",
             "[green][[s]][/green] Approve for session",
+            "[green][[p]][/green] Approve and save",
             "[red][[d]][/red] Deny",
             "[red][[q]][/red] Quit",
         ]
@@ -330,6 +353,7 @@ class MessageContainer(ScrollableContainer):
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self._current_assistant: AssistantMessage | None = None
+        self._tool_outputs: dict[str, ToolOutputMessage] = {}
 
     def start_assistant_message(
         self, content: str = "", agent_tag: str = ""
@@ -403,14 +427,15 @@ class MessageContainer(ScrollableContainer):
     def handle_event(self, event: "UIEvent") -> None:
         """Route events to the right widget/streaming handler.
 
-        This method handles the TextResponseEvent streaming specially,
-        and delegates other events to create_widget().
+        This method handles TextResponseEvent and ToolOutputEvent streaming
+        specially, and delegates other events to create_widget().
         """
         from llm_do.ui.events import (
             ApprovalRequestEvent,
             ErrorEvent,
             TextResponseEvent,
             ToolCallEvent,
+            ToolOutputEvent,
             ToolResultEvent,
             UserMessageEvent,
         )
@@ -427,6 +452,20 @@ class MessageContainer(ScrollableContainer):
                 self.start_assistant_message(placeholder, event.agent_tag)
             return
 
+        if isinstance(event, ToolOutputEvent):
+            output = self._tool_outputs.get(event.tool_call_id)
+            if output is None:
+                self._current_assistant = None
+                output = ToolOutputMessage(event.tool_name, event.agent_tag)
+                self._tool_outputs[event.tool_call_id] = output
+                self.mount(output)
+            output.append_text(event.content)
+            self.scroll_end(animate=False)
+            return
+
+        if isinstance(event, ToolResultEvent):
+            self._tool_outputs.pop(event.tool_call_id, None)
+
         # Interrupt streaming for tool/approval/error events
         if isinstance(
             event,
@@ -2,10 +2,11 @@
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pydantic import model_validator
 from pydantic_ai.models.test import TestModel
 from pydantic_ai.tools import RunContext
 
-from llm_do.runtime import AgentSpec
+from llm_do.runtime import AgentSpec, PromptInput
 from llm_do.runtime.contracts import CallContextProtocol
 from llm_do.toolsets.agent import AgentToolset, agent_as_toolset
 from llm_do.toolsets.approval import (
@@ -124,4 +125,37 @@ async def test_agent_toolset_call_delegates_to_call_agent() -> None:
     result = await toolset.call_tool(spec.name, {"input": "hi"}, run_ctx, tool)
 
     assert result == "ok"
-    mock_deps.call_agent.assert_awaited_once_with(spec, {"input": "hi"})
+    mock_deps.call_agent.assert_awaited_once_with(spec, PromptInput(input="hi"))
+
+
+@pytest.mark.anyio
+async def test_agent_toolset_validates_args_once_per_call() -> None:
+    """Approval, description and the call reuse the validator's model instance."""
+    validations = 0
+
+    class CountingInput(PromptInput):
+        @model_validator(mode="after")
+        def _count(self) -> "CountingInput":
+            nonlocal validations
+            validations += 1
+            return self
+
+    spec = AgentSpec(name="agent", instructions="Test", model=TestModel(), input_model=CountingInput)
+    toolset = AgentToolset(spec=spec)
+    mock_deps = MagicMock(spec=CallContextProtocol)
+    mock_deps.call_agent = AsyncMock(return_value="ok")
+    mock_deps.config = None
+    from pydantic_ai.usage import RunUsage
+    run_ctx = RunContext(deps=mock_deps, model=TestModel(), usage=RunUsage(), prompt="test")
+
+    tool = (await toolset.get_tools(run_ctx))[spec.name]
+    tool_args = tool.args_validator.validate_python({"input": "hi", "attachments": ["a.txt"]})
+    assert tool_args == {"input": "hi", "attachments": ["a.txt"]}
+    toolset.needs_approval(spec.name, tool_args, run_ctx)
+    assert toolset.get_approval_description(spec.name, tool_args, run_ctx) == (
+        "Call agent agent with attachments: a.txt"
+    )
+    await toolset.call_tool(spec.name, tool_args, run_ctx, tool)
+
+    assert validations == 1
+    assert mock_deps.call_agent.await_args.args[1] is tool_args.model
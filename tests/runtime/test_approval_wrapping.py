@@ -1,10 +1,27 @@
+import time
+from types import SimpleNamespace
+
 import pytest
 from pydantic_ai.models.test import TestModel
-from pydantic_ai.toolsets import FunctionToolset
-from pydantic_ai_blocking_approval import ApprovalDecision, ApprovalToolset
+from pydantic_ai.toolsets import AbstractToolset, FunctionToolset
+from pydantic_ai_blocking_approval import (
+    ApprovalDecision,
+    ApprovalResult,
+    ApprovalToolset,
+)
 
 from llm_do.runtime import AgentSpec, FunctionEntry, Runtime
-from llm_do.runtime.approval import AgentApprovalPolicy, RunApprovalPolicy
+from llm_do.runtime.approval import (
+    AgentApprovalPolicy,
+    ApprovalContextToolset,
+    ApprovalDeniedResultToolset,
+    RunApprovalPolicy,
+)
+from llm_do.toolsets.agent import AgentToolset
+from llm_do.toolsets.approval import (
+    get_toolset_approval_config,
+    set_toolset_approval_config,
+)
 from llm_do.toolsets.filesystem import FileSystemToolset
 
 
@@ -32,7 +49,7 @@ def test_wrap_toolsets_preserves_toolset_instances() -> None:
 
     assert len(wrapped) == 1
     assert isinstance(wrapped[0], ApprovalToolset)
-    inner = wrapped[0]._inner
+    inner = wrapped[0].inner
     assert inner is toolset
     assert getattr(inner, "marker") == "keep"
 
@@ -67,3 +84,164 @@ async def test_agent_tool_calls_can_require_approval() -> None:
 
     with pytest.raises(PermissionError):
         await runtime.run_entry(entry, {"input": "go"})
+
+
+class _PlainToolset(AbstractToolset):
+    """``ping`` returns pong, ``touch`` raises PermissionError; approval comes from config."""
+
+    @property
+    def id(self):
+        return None
+
+    async def get_tools(self, ctx):
+        return {}
+
+    async def call_tool(self, name, tool_args, ctx, tool):
+        if name == "touch":
+            raise PermissionError("read-only filesystem")
+        return "pong"
+
+
+class _CountingToolset(_PlainToolset):
+    """Like ``_PlainToolset`` but decides approval itself; counts approval checks."""
+
+    def __init__(self, result: ApprovalResult | None = None) -> None:
+        self.approval_checks = 0
+        self._result = result or ApprovalResult.needs_approval()
+
+    def needs_approval(self, name, tool_args, ctx, config=None):
+        self.approval_checks += 1
+        return self._result
+
+
+def test_runtime_links_each_toolset_once() -> None:
+    toolset = FunctionToolset()
+    spec = AgentSpec(name="main", instructions="x", model=TestModel(), toolsets=[toolset])
+    runtime = Runtime()
+    runtime.register_agents({"main": spec})
+
+    first = runtime.link_toolsets(spec.toolsets)
+    second = runtime.link_toolsets([toolset])
+
+    assert first[0] is second[0]
+    assert isinstance(first[0], ApprovalContextToolset)
+    assert first[0].inner is toolset
+
+
+def test_evicted_dynamic_agents_release_their_wrappers() -> None:
+    shared = FunctionToolset()
+    main = AgentSpec(name="main", instructions="x", model=TestModel(), toolsets=[shared])
+    runtime = Runtime(max_dynamic_agents=1)
+    runtime.register_agents({"main": main})
+    first = AgentSpec(name="a1", instructions="x", model=TestModel(), toolsets=[FunctionToolset(), shared])
+    second = AgentSpec(name="a2", instructions="x", model=TestModel(), toolsets=[FunctionToolset()])
+
+    runtime.dynamic_agents.add("a1", first)
+    runtime.link_toolsets(first.toolsets)
+    assert len(runtime._toolset_linker._linked) == 2
+    runtime.dynamic_agents.add("a2", second)
+    runtime.link_toolsets(second.toolsets)
+
+    assert list(runtime.dynamic_agents) == ["a2"]
+    linked = {id(toolset) for toolset, _ in runtime._toolset_linker._linked.values()}
+    assert linked == {id(shared), id(second.toolsets[0])}
+
+
+@pytest.mark.anyio
+async def test_statically_pre_approved_tools_skip_approval_checks() -> None:
+    toolset = _PlainToolset()
+    set_toolset_approval_config(toolset, {"ping": {"pre_approved": True}})
+    denied: list[str] = []
+    wrapper = AgentApprovalPolicy(
+        approval_callback=lambda req: denied.append(req.tool_name) or ApprovalDecision(approved=False),
+    ).wrap_toolsets([toolset])[0]
+
+    assert await wrapper.call_tool("ping", {}, None, None) == "pong"
+    with pytest.raises(PermissionError):
+        await wrapper.call_tool("touch", {}, None, None)
+    assert denied == ["touch"]
+
+
+@pytest.mark.anyio
+async def test_pre_approved_config_skips_toolset_needs_approval() -> None:
+    toolset = _CountingToolset(ApprovalResult.blocked("never"))
+    set_toolset_approval_config(toolset, {"ping": {"pre_approved": True}})
+    wrapper = AgentApprovalPolicy(approval_callback=_approve_all).wrap_toolsets([toolset])[0]
+
+    assert await wrapper.call_tool("ping", {}, None, None) == "pong"
+    assert toolset.approval_checks == 0
+    with pytest.raises(PermissionError, match="never"):
+        await wrapper.call_tool("touch", {}, None, None)
+    assert toolset.approval_checks == 1
+
+
+@pytest.mark.anyio
+async def test_fused_wrapper_returns_permission_errors_without_forwarding() -> None:
+    toolset = _CountingToolset()
+    wrapper = AgentApprovalPolicy(
+        approval_callback=_approve_all, return_permission_errors=True
+    ).wrap_toolsets([toolset])[0]
+
+    result = await wrapper.call_tool("touch", {}, None, None)
+
+    assert result == {
+        "error": "read-only filesystem",
+        "tool_name": "touch",
+        "error_type": "permission",
+    }
+    assert wrapper.inner.approval_checks == 1
+    with pytest.raises(AttributeError):
+        wrapper.approval_checks
+
+
+@pytest.mark.anyio
+async def test_fused_wrapper_does_not_use_library_private_hooks(monkeypatch) -> None:
+    for hook in ("_get_approval_result", "_get_description", "_prompt_for_approval", "_resolve_approval"):
+        monkeypatch.setattr(ApprovalToolset, hook, lambda *args, **kwargs: pytest.fail("private hook"))
+    asked: list[str] = []
+    wrapper = AgentApprovalPolicy(
+        approval_callback=lambda req: asked.append(req.description) or ApprovalDecision(approved=True),
+    ).wrap_toolsets([_CountingToolset()])[0]
+
+    assert await wrapper.call_tool("ping", {"n": 1}, None, None) == "pong"
+    assert asked == ["ping(n=1)"]
+
+
+def test_agent_toolset_skips_input_validation_when_calls_are_pre_approved(monkeypatch) -> None:
+    spec = AgentSpec(name="child", instructions="x", model=TestModel())
+    toolset = AgentToolset(spec=spec)
+    runtime = Runtime()
+    ctx = SimpleNamespace(deps=SimpleNamespace(config=runtime.config))
+    monkeypatch.setattr(
+        toolset, "_messages_from_args", lambda _args: pytest.fail("validated input")
+    )
+
+    result = toolset.needs_approval("child", {"input": "hi"}, ctx)
+
+    assert result.is_pre_approved
+
+
+@pytest.mark.anyio
+async def test_fused_wrapper_overhead_benchmark() -> None:
+    """Per-call approval overhead: legacy two-wrapper chain vs fused wrapper."""
+    toolset = _PlainToolset()
+    set_toolset_approval_config(toolset, {"ping": {"pre_approved": True}})
+    legacy = ApprovalDeniedResultToolset(
+        ApprovalToolset(toolset, _approve_all, get_toolset_approval_config(toolset))
+    )
+    fused = AgentApprovalPolicy(
+        approval_callback=_approve_all, return_permission_errors=True
+    ).wrap_toolsets([toolset])[0]
+    iterations = 20_000
+
+    async def _per_call(wrapper) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await wrapper.call_tool("ping", {}, None, None)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    legacy_us = await _per_call(legacy)
+    fused_us = await _per_call(fused)
+
+    print(f"\npre-approved call: {legacy_us:.2f} us (legacy chain), {fused_us:.2f} us (fused)")
+    assert fused_us < legacy_us
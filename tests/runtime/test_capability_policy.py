@@ -0,0 +1,282 @@
+"""Tests for the capability policy matcher and its approval wrapper integration."""
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+from pydantic_ai.toolsets import AbstractToolset
+from pydantic_ai_blocking_approval import (
+    ApprovalBlocked,
+    ApprovalDecision,
+    ApprovalDenied,
+    ApprovalRequest,
+    ApprovalResult,
+)
+
+from llm_do.project import (
+    ManifestRuntimeConfig,
+    ProjectManifest,
+    resolve_capability_policy,
+)
+from llm_do.runtime import CapabilityPolicy, CapabilityRule
+from llm_do.runtime.approval import ApprovalContextToolset, PersistentApprovalDecision
+from llm_do.runtime.capabilities import grant_key
+from llm_do.toolsets.filesystem import FileSystemToolset
+
+
+class _CapabilityToolset(AbstractToolset):
+    """Toolset whose capabilities and approval result are fixed per test."""
+
+    def __init__(self, capabilities: set[str], result: ApprovalResult | None = None) -> None:
+        self.capabilities = capabilities
+        self.result = result or ApprovalResult.needs_approval()
+        self.calls = 0
+
+    @property
+    def id(self):
+        return None
+
+    async def get_tools(self, ctx):
+        return {}
+
+    def needs_approval(self, name, tool_args, ctx, config=None):
+        return self.result
+
+    def get_capabilities(self, name, tool_args, ctx, config=None):
+        return set(self.capabilities)
+
+    async def call_tool(self, name, tool_args, ctx, tool):
+        self.calls += 1
+        return "ok"
+
+
+class _RecordingCallback:
+    def __init__(self, decision: ApprovalDecision) -> None:
+        self.decision = decision
+        self.requests: list[ApprovalRequest] = []
+
+    def __call__(self, request: ApprovalRequest) -> ApprovalDecision:
+        self.requests.append(request)
+        return self.decision
+
+
+def _policy(*rules: tuple[str, str], **kwargs) -> CapabilityPolicy:
+    return CapabilityPolicy([CapabilityRule(c, d) for c, d in rules], **kwargs)
+
+
+def test_most_specific_rule_wins() -> None:
+    policy = _policy(("fs", "deny"), ("fs.read", "allow"), ("fs.read.outside_base", "prompt"))
+
+    assert policy.evaluate({"fs.read", "fs.read.within_base"}) == "allow"
+    assert policy.evaluate({"fs.read", "fs.read.outside_base"}) == "prompt"
+    assert policy.evaluate({"fs.write"}) == "deny"
+    assert policy.evaluate({"proc.exec"}) is None
+
+
+def test_strictest_leaf_wins_across_unrelated_capabilities() -> None:
+    policy = _policy(("fs.read", "allow"), ("net.egress", "deny"), ("*", "prompt"))
+
+    assert policy.evaluate({"fs.read", "net.egress"}) == "deny"
+    assert policy.evaluate({"fs.read", "proc.exec"}) == "prompt"
+
+
+def test_trailing_wildcard_is_accepted_and_invalid_patterns_rejected() -> None:
+    policy = _policy(("proc.exec.*", "allow"))
+    assert policy.evaluate({"proc.exec.pre_approved"}) == "allow"
+
+    for pattern in ("fs.*.write", "fs..read", "", "fs read"):
+        with pytest.raises(ValueError, match="Invalid capability pattern"):
+            CapabilityRule(pattern, "allow")
+    with pytest.raises(ValueError, match="Invalid capability decision"):
+        CapabilityRule("fs", "maybe")  # type: ignore[arg-type]
+
+
+@pytest.mark.anyio
+async def test_policy_allow_skips_prompt_and_deny_blocks() -> None:
+    callback = _RecordingCallback(ApprovalDecision(approved=False))
+    inner = _CapabilityToolset({"fs.write", "fs.write.within_base"})
+    wrapper = ApprovalContextToolset(
+        inner, callback, capability_policy=_policy(("fs.write.within_base", "allow"))
+    )
+
+    assert await wrapper.call_tool("write_file", {}, None, None) == "ok"
+    assert callback.requests == []
+
+    inner.capabilities = {"fs.write", "fs.write.outside_base"}
+    wrapper = ApprovalContextToolset(
+        inner, callback, capability_policy=_policy(("fs.write.outside_base", "deny"))
+    )
+    with pytest.raises(ApprovalBlocked, match="capability policy"):
+        await wrapper.call_tool("write_file", {}, None, None)
+    assert inner.calls == 1
+
+
+@pytest.mark.anyio
+async def test_policy_cannot_override_toolset_block() -> None:
+    inner = _CapabilityToolset({"proc.exec"}, ApprovalResult.blocked("metacharacters"))
+    wrapper = ApprovalContextToolset(
+        inner,
+        _RecordingCallback(ApprovalDecision(approved=True)),
+        capability_policy=_policy(("*", "allow")),
+    )
+
+    with pytest.raises(ApprovalBlocked, match="metacharacters"):
+        await wrapper.call_tool("shell", {}, None, None)
+    assert inner.calls == 0
+
+
+@pytest.mark.anyio
+async def test_policy_prompt_overrides_pre_approved_toolset() -> None:
+    callback = _RecordingCallback(ApprovalDecision(approved=False, note="no"))
+    inner = _CapabilityToolset({"fs.read"}, ApprovalResult.pre_approved())
+    wrapper = ApprovalContextToolset(
+        inner, callback, capability_policy=_policy(("fs.read", "prompt"))
+    )
+
+    with pytest.raises(ApprovalDenied):
+        await wrapper.call_tool("read_file", {"path": "x"}, None, None)
+    assert len(callback.requests) == 1
+
+
+@pytest.mark.anyio
+async def test_session_grant_covers_only_the_approved_call(tmp_path) -> None:
+    decisions = tmp_path / "grants.json"
+    callback = _RecordingCallback(ApprovalDecision(approved=True, remember="session"))
+    inner = _CapabilityToolset({"proc.exec", "proc.exec.unlisted"})
+    policy = _policy(("proc.exec.unlisted", "prompt"), decisions_path=decisions)
+    wrapper = ApprovalContextToolset(inner, callback, capability_policy=policy)
+
+    await wrapper.call_tool("shell", {"command": "rm a"}, None, None)
+    await wrapper.call_tool("shell", {"command": "rm a"}, None, None)
+    assert len(callback.requests) == 1
+
+    callback.decision = ApprovalDecision(approved=False)
+    with pytest.raises(ApprovalDenied):
+        await wrapper.call_tool("shell", {"command": "rm b"}, None, None)
+    assert [r.tool_args["command"] for r in callback.requests] == ["rm a", "rm b"]
+    assert inner.calls == 2
+    # "Session" approvals are never written to disk.
+    assert not decisions.exists()
+
+
+@pytest.mark.anyio
+async def test_unmatched_calls_do_not_create_policy_grants() -> None:
+    callback = _RecordingCallback(ApprovalDecision(approved=True, remember="session"))
+    policy = _policy(("net", "deny"))
+    wrapper = ApprovalContextToolset(
+        _CapabilityToolset({"fs.write", "fs.write.within_base"}), callback, capability_policy=policy
+    )
+
+    await wrapper.call_tool("write_file", {"path": "a"}, None, None)
+
+    assert len(callback.requests) == 1
+    assert not policy.is_granted("write_file", {"path": "a"})
+
+
+@pytest.mark.anyio
+async def test_persistent_approvals_are_saved_for_later_runs(tmp_path) -> None:
+    decisions = tmp_path / "state" / "grants.json"
+    callback = _RecordingCallback(PersistentApprovalDecision(approved=True))
+    inner = _CapabilityToolset({"fs.write", "fs.write.within_base"})
+    rules = (("fs.write", "prompt"),)
+    wrapper = ApprovalContextToolset(
+        inner, callback, capability_policy=_policy(*rules, decisions_path=decisions)
+    )
+
+    await wrapper.call_tool("write_file", {"path": "a"}, None, None)
+    assert len(json.loads(decisions.read_text())["granted"]) == 1
+
+    next_run = ApprovalContextToolset(
+        inner, callback, capability_policy=_policy(*rules, decisions_path=decisions)
+    )
+    await next_run.call_tool("write_file", {"path": "a"}, None, None)
+    assert len(callback.requests) == 1
+    await next_run.call_tool("write_file", {"path": "b"}, None, None)
+    assert len(callback.requests) == 2
+    assert inner.calls == 3
+
+
+def test_grants_file_with_unknown_version_is_ignored(tmp_path) -> None:
+    decisions = tmp_path / "grants.json"
+    decisions.write_text(json.dumps({"version": 99, "granted": [grant_key("write_file", {"path": "a"})]}))
+
+    policy = _policy(("fs.write", "prompt"), decisions_path=decisions)
+
+    assert not policy.is_granted("write_file", {"path": "a"})
+
+
+@pytest.mark.anyio
+async def test_filesystem_toolset_capabilities_drive_policy(tmp_path) -> None:
+    (tmp_path / "notes.txt").write_text("hello")
+    toolset = FileSystemToolset(config={"base_path": str(tmp_path), "read_approval": True})
+    callback = _RecordingCallback(ApprovalDecision(approved=False))
+    wrapper = ApprovalContextToolset(
+        toolset, callback, capability_policy=_policy(("fs.read.within_base", "allow"))
+    )
+    tool = (await toolset.get_tools(None))["read_file"]
+
+    result = await wrapper.call_tool("read_file", {"path": "notes.txt"}, None, tool)
+
+    assert result.content == "hello"
+    assert callback.requests == []
+    with pytest.raises(ApprovalDenied):
+        await wrapper.call_tool("read_file", {"path": "/etc/hostname"}, None, tool)
+
+
+def test_manifest_capability_policy_resolves_relative_decisions_path(tmp_path) -> None:
+    manifest = ProjectManifest(
+        version=1,
+        runtime=ManifestRuntimeConfig(
+            capability_policy={
+                "rules": [
+                    {"capability": "fs.read", "decision": "allow"},
+                    {"capability": "proc.exec.*", "decision": "deny"},
+                ],
+                "decisions_path": ".llm-do/grants.json",
+            }
+        ),
+        entry={"agent": "main"},
+        agent_files=["main.agent"],
+    )
+
+    policy = resolve_capability_policy(manifest, tmp_path)
+
+    assert policy is not None
+    assert policy.decisions_path == (tmp_path / ".llm-do/grants.json").resolve()
+    assert policy.evaluate({"proc.exec", "proc.exec.unlisted"}) == "deny"
+
+
+def test_manifest_rejects_invalid_capability_rules() -> None:
+    with pytest.raises(ValueError, match="Invalid capability pattern"):
+        ManifestRuntimeConfig(capability_policy={"rules": [{"capability": "fs.*.x", "decision": "allow"}]})
+    with pytest.raises(ValueError):
+        ManifestRuntimeConfig(capability_policy={"rules": [{"capability": "fs", "decision": "maybe"}]})
+
+
+@pytest.mark.anyio
+async def test_capability_policy_approval_overhead_benchmark() -> None:
+    """Approval overhead per tool call with a few hundred compiled rules."""
+    rules = [CapabilityRule(f"svc{i}.op{j}", "prompt") for i in range(50) for j in range(6)]
+    rules.append(CapabilityRule("fs.read.within_base", "allow"))
+    policy = CapabilityPolicy(rules)
+    inner = _CapabilityToolset({"fs.read", "fs.read.within_base"})
+    callback = _RecordingCallback(ApprovalDecision(approved=True))
+    wrapped = ApprovalContextToolset(inner, callback, capability_policy=policy)
+    baseline = ApprovalContextToolset(
+        _CapabilityToolset(set(), ApprovalResult.pre_approved()), callback
+    )
+    iterations = 20_000
+
+    async def _per_call(toolset: AbstractToolset) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await toolset.call_tool("read_file", {"path": "a"}, None, None)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    baseline_us = await _per_call(baseline)
+    policy_us = await _per_call(wrapped)
+
+    print(f"\napproval per call: {baseline_us:.2f} us (pre-approved), {policy_us:.2f} us (capability policy, {len(rules)} rules)")
+    assert callback.requests == []
+    assert policy_us < 100
@@ -1,20 +1,28 @@
+import gzip
 import io
 import json
 
-from pydantic_ai.messages import ModelRequest, UserPromptPart
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.models.test import TestModel
 
-from llm_do.cli.main import _make_message_log_callback
+from llm_do.cli.message_log import MessageLogWriter, make_message_log_callback
+from llm_do.runtime import AgentSpec
+from llm_do.runtime.agent_runner import run_agent
+from tests.runtime.helpers import build_runtime_context
 
 
 def test_message_log_callback_emits_jsonl_records() -> None:
     stream = io.StringIO()
-    callback = _make_message_log_callback(stream)
+    writer = MessageLogWriter(stream)
+    callback = make_message_log_callback(writer)
     messages = [
         ModelRequest(parts=[UserPromptPart(content="hello")]),
         ModelRequest(parts=[UserPromptPart(content="world")]),
     ]
 
     callback("agent", 2, messages)
+    writer.close()
 
     lines = stream.getvalue().splitlines()
     assert len(lines) == len(messages)
@@ -24,3 +32,63 @@ def test_message_log_callback_emits_jsonl_records() -> None:
         assert record["agent"] == "agent"
         assert record["depth"] == 2
         assert "message" in record
+        assert "span_id" not in record
+
+
+def test_message_log_callback_attaches_active_span_ids() -> None:
+    stream = io.StringIO()
+    writer = MessageLogWriter(stream)
+    callback = make_message_log_callback(writer)
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    tracer = sdk_trace.TracerProvider().get_tracer("test")
+
+    with tracer.start_as_current_span("agent run") as span:
+        callback("agent", 0, [ModelRequest(parts=[UserPromptPart(content="hi")])])
+        context = span.get_span_context()
+    writer.close()
+
+    record = json.loads(stream.getvalue())
+    assert record["trace_id"] == f"{context.trace_id:032x}"
+    assert record["span_id"] == f"{context.span_id:016x}"
+
+
+def test_message_log_writer_rotates_gzip_segments(tmp_path) -> None:
+    writer = MessageLogWriter(
+        path=tmp_path / "messages.jsonl",
+        max_bytes=64,
+        compression="gzip",
+    )
+    lines = [json.dumps({"n": i, "pad": "x" * 20}) + "\n" for i in range(6)]
+    for line in lines:
+        writer.write(line)
+    writer.close()
+
+    segments = writer.segment_paths
+    assert segments[0].name == "messages.jsonl.gz"
+    assert segments[1].name == "messages.1.jsonl.gz"
+    assert len(segments) == 6
+    recovered = "".join(gzip.decompress(p.read_bytes()).decode() for p in segments)
+    assert recovered == "".join(lines)
+
+
+def test_message_log_writer_requires_path_for_rotation() -> None:
+    with pytest.raises(ValueError, match="require a file path"):
+        MessageLogWriter(io.StringIO(), max_bytes=10)
+
+
+@pytest.mark.anyio
+async def test_run_agent_logs_only_new_messages() -> None:
+    logged: list[list[object]] = []
+    ctx = build_runtime_context(model="test")
+    ctx.runtime.log_messages = lambda _agent, _depth, messages: logged.append(messages)  # type: ignore[method-assign]
+    spec = AgentSpec(name="main", instructions="Reply.", model=TestModel(custom_output_text="ok"))
+    history = [
+        ModelRequest(parts=[UserPromptPart(content="earlier")]),
+        ModelResponse(parts=[TextPart(content="earlier reply")]),
+    ]
+
+    _output, messages = await run_agent(spec, ctx, {"input": "now"}, message_history=history)
+
+    assert len(messages) == len(history) + 2
+    assert len(logged) == 1
+    assert logged[0] == messages[len(history):]
@@ -38,7 +38,7 @@ async def test_dynamic_agent_create_and_call(tmp_path):
         ),
     )
 
-    assert (tmp_path / "sample_agent.agent").exists()
+    assert len(list(tmp_path.glob("sample_agent-*.agent"))) == 1
     assert name in ctx.dynamic_agents
 
     ctx.dynamic_agents[name].model = TestModel(custom_output_text="ok")
@@ -132,3 +132,139 @@ async def test_dynamic_agent_create_validates_tools(tmp_path):
                 tools=["nope_tool"],
             ),
         )
+
+
+def _runtime(tmp_path, **kwargs):
+    runtime = Runtime(
+        run_approval_policy=RunApprovalPolicy(mode="approve_all"),
+        project_root=tmp_path,
+        **kwargs,
+    )
+    return runtime.spawn_call_runtime(
+        active_toolsets=[],
+        model=TestModel(),
+        invocation_name="test",
+        depth=0,
+    )
+
+
+def _create_args(name: str, instructions: str = "Return OK.") -> AgentCreateArgs:
+    return AgentCreateArgs(name=name, instructions=instructions, description="d", model="test")
+
+
+def test_dynamic_agent_create_is_in_memory_without_generated_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    ctx = _runtime(tmp_path)
+
+    name = DynamicAgentsToolset()._agent_create(ctx, _create_args("mem_agent"))
+
+    assert ctx.dynamic_agents[name].instructions == "Return OK."
+    assert list(tmp_path.rglob("*.agent")) == []
+
+
+def test_dynamic_agent_recreate_reuses_identical_definition(tmp_path):
+    ctx = _runtime(tmp_path, generated_agents_dir=tmp_path)
+    toolset = DynamicAgentsToolset()
+
+    toolset._agent_create(ctx, _create_args("worker"))
+    spec = ctx.dynamic_agents["worker"]
+    assert toolset._agent_create(ctx, _create_args("worker")) == "worker"
+    assert ctx.dynamic_agents["worker"] is spec
+    assert len(list(tmp_path.glob("worker-*.agent"))) == 1
+
+    with pytest.raises(ValueError, match="already exists"):
+        toolset._agent_create(ctx, _create_args("worker", "Something else."))
+
+
+@pytest.mark.anyio
+async def test_dynamic_agent_persisted_definition_is_reused_by_later_runtime(tmp_path):
+    toolset = DynamicAgentsToolset()
+    toolset._agent_create(_runtime(tmp_path, generated_agents_dir=tmp_path), _create_args("worker"))
+    written = {p: p.stat().st_mtime_ns for p in tmp_path.glob("*.agent")}
+
+    later = _runtime(tmp_path, generated_agents_dir=tmp_path)
+    toolset._agent_create(later, _create_args("worker"))
+    assert {p: p.stat().st_mtime_ns for p in tmp_path.glob("*.agent")} == written
+
+    fresh = _runtime(tmp_path, generated_agents_dir=tmp_path)
+    spec = toolset._load_persisted(fresh, "worker")
+    assert spec is not None and spec.instructions == "Return OK."
+    spec.model = TestModel(custom_output_text="ok")
+    assert await toolset._agent_call(fresh, AgentCallArgs(agent="worker", input="hi")) == "ok"
+
+
+def test_dynamic_agent_registry_is_bounded_per_runtime(tmp_path):
+    ctx = _runtime(tmp_path, max_dynamic_agents=2)
+    toolset = DynamicAgentsToolset()
+    for name in ("a1", "a2", "a3"):
+        toolset._agent_create(ctx, _create_args(name))
+
+    assert sorted(ctx.dynamic_agents) == ["a2", "a3"]
+
+
+@pytest.mark.anyio
+async def test_agent_call_is_parallel_and_agent_create_ordered():
+    tools = await DynamicAgentsToolset().get_tools(None)
+    assert tools["agent_call"].tool_def.sequential is False
+    assert tools["agent_create"].tool_def.sequential is True
+
+
+@pytest.mark.anyio
+async def test_dynamic_agent_calls_run_concurrently(tmp_path):
+    import asyncio
+
+    from pydantic_ai.messages import ModelResponse, TextPart
+    from pydantic_ai.models.function import FunctionModel
+
+    active = 0
+    peak = 0
+
+    async def slow_reply(messages, info):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return ModelResponse(parts=[TextPart("ok")])
+
+    ctx = _runtime(tmp_path)
+    toolset = DynamicAgentsToolset()
+    for name in ("w1", "w2", "w3"):
+        toolset._agent_create(ctx, _create_args(name))
+        ctx.dynamic_agents[name].model = FunctionModel(slow_reply)
+
+    results = await asyncio.gather(
+        *(toolset._agent_call(ctx, AgentCallArgs(agent=name, input="hi")) for name in ("w1", "w2", "w3"))
+    )
+    assert results == ["ok", "ok", "ok"]
+    assert peak == 3
+
+
+def test_dynamic_agent_create_is_serialized_across_threads(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    ctx = _runtime(tmp_path)
+    toolset = DynamicAgentsToolset()
+    builds = 0
+    build_spec = DynamicAgentsToolset._build_spec
+
+    def slow_build(self, ctx, agent_def):
+        nonlocal builds
+        builds += 1
+        time.sleep(0.02)
+        return build_spec(self, ctx, agent_def)
+
+    monkeypatch.setattr(DynamicAgentsToolset, "_build_spec", slow_build)
+    results: list[str] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(toolset._agent_create(ctx, _create_args("shared"))))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["shared"] * 4
+    assert builds == 1
@@ -30,6 +30,8 @@ class TestManifestRuntimeConfig:
                 "agent_calls_require_approval": False,
                 "agent_attachments_require_approval": False,
                 "agent_approval_overrides": {},
+                "capability_policy": None,
+                "http_clients": {},
             }
         )
 
@@ -266,6 +268,8 @@ class TestLoadManifest:
                     "agent_calls_require_approval": False,
                     "agent_attachments_require_approval": False,
                     "agent_approval_overrides": {},
+                    "capability_policy": None,
+                    "http_clients": {},
                 },
             }
         )
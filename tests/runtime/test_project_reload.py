@@ -0,0 +1,302 @@
+"""Tests for hot reload: file watching, module eviction and incremental rebuilds."""
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+from pydantic_ai.toolsets import FunctionToolset
+
+from llm_do.project import (
+    EntryConfig,
+    FileWatcher,
+    ManifestRuntimeConfig,
+    ProjectManifest,
+    ProjectReloader,
+    RegistryBuilder,
+    build_registry_host_wiring,
+    load_module,
+    unload_module,
+)
+from llm_do.runtime import AgentSpec, Runtime
+from llm_do.runtime.approval import RunApprovalPolicy
+
+TOOLS_V1 = """\
+from pydantic_ai.toolsets import FunctionToolset
+
+calc = FunctionToolset()
+
+
+@calc.tool
+def add(a: int, b: int) -> int:
+    return a + b
+"""
+
+TOOLS_V2 = TOOLS_V1 + """
+
+@calc.tool
+def sub(a: int, b: int) -> int:
+    return a - b
+"""
+
+
+def _agent(name: str, instructions: str, toolsets: Sequence[str] = ()) -> str:
+    lines = ["---", f"name: {name}", "model: test"]
+    if toolsets:
+        lines.append("toolsets:")
+        lines.extend(f"  - {toolset}" for toolset in toolsets)
+    lines += ["---", instructions, ""]
+    return "\n".join(lines)
+
+
+def _project(tmp_path: Path) -> dict[str, Path]:
+    files = {
+        "main": tmp_path / "main.agent",
+        "helper": tmp_path / "helper.agent",
+        "other": tmp_path / "other.agent",
+        "tools": tmp_path / "tools.py",
+    }
+    files["main"].write_text(_agent("main", "Delegate.", ["calc", "helper"]))
+    files["helper"].write_text(_agent("helper", "Help."))
+    files["other"].write_text(_agent("other", "Other.", ["calc"]))
+    files["tools"].write_text(TOOLS_V1)
+    return files
+
+
+def _builder(tmp_path: Path, files: dict[str, Path]) -> RegistryBuilder:
+    return RegistryBuilder(
+        [str(files[name]) for name in ("main", "helper", "other")],
+        [str(files["tools"])],
+        project_root=tmp_path,
+        **build_registry_host_wiring(tmp_path),
+    )
+
+
+@pytest.mark.parametrize("use_inotify", [True, False], ids=["inotify", "polling"])
+def test_file_watcher_reports_writes_replacements_and_deletes(tmp_path, use_inotify) -> None:
+    first = tmp_path / "first.agent"
+    second = tmp_path / "second.agent"
+    first.write_text("one")
+    second.write_text("two")
+    watcher = FileWatcher([first, second], use_inotify=use_inotify)
+    if use_inotify and watcher.backend != "inotify":
+        pytest.skip("inotify unavailable")
+    try:
+        assert watcher.changed() == set()
+
+        first.write_text("one, edited")
+        assert watcher.changed() == {first.resolve()}
+        assert watcher.changed() == set()
+
+        replacement = tmp_path / "second.agent.tmp"
+        replacement.write_text("two, saved by rename")
+        replacement.replace(second)
+        assert watcher.changed() == {second.resolve()}
+
+        first.unlink()
+        assert watcher.changed() == {first.resolve()}
+    finally:
+        watcher.close()
+
+
+def test_unload_module_forces_reexecution(tmp_path) -> None:
+    path = tmp_path / "reloadable.py"
+    path.write_text("VALUE = 1\n")
+    module = load_module(path)
+    assert load_module(path) is module
+
+    evicted = unload_module(path)
+
+    assert module.__name__ in evicted
+    assert module.__name__ not in sys.modules
+    path.write_text("VALUE = 22\n")
+    assert load_module(path).VALUE == 22
+
+
+def test_rebuild_relinks_only_the_changed_agent(tmp_path) -> None:
+    files = _project(tmp_path)
+    builder = _builder(tmp_path, files)
+    registry = builder.build()
+    assert builder.last_rebuilt == {"main", "helper", "other"}
+    main, helper = registry.agents["main"], registry.agents["helper"]
+    main_toolsets = main.toolsets
+    helper_toolset = registry.toolsets["helper"]
+
+    files["helper"].write_text(_agent("helper", "Help, but better."))
+    rebuilt = builder.rebuild([files["helper"]])
+
+    assert builder.last_rebuilt == {"helper"}
+    assert rebuilt.agents["helper"] is helper
+    assert helper.instructions == "Help, but better."
+    assert rebuilt.toolsets["helper"] is helper_toolset
+    assert rebuilt.agents["main"] is main
+    assert main.toolsets is main_toolsets
+
+
+def test_rebuild_reimports_changed_python_file(tmp_path) -> None:
+    files = _project(tmp_path)
+    builder = _builder(tmp_path, files)
+    registry = builder.build()
+    old_calc = registry.toolsets["calc"]
+    helper_toolsets = registry.agents["helper"].toolsets
+
+    files["tools"].write_text(TOOLS_V2)
+    rebuilt = builder.rebuild([files["tools"]])
+
+    new_calc = rebuilt.toolsets["calc"]
+    assert isinstance(new_calc, FunctionToolset)
+    assert new_calc is not old_calc
+    assert set(new_calc.tools) == {"add", "sub"}
+    assert builder.last_rebuilt == {"main", "other"}
+    assert rebuilt.agents["main"].toolsets[0] is new_calc
+    assert rebuilt.agents["helper"].toolsets is helper_toolsets
+
+
+def test_rebuild_reimports_files_using_a_changed_helper_module(tmp_path, monkeypatch) -> None:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    helper_module = tmp_path / "reload_helper_greeting.py"
+    helper_module.write_text("GREETING = 'hi'\n")
+    tools = tmp_path / "tools.py"
+    tools.write_text(
+        "import reload_helper_greeting\n"
+        "from pydantic_ai.toolsets import FunctionToolset\n\n"
+        "greet = FunctionToolset()\n"
+        "GREETING = reload_helper_greeting.GREETING\n"
+    )
+    builder = RegistryBuilder(
+        [],
+        [str(tools)],
+        project_root=tmp_path,
+        **build_registry_host_wiring(tmp_path),
+    )
+    builder.build()
+    assert builder.modules[0].GREETING == "hi"
+
+    helper_module.write_text("GREETING = 'hello'\n")
+    builder.rebuild([helper_module])
+
+    assert builder.modules[0].GREETING == "hello"
+
+
+def test_rebuild_follows_helper_imports_transitively(tmp_path, monkeypatch) -> None:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    inner = tmp_path / "reload_chain_inner.py"
+    inner.write_text("GREETING = 'hi'\n")
+    (tmp_path / "reload_chain_outer.py").write_text(
+        "import reload_chain_inner\n\nGREETING = reload_chain_inner.GREETING\n"
+    )
+    tools = tmp_path / "tools.py"
+    tools.write_text(
+        "import reload_chain_outer\n"
+        "from pydantic_ai.toolsets import FunctionToolset\n\n"
+        "greet = FunctionToolset()\n"
+        "GREETING = reload_chain_outer.GREETING\n"
+    )
+    builder = RegistryBuilder(
+        [],
+        [str(tools)],
+        project_root=tmp_path,
+        **build_registry_host_wiring(tmp_path),
+    )
+    builder.build()
+    assert builder.modules[0].GREETING == "hi"
+
+    inner.write_text("GREETING = 'hello'\n")
+    builder.rebuild([inner])
+
+    assert builder.modules[0].GREETING == "hello"
+
+
+def test_failed_rebuild_keeps_previously_imported_modules(tmp_path, monkeypatch) -> None:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    helper = tmp_path / "reload_broken_helper.py"
+    helper.write_text("GREETING = 'hi'\n")
+    tools = tmp_path / "tools.py"
+    tools.write_text(
+        "import reload_broken_helper\n"
+        "from pydantic_ai.toolsets import FunctionToolset\n\n"
+        "greet = FunctionToolset()\n"
+        "GREETING = reload_broken_helper.GREETING\n"
+    )
+    builder = RegistryBuilder(
+        [],
+        [str(tools)],
+        project_root=tmp_path,
+        **build_registry_host_wiring(tmp_path),
+    )
+    builder.build()
+    tools_module = builder.modules[0]
+    helper_module = sys.modules["reload_broken_helper"]
+
+    helper.write_text("GREETING = (\n")
+    with pytest.raises(SyntaxError):
+        builder.rebuild([helper])
+
+    assert sys.modules["reload_broken_helper"] is helper_module
+    assert sys.modules[tools_module.__name__] is tools_module
+    assert load_module(tools) is tools_module
+
+    helper.write_text("GREETING = 'hello'\n")
+    builder.rebuild()
+    assert builder.modules[0].GREETING == "hello"
+
+
+def test_failed_rebuild_keeps_previous_registry_and_retries(tmp_path) -> None:
+    files = _project(tmp_path)
+    builder = _builder(tmp_path, files)
+    registry = builder.build()
+
+    files["helper"].write_text(_agent("helper", "Help.", ["missing"]))
+    with pytest.raises(ValueError, match="Unknown toolset 'missing'"):
+        builder.rebuild([files["helper"]])
+    assert builder.registry is registry
+    assert registry.agents["helper"].toolsets == []
+    assert builder.pending == {files["helper"].resolve()}
+
+    files["helper"].write_text(_agent("helper", "Help again."))
+    builder.rebuild()
+
+    assert registry.agents["helper"].instructions == "Help again."
+    assert builder.pending == frozenset()
+
+
+def test_project_reloader_reloads_entry_between_turns(tmp_path) -> None:
+    files = _project(tmp_path)
+    manifest = ProjectManifest(
+        version=1,
+        runtime=ManifestRuntimeConfig(),
+        entry=EntryConfig(agent="main"),
+        agent_files=["main.agent", "helper.agent", "other.agent"],
+        python_files=["tools.py"],
+    )
+    reloader = ProjectReloader(manifest, tmp_path, use_inotify=False)
+    try:
+        assert reloader.reload() is None
+        entry, _registry = reloader()
+        assert reloader.reload() is None
+
+        files["main"].write_text(_agent("main", "Delegate more.", ["calc", "helper"]))
+        result = reloader.reload()
+
+        assert result is not None
+        assert result.changed == (files["main"].resolve(),)
+        assert result.rebuilt == {"main"}
+        assert result.entry.spec is entry.spec
+        assert entry.spec.instructions == "Delegate more."
+        assert reloader.reload() is None
+    finally:
+        reloader.close()
+
+
+def test_register_agents_drops_wrappers_of_replaced_toolsets() -> None:
+    from pydantic_ai.models.test import TestModel
+
+    old, new = FunctionToolset(), FunctionToolset()
+    runtime = Runtime(run_approval_policy=RunApprovalPolicy(mode="approve_all"))
+    spec = AgentSpec(name="main", instructions="", model=TestModel(), toolsets=[old])
+    runtime.register_agents({"main": spec})
+    old_wrapper = runtime.link_toolsets([old])[0]
+
+    spec.toolsets = [new]
+    runtime.register_agents({"main": spec})
+
+    assert runtime.link_toolsets([old])[0] is not old_wrapper
@@ -0,0 +1,100 @@
+"""Tests for the runtime-scoped filesystem read cache."""
+from __future__ import annotations
+
+import io
+import os
+
+import pytest
+
+from llm_do.toolsets.filesystem import FileSystemToolset, ReadOnlyFileSystemToolset
+from llm_do.toolsets.read_cache import READ_CACHE_RESOURCE, FileReadCache
+from llm_do.ui.runner import _print_run_summary
+from tests.runtime.helpers import build_run_context, build_runtime_context
+
+
+async def _read(toolset: FileSystemToolset, run_ctx, path: str) -> str:
+    tool = (await toolset.get_tools(run_ctx))["read_file"]
+    result = await toolset.call_tool("read_file", {"path": path}, run_ctx, tool)
+    return result.content
+
+
+@pytest.mark.anyio
+async def test_toolsets_on_one_runtime_share_the_read_cache(tmp_path) -> None:
+    (tmp_path / "notes.txt").write_text("hello")
+    ctx = build_runtime_context()
+    child = ctx.spawn_child([], model=ctx.frame.config.model, invocation_name="child")
+    writer = FileSystemToolset(config={"base_path": str(tmp_path)})
+    reader = ReadOnlyFileSystemToolset(config={"base_path": str(tmp_path)})
+
+    assert await _read(writer, build_run_context(ctx), "notes.txt") == "hello"
+    assert await _read(reader, build_run_context(child), str(tmp_path / "notes.txt")) == "hello"
+
+    cache = ctx.runtime.resources[READ_CACHE_RESOURCE]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert build_runtime_context().runtime.resources == {}
+
+
+@pytest.mark.anyio
+async def test_write_file_invalidates_and_external_edits_are_detected(tmp_path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("one")
+    ctx = build_runtime_context()
+    run_ctx = build_run_context(ctx)
+    toolset = FileSystemToolset(config={"base_path": str(tmp_path)})
+    tool = (await toolset.get_tools(run_ctx))["write_file"]
+
+    assert await _read(toolset, run_ctx, "notes.txt") == "one"
+    await toolset.call_tool("write_file", {"path": "notes.txt", "content": "two"}, run_ctx, tool)
+    assert await _read(toolset, run_ctx, "notes.txt") == "two"
+
+    path.write_text("three!")
+    os.utime(path, ns=(1, 1))
+    assert await _read(toolset, run_ctx, "notes.txt") == "three!"
+
+    stats = ctx.runtime.resources[READ_CACHE_RESOURCE].stats()
+    assert stats.invalidations == 1
+    assert stats.hits == 0
+
+
+def test_read_cache_evicts_least_recently_used_within_byte_budget(tmp_path) -> None:
+    cache = FileReadCache(max_bytes=10)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name
+        path.write_text(name * 4)
+        paths.append(path)
+        cache.put(path, path.stat(), name * 4)
+        cache.get(paths[0], paths[0].stat())
+
+    stats = cache.stats()
+    assert stats.bytes == 8
+    assert stats.evictions == 1
+    assert cache.get(paths[1], paths[1].stat()) is None
+    assert cache.get(paths[2], paths[2].stat()).text == "cccc"
+
+    big = tmp_path / "big"
+    big.write_text("x" * 11)
+    cache.put(big, big.stat(), "x" * 11)
+    assert cache.get(big, big.stat()) is None
+
+
+@pytest.mark.anyio
+async def test_read_cache_can_be_disabled_and_is_reported_in_run_summary(tmp_path) -> None:
+    (tmp_path / "notes.txt").write_text("hello")
+    ctx = build_runtime_context()
+    run_ctx = build_run_context(ctx)
+    disabled = FileSystemToolset(config={"base_path": str(tmp_path), "read_cache_bytes": 0})
+    await _read(disabled, run_ctx, "notes.txt")
+    assert ctx.runtime.resources == {}
+
+    toolset = FileSystemToolset(config={"base_path": str(tmp_path)})
+    for _ in range(4):
+        await _read(toolset, run_ctx, "notes.txt")
+    stream = io.StringIO()
+    _print_run_summary(ctx.runtime, stream, verbosity=1)
+
+    assert "read cache: 3 hits, 1 misses (75% hit rate)" in stream.getvalue()
+    quiet = io.StringIO()
+    _print_run_summary(ctx.runtime, quiet, verbosity=0)
+    assert quiet.getvalue() == ""
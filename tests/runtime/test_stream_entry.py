@@ -0,0 +1,148 @@
+"""Tests for Runtime.stream_entry per-run event streams."""
+import asyncio
+
+import pytest
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.toolsets import FunctionToolset
+
+from llm_do.runtime import (
+    AgentEntry,
+    AgentFinish,
+    AgentSpec,
+    AgentStart,
+    FunctionEntry,
+    RunResult,
+    Runtime,
+    TextDelta,
+    ToolCall,
+    ToolOutput,
+    ToolResult,
+)
+from llm_do.runtime.events import AgentStartEvent, RuntimeEvent, ToolOutputEvent
+from llm_do.runtime.streaming import MAX_PENDING_EVENTS
+
+
+def _calculator(output: str) -> AgentSpec:
+    toolset = FunctionToolset()
+
+    @toolset.tool
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    return AgentSpec(
+        name="calculator",
+        instructions="Use add tool.",
+        model=TestModel(call_tools=["add"], custom_output_text=output),
+        toolsets=[toolset],
+    )
+
+
+async def _collect(stream) -> list:
+    return [event async for event in stream]
+
+
+@pytest.mark.anyio
+async def test_stream_entry_yields_typed_events_then_result() -> None:
+    spec = _calculator("the sum is 3")
+    runtime = Runtime()
+    runtime.register_agents({spec.name: spec})
+
+    async def main(input_data, ctx):
+        return await ctx.call_agent("calculator", input_data)
+
+    events = await _collect(
+        runtime.stream_entry(FunctionEntry(name="entry", fn=main), {"input": "add"})
+    )
+
+    kinds = [type(event) for event in events]
+    assert kinds[0] is AgentStart
+    assert kinds[-2:] == [AgentFinish, RunResult]
+    assert kinds.index(ToolCall) < kinds.index(ToolResult) < kinds.index(TextDelta)
+    call = next(e for e in events if isinstance(e, ToolCall))
+    result = next(e for e in events if isinstance(e, ToolResult))
+    assert (call.agent, call.depth, call.tool_name) == ("calculator", 1, "add")
+    assert result.tool_call_id == call.tool_call_id and not result.is_error
+    text = "".join(e.content for e in events if isinstance(e, TextDelta))
+    assert text == "the sum is 3"
+    assert events[-2].output == "the sum is 3"
+    assert events[-1].output == "the sum is 3"
+    assert events[-1].context.frame.config.invocation_name == "entry"
+
+
+@pytest.mark.anyio
+async def test_concurrent_streams_on_one_runtime_are_isolated() -> None:
+    first = AgentSpec(name="first", instructions="", model=TestModel(custom_output_text="one"))
+    second = AgentSpec(name="second", instructions="", model=TestModel(custom_output_text="two"))
+    runtime_events: list[RuntimeEvent] = []
+    runtime = Runtime(on_event=runtime_events.append)
+
+    first_events, second_events = await asyncio.gather(
+        _collect(runtime.stream_entry(AgentEntry(spec=first), {"input": "go"})),
+        _collect(runtime.stream_entry(AgentEntry(spec=second), {"input": "go"})),
+    )
+
+    assert {e.agent for e in first_events if not isinstance(e, RunResult)} == {"first"}
+    assert {e.agent for e in second_events if not isinstance(e, RunResult)} == {"second"}
+    assert first_events[-1].output == "one"
+    assert second_events[-1].output == "two"
+    # The runtime-wide callback still sees both runs.
+    starts = {e.agent for e in runtime_events if isinstance(e.event, AgentStartEvent)}
+    assert starts == {"first", "second"}
+
+
+@pytest.mark.anyio
+async def test_stream_entry_raises_after_events_of_failed_run() -> None:
+    spec = AgentSpec(name="worker", instructions="", model=TestModel(custom_output_text="ok"))
+
+    async def main(input_data, ctx):
+        await ctx.call_agent(spec, input_data)
+        raise RuntimeError("entry failed")
+
+    seen = []
+    with pytest.raises(RuntimeError, match="entry failed"):
+        async for event in Runtime().stream_entry(FunctionEntry(name="entry", fn=main), {"input": "go"}):
+            seen.append(event)
+
+    assert [type(e) for e in seen][-1] is AgentFinish
+    assert not any(isinstance(e, RunResult) for e in seen)
+
+
+@pytest.mark.anyio
+async def test_closing_stream_early_cancels_the_run() -> None:
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+    spec = AgentSpec(name="worker", instructions="", model=TestModel(custom_output_text="ok"))
+
+    async def main(input_data, ctx):
+        await ctx.call_agent(spec, input_data)
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    stream = Runtime().stream_entry(FunctionEntry(name="entry", fn=main), {"input": "go"})
+    async for event in stream:
+        if isinstance(event, AgentFinish):
+            break
+    await asyncio.wait_for(started.wait(), 1)
+    await stream.aclose()
+
+    assert cancelled.is_set()
+
+
+@pytest.mark.anyio
+async def test_tool_output_is_coalesced_when_consumer_falls_behind() -> None:
+    async def main(input_data, ctx):
+        for i in range(3 * MAX_PENDING_EVENTS):
+            ctx.emit_event(ToolOutputEvent(tool_name="shell", tool_call_id="c1", stream="stdout", content=f"{i},"))
+        ctx.emit_event(ToolOutputEvent(tool_name="shell", tool_call_id="c2", stream="stdout", content="lost"))
+        return "done"
+
+    events = await _collect(Runtime().stream_entry(FunctionEntry(name="entry", fn=main), {"input": "go"}))
+
+    outputs = [e for e in events if isinstance(e, ToolOutput)]
+    assert len(outputs) <= MAX_PENDING_EVENTS
+    assert "".join(o.content for o in outputs) == "".join(f"{i}," for i in range(3 * MAX_PENDING_EVENTS))
+    assert events[-1].output == "done"
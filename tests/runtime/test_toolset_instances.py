@@ -171,3 +171,59 @@ async def test_shared_toolset_instance_reused_across_runs() -> None:
 
     assert seen
     assert {id(item) for item in seen} == {id(shared)}
+
+
+def test_builtin_stateless_toolsets_are_shared_instances(tmp_path) -> None:
+    from pydantic_ai.toolsets._dynamic import DynamicToolset
+
+    from llm_do.project import build_host_toolsets
+    from llm_do.runtime.tooling import is_shareable_toolset
+
+    builtins = build_host_toolsets(tmp_path, tmp_path)
+
+    for name, toolset in builtins.items():
+        assert not isinstance(toolset, DynamicToolset), name
+        assert is_shareable_toolset(toolset), name
+
+    runtime = Runtime()
+    first = runtime.link_toolsets([builtins["filesystem_cwd"]])
+    second = runtime.link_toolsets([builtins["filesystem_cwd"]])
+    assert first[0] is second[0]
+
+
+@pytest.mark.anyio
+async def test_shared_toolset_keeps_per_call_state_in_frame() -> None:
+    from llm_do.runtime.tooling import shareable_toolset
+
+    seen: list[tuple[int, int]] = []
+
+    @shareable_toolset
+    class CounterToolset(FunctionToolset):
+        pass
+
+    counter = CounterToolset()
+
+    @counter.tool
+    async def bump(ctx: RunContext[CallContext]) -> str:
+        state = ctx.deps.frame.toolset_state(counter)
+        state["count"] = state.get("count", 0) + 1
+        seen.append((ctx.deps.frame.config.depth, state["count"]))
+        if ctx.deps.frame.config.depth == 1:
+            await ctx.deps.call_agent("counter", {"input": "nested"})
+        return "ok"
+
+    agent_spec = AgentSpec(
+        name="counter",
+        instructions="Call bump.",
+        model=TestModel(call_tools=["bump"], custom_output_text="done"),
+        toolsets=[counter],
+    )
+
+    async def main(input_data, runtime: CallContext) -> str:
+        return await runtime.call_agent(agent_spec, input_data)
+
+    runtime = Runtime(run_approval_policy=RunApprovalPolicy(mode="approve_all"))
+    runtime.register_agents({agent_spec.name: agent_spec})
+    await runtime.run_entry(FunctionEntry(name="entry", fn=main), {"input": "go"})
+
+    assert seen == [(1, 1), (2, 1)]
@@ -2,6 +2,7 @@
 import io
 
 from llm_do.runtime.events import RuntimeEvent
+from llm_do.runtime.events import ToolOutputEvent as RuntimeToolOutputEvent
 from llm_do.runtime.events import UserMessageEvent as RuntimeUserMessageEvent
 from llm_do.ui.adapter import adapt_event
 from llm_do.ui.display import HeadlessDisplayBackend
@@ -11,6 +12,7 @@ from llm_do.ui.events import (
     StatusEvent,
     TextResponseEvent,
     ToolCallEvent,
+    ToolOutputEvent,
     ToolResultEvent,
     UserMessageEvent,
 )
@@ -204,6 +206,25 @@ class TestAdaptEvent:
         assert event.agent == "main"
         assert event.content == "Hello"
 
+    def test_parse_tool_output_event(self):
+        """Adapter converts live tool output; headless writes it without newlines."""
+        runtime_event = RuntimeEvent(
+            agent="main",
+            depth=1,
+            event=RuntimeToolOutputEvent(
+                tool_name="shell", tool_call_id="call_1", stream="stdout", content="building"
+            ),
+        )
+        event = adapt_event(runtime_event)
+        assert isinstance(event, ToolOutputEvent)
+        assert (event.tool_call_id, event.stream, event.content) == ("call_1", "stdout", "building")
+
+        stream = io.StringIO()
+        backend = HeadlessDisplayBackend(stream=stream, verbosity=2)
+        backend.display(event)
+        backend.display(event)
+        assert stream.getvalue() == "buildingbuilding"
+
     def test_parse_text_part_event(self):
         """Adapter converts PartEndEvent with TextPart to TextResponseEvent."""
         from pydantic_ai.messages import PartEndEvent, TextPart
@@ -0,0 +1,109 @@
+"""Tests for edit_file/append_file and their diff-based approval descriptions."""
+from __future__ import annotations
+
+import difflib
+import os
+
+import pytest
+
+from llm_do.toolsets.file_edits import EditConflictError, apply_unified_diff
+from llm_do.toolsets.filesystem import FileSystemToolset, ReadOnlyFileSystemToolset
+
+
+def _toolset(tmp_path) -> FileSystemToolset:
+    return FileSystemToolset(config={"base_path": str(tmp_path)})
+
+
+def test_edit_file_exact_replace_keeps_line_endings_and_mode(tmp_path) -> None:
+    path = tmp_path / "app.py"
+    path.write_bytes(b"def a():\r\n    return 1\r\n\r\ndef b():\r\n    return 1\r\n")
+    os.chmod(path, 0o750)
+    toolset = _toolset(tmp_path)
+
+    with pytest.raises(ValueError, match="occurs 2 times"):
+        toolset.edit_file("app.py", "return 1", "return 2")
+    with pytest.raises(ValueError, match="not found"):
+        toolset.edit_file("app.py", "return 3", "return 4")
+
+    message = toolset.edit_file("app.py", "def b():\n    return 1", "def b():\n    return 2")
+
+    assert path.read_bytes() == b"def a():\r\n    return 1\r\n\r\ndef b():\r\n    return 2\r\n"
+    assert path.stat().st_mode & 0o777 == 0o750
+    assert message.startswith("Edited app.py (sha256 ")
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
+    toolset.edit_file("app.py", "return 1", "return 0", replace_all=True)
+    assert path.read_bytes().count(b"return 0") == 1
+
+
+def test_apply_unified_diff_tolerates_shifted_hunks_and_bad_counts() -> None:
+    text = "".join(f"line {i}\n" for i in range(1, 21))
+    diff = (
+        "--- a/f.txt\n+++ b/f.txt\n"
+        "@@ -3,3 +3,3 @@\n line 5\n-line 6\n+LINE SIX\n line 7\n"
+        "@@ -40,2 +40,3 @@\n line 19\n+inserted\n line 20\n"
+    )
+
+    result = apply_unified_diff(text, diff)
+
+    assert "LINE SIX\nline 7" in result
+    assert result.endswith("line 19\ninserted\nline 20\n")
+    with pytest.raises(ValueError, match="does not match"):
+        apply_unified_diff(text, "@@ -1 +1 @@\n-missing\n+x\n")
+
+
+@pytest.mark.parametrize(
+    "after",
+    ["a\nb\nX\nc\n", "X\na\nb\nc\n", "a\nb\nc\nX\n", "a\nX\nb\nY\nc\n"],
+    ids=["middle", "start", "end", "two-hunks"],
+)
+def test_apply_unified_diff_zero_context_insertions(after) -> None:
+    before = "a\nb\nc\n"
+    diff = "".join(
+        difflib.unified_diff(
+            before.splitlines(keepends=True), after.splitlines(keepends=True), n=0
+        )
+    )
+
+    assert apply_unified_diff(before, diff) == after
+
+
+def test_edit_and_append_detect_conflicts_by_hash(tmp_path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("one\n")
+    toolset = _toolset(tmp_path)
+    digest = toolset.read_file("notes.txt").sha256
+
+    toolset.append_file("notes.txt", "two\n", expected_sha256=digest)
+    assert path.read_text() == "one\ntwo\n"
+    with pytest.raises(EditConflictError, match="changed since it was read"):
+        toolset.edit_file("notes.txt", "one", "uno", expected_sha256=digest)
+
+    fresh = toolset.read_file("notes.txt").sha256
+    toolset.edit_file("notes.txt", diff="@@ -1,2 +1,2 @@\n-one\n+uno\n two\n", expected_sha256=fresh)
+    assert path.read_text() == "uno\ntwo\n"
+    toolset.append_file("new/log.txt", "first\n")
+    assert (tmp_path / "new" / "log.txt").read_text() == "first\n"
+
+
+@pytest.mark.anyio
+async def test_write_approval_descriptions_show_diff(tmp_path) -> None:
+    (tmp_path / "notes.txt").write_text("alpha\nbeta\n")
+    toolset = _toolset(tmp_path)
+
+    edit = toolset.get_approval_description(
+        "edit_file", {"path": "notes.txt", "old_text": "beta", "new_text": "gamma"}, None
+    )
+    append = toolset.get_approval_description("append_file", {"path": "notes.txt", "content": "delta\n"}, None)
+    broken = toolset.get_approval_description("edit_file", {"path": "notes.txt", "old_text": "zzz"}, None)
+
+    assert edit.splitlines()[0] == "Edit notes.txt"
+    assert "-beta\n+gamma" in edit
+    assert "+delta" in append
+    assert "preview unavailable: old_text not found" in broken
+    assert "+alpha" in toolset.get_approval_description("write_file", {"path": "fresh.txt", "content": "alpha\n"}, None)
+
+    read_only = ReadOnlyFileSystemToolset(config={"base_path": str(tmp_path)})
+    tools = await read_only.get_tools(None)
+    assert {"edit_file", "append_file", "write_file"}.isdisjoint(tools)
+    assert read_only.needs_approval("append_file", {}, None).is_blocked
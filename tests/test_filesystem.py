@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pytest
 from pydantic_ai_blocking_approval import ApprovalResult
 
 import llm_do.toolsets.filesystem as filesystem_module
@@ -61,3 +62,208 @@ def test_needs_approval_unknown_tool_requires_approval() -> None:
     )
 
     assert result.is_needs_approval
+
+
+def _write_mixed_text(path, repeats: int) -> str:
+    """Write multibyte + CRLF text and return what text-mode reading yields."""
+    line = "héllo wörld ✓ 😀\r\nplain ascii line\rlone cr\n"
+    path.write_bytes((line * repeats).encode("utf-8"))
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_char_offset_index_matches_text_mode_reads(tmp_path) -> None:
+    from llm_do.toolsets.text_index import CharOffsetIndex
+
+    path = tmp_path / "mixed.txt"
+    expected = _write_mixed_text(path, 400)
+    index = CharOffsetIndex.build(path, path.stat(), block_bytes=97)
+
+    assert index.total_chars == len(expected)
+    assert len(index.block_chars) > 100
+    for offset in (0, 1, 17, 96, 97, 1000, len(expected) - 5, len(expected)):
+        for max_chars in (1, 50, 400):
+            text, truncated = index.read(offset, max_chars)
+            assert text == expected[offset:offset + max_chars]
+            assert truncated == (offset + max_chars < len(expected))
+
+
+def test_read_file_large_file_uses_cached_index(tmp_path) -> None:
+    from llm_do.toolsets import text_index
+
+    path = tmp_path / "big.txt"
+    expected = _write_mixed_text(path, 30_000)
+    toolset = filesystem_module.FileSystemToolset(config={"base_path": str(tmp_path)})
+    text_index.clear_char_index_cache()
+
+    result = toolset.read_file("big.txt", max_chars=100, offset=500_000)
+    index = text_index.get_char_index(path.resolve())
+    again = toolset.read_file("big.txt", max_chars=100, offset=500_100)
+
+    assert result.content == expected[500_000:500_100]
+    assert result.total_chars == len(expected)
+    assert again.content == expected[500_100:500_200]
+    assert text_index.get_char_index(path.resolve()) is index
+
+    with open(path, "ab") as f:
+        f.write(b"tail")
+    assert toolset.read_file("big.txt", max_chars=10, offset=0).total_chars == len(expected) + 4
+    assert text_index.get_char_index(path.resolve()) is not index
+
+
+def test_read_file_large_file_seek_benchmark(tmp_path) -> None:
+    """Sequential chunked reads over a large file (LLM_DO_READ_BENCH_MB, default 16)."""
+    import os
+    import time
+
+    from llm_do.toolsets import text_index
+
+    size_mb = int(os.environ.get("LLM_DO_READ_BENCH_MB", "16"))
+    path = tmp_path / "large.txt"
+    block = ("lorem ipsum dolor sit amet ✓\n" * 4096).encode("utf-8")
+    with open(path, "wb") as f:
+        for _ in range(size_mb * 1024 * 1024 // len(block)):
+            f.write(block)
+    toolset = filesystem_module.FileSystemToolset(config={"base_path": str(tmp_path)})
+    text_index.clear_char_index_cache()
+
+    start = time.perf_counter()
+    first = toolset.read_file("large.txt", max_chars=20_000)
+    build_s = time.perf_counter() - start
+    offsets = [i * first.total_chars // 50 for i in range(50)]
+    start = time.perf_counter()
+    for offset in offsets:
+        toolset.read_file("large.txt", max_chars=20_000, offset=offset)
+    per_read_ms = (time.perf_counter() - start) / len(offsets) * 1000
+
+    print(f"\n{size_mb} MB: index build {build_s:.2f} s, {per_read_ms:.2f} ms per 20k-char read")
+    assert per_read_ms < 50
+
+
+def _make_tree(root, paths: list[str]) -> None:
+    for rel in paths:
+        target = root / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(rel)
+
+
+def test_list_files_prunes_ignored_directories_and_gitignore(tmp_path) -> None:
+    _make_tree(tmp_path, [
+        "a.py", "b.txt", "src/main.py", "src/gen/out.py", "src/keep.log", "src/drop.log",
+        "node_modules/pkg/index.js", ".git/HEAD", "build/x.py", "docs/build/y.py",
+    ])
+    (tmp_path / ".gitignore").write_text("# comment\n/build/\n*.log\n!keep.log\n")
+    (tmp_path / "src" / ".gitignore").write_text("gen/\n")
+    toolset = filesystem_module.FileSystemToolset(config={"base_path": str(tmp_path)})
+
+    result = toolset.list_files()
+
+    assert result.files == [
+        ".gitignore", "a.py", "b.txt", "docs/build/y.py", "src/.gitignore", "src/keep.log", "src/main.py",
+    ]
+    assert not result.truncated and result.total_files == 7
+    assert toolset.list_files(pattern="**/*.py").files == ["a.py", "docs/build/y.py", "src/main.py"]
+    assert toolset.list_files(pattern="*.py").files == ["a.py"]
+    assert toolset.list_files("src", pattern="*.py").files == ["main.py"]
+
+    custom = filesystem_module.FileSystemToolset(
+        config={"base_path": str(tmp_path), "ignore": ["docs/"], "use_gitignore": False}
+    )
+    assert "build/x.py" in custom.list_files().files
+    assert "node_modules/pkg/index.js" in custom.list_files().files
+    assert not any(path.startswith("docs/") for path in custom.list_files().files)
+
+
+def test_list_files_paginates_with_cursor_and_depth_limit(tmp_path) -> None:
+    paths = [f"d{i}/sub/f{j}.txt" for i in range(3) for j in range(3)] + ["d1/top.txt", "z.txt"]
+    _make_tree(tmp_path, paths)
+    toolset = filesystem_module.FileSystemToolset(config={"base_path": str(tmp_path)})
+    everything = toolset.list_files().files
+
+    pages: list[str] = []
+    cursor = None
+    while True:
+        page = toolset.list_files(limit=4, cursor=cursor)
+        pages.extend(page.files)
+        if not page.truncated:
+            break
+        assert page.total_files == len(page.files) + 1
+        cursor = page.next_cursor
+
+    assert pages == everything
+    assert sorted(everything) == sorted(paths)
+    assert toolset.list_files(max_depth=1).files == ["z.txt"]
+    assert toolset.list_files(max_depth=2).files == ["d1/top.txt", "z.txt"]
+
+
+@pytest.mark.anyio
+async def test_list_files_directory_index_rescans_only_changed_directories(tmp_path) -> None:
+    from llm_do.toolsets.file_walk import DIR_INDEX_RESOURCE
+    from tests.runtime.helpers import build_run_context, build_runtime_context
+
+    _make_tree(tmp_path, [f"d{i}/f.txt" for i in range(5)])
+    toolset = filesystem_module.FileSystemToolset(config={"base_path": str(tmp_path), "list_index": True})
+    run_ctx = build_run_context(build_runtime_context())
+    tool = (await toolset.get_tools(run_ctx))["list_files"]
+
+    first = await toolset.call_tool("list_files", {}, run_ctx, tool)
+    index = run_ctx.deps.runtime.resources[DIR_INDEX_RESOURCE]
+    assert index.scans == 6
+    (tmp_path / "d3" / "new.txt").write_text("new")
+    second = await toolset.call_tool("list_files", {}, run_ctx, tool)
+
+    assert index.scans == 7
+    assert second.files == sorted(first.files + ["d3/new.txt"])
+
+
+def test_list_files_benchmark_against_glob(tmp_path) -> None:
+    """Listing a tree dominated by node_modules: pruned walk vs the old glob."""
+    import time
+
+    _make_tree(tmp_path, [f"src/m{i}.py" for i in range(200)])
+    _make_tree(tmp_path, [f"node_modules/p{i}/lib/f{j}.js" for i in range(200) for j in range(20)])
+    toolset = filesystem_module.FileSystemToolset(config={"base_path": str(tmp_path)})
+
+    start = time.perf_counter()
+    globbed = sorted(str(p.relative_to(tmp_path)) for p in tmp_path.glob("**/*") if p.is_file())
+    glob_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    result = toolset.list_files(limit=100)
+    walk_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\nlist_files: glob {glob_ms:.1f} ms ({len(globbed)} files), walk {walk_ms:.1f} ms ({result.total_files} files)")
+    assert result.truncated and result.total_files == 101
+    assert len(result.files) == 100
+    assert walk_ms < glob_ms
+
+
+@pytest.mark.anyio
+async def test_read_files_batches_paths_and_glob_under_one_budget(tmp_path) -> None:
+    for name, size in (("a.txt", 30), ("b.txt", 50), ("c.txt", 40)):
+        (tmp_path / name).write_text("x" * size)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "one.md").write_text("# one")
+    (tmp_path / "docs" / "two.md").write_text("# two")
+    toolset = filesystem_module.FileSystemToolset(config={"base_path": str(tmp_path)})
+    tool = (await toolset.get_tools(None))["read_files"]
+
+    result = await toolset.call_tool(
+        "read_files",
+        {"paths": ["a.txt", "missing.txt", "b.txt", "c.txt"], "max_total_chars": 100},
+        None,
+        tool,
+    )
+
+    assert [(f.path, f.chars_read, f.truncated) for f in result.files] == [
+        ("a.txt", 30, False), ("missing.txt", 0, False), ("b.txt", 50, False), ("c.txt", 20, True),
+    ]
+    assert "File not found" in result.files[1].error
+    assert result.files[2].total_chars == 50 and result.files[2].sha256
+    assert result.truncated and result.chars_read == 100
+
+    globbed = await toolset.read_files(glob="*.md", path="docs", max_files=1)
+    assert [f.path for f in globbed.files] == ["docs/one.md"]
+    assert globbed.files_omitted == 1 and globbed.truncated
+    assert toolset.get_capabilities("read_files", {"paths": ["a.txt", "/etc/hostname"]}, None) == {
+        "fs.read", "fs.read.within_base", "fs.read.outside_base",
+    }
@@ -0,0 +1,225 @@
+"""Tests for per-provider HTTP client settings and connection warmup."""
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pydantic import ValidationError
+from pydantic_ai import Agent
+from pydantic_ai.models.openai import OpenAIChatModel
+
+from llm_do.http_clients import (
+    HttpClientSettings,
+    build_http_client,
+    configure_provider_http,
+    provider_http_client,
+    warm_up_connections,
+)
+from llm_do.project import (
+    EntryConfig,
+    HttpClientConfig,
+    build_registry,
+    build_registry_host_wiring,
+    reachable_agents,
+    resolve_entry,
+)
+from llm_do.providers import OpenAICompatibleProvider
+
+CHAT_COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "mock",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "pong"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+class _MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _MockHandler)
+        self.connections = 0
+        self.head_delay = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections get reused
+    server: _MockServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _reply(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        time.sleep(self.server.head_delay)
+        self._reply(b"")
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(json.dumps(CHAT_COMPLETION).encode())
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def mock_server() -> Iterator[_MockServer]:
+    server = _MockServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def provider_name() -> Iterator[str]:
+    name = "mock-http-provider"
+    yield name
+    configure_provider_http(name, None)
+
+
+def _model(server: _MockServer, provider: str) -> OpenAIChatModel:
+    return OpenAIChatModel(
+        "mock",
+        provider=OpenAICompatibleProvider(base_url=server.url, name=provider),
+    )
+
+
+@pytest.mark.anyio
+async def test_warmup_preopens_connections_that_requests_reuse(mock_server, provider_name) -> None:
+    configure_provider_http(provider_name, HttpClientSettings(warmup_connections=3))
+    model = _model(mock_server, provider_name)
+
+    opened = await warm_up_connections([model])
+
+    assert opened == {provider_name: 3}
+    assert mock_server.connections == 3
+    result = await Agent(model).run("ping")
+    assert result.output == "pong"
+    assert mock_server.connections == 3
+    await provider_http_client(provider_name).aclose()
+
+
+@pytest.mark.anyio
+async def test_pool_limit_is_applied_to_the_provider_client(mock_server, provider_name) -> None:
+    configure_provider_http(
+        provider_name,
+        HttpClientSettings(max_connections=1, warmup_connections=4),
+    )
+
+    opened = await warm_up_connections([_model(mock_server, provider_name)])
+
+    assert opened == {provider_name: 4}
+    assert mock_server.connections == 1
+    await provider_http_client(provider_name).aclose()
+
+
+@pytest.mark.anyio
+async def test_warmup_skips_unconfigured_and_unreachable_providers(provider_name) -> None:
+    configure_provider_http(
+        provider_name,
+        HttpClientSettings(connect_timeout=0.5, warmup_connections=2),
+    )
+    unreachable = OpenAIChatModel(
+        "mock",
+        provider=OpenAICompatibleProvider(base_url="http://127.0.0.1:9/v1", name=provider_name),
+    )
+    unconfigured = OpenAIChatModel(
+        "mock",
+        provider=OpenAICompatibleProvider(base_url="http://127.0.0.1:9/v1", name="not-configured"),
+    )
+
+    assert await warm_up_connections([unreachable, unconfigured]) == {provider_name: 0}
+
+
+@pytest.mark.anyio
+async def test_warmup_requests_time_out_after_connect_timeout(mock_server, provider_name) -> None:
+    mock_server.head_delay = 2.0
+    configure_provider_http(
+        provider_name,
+        HttpClientSettings(connect_timeout=0.2, warmup_connections=2),
+    )
+
+    start = time.monotonic()
+    opened = await warm_up_connections([_model(mock_server, provider_name)])
+
+    assert opened == {provider_name: 0}
+    assert time.monotonic() - start < 1.5
+    await provider_http_client(provider_name).aclose()
+
+
+def test_configured_client_replaces_the_shared_default(provider_name) -> None:
+    default = provider_http_client(provider_name)
+    configure_provider_http(provider_name, HttpClientSettings(max_connections=5))
+
+    configured = provider_http_client(provider_name)
+
+    assert configured is not default
+    assert provider_http_client(provider_name) is configured
+    configure_provider_http(provider_name, None)
+    assert provider_http_client(provider_name) is default
+
+
+def test_http2_requires_h2() -> None:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        with pytest.raises(RuntimeError, match="'h2' package"):
+            build_http_client(HttpClientSettings(http2=True))
+    else:
+        assert build_http_client(HttpClientSettings(http2=True)) is not None
+
+
+def test_manifest_http_client_config_validates() -> None:
+    config = HttpClientConfig(max_connections=50, warmup_connections=2)
+    assert HttpClientSettings(**config.model_dump()).max_connections == 50
+    with pytest.raises(ValidationError):
+        HttpClientConfig(max_connections=0)
+    with pytest.raises(ValidationError):
+        HttpClientConfig(pool_size=10)
+
+
+def test_reachable_agents_follow_agent_toolsets(tmp_path) -> None:
+    agents = {
+        "main": "toolsets:\n  - helper\n",
+        "helper": "",
+        "unrelated": "",
+    }
+    for name, extra in agents.items():
+        (tmp_path / f"{name}.agent").write_text(f"---\nname: {name}\nmodel: test\n{extra}---\nHi.\n")
+    registry = build_registry(
+        [str(tmp_path / f"{name}.agent") for name in agents],
+        [],
+        project_root=tmp_path,
+        **build_registry_host_wiring(tmp_path),
+    )
+    entry = resolve_entry(EntryConfig(agent="main"), registry, python_files=[], base_path=tmp_path)
+
+    assert {spec.name for spec in reachable_agents(entry, registry)} == {"main", "helper"}
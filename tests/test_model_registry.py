@@ -2,7 +2,14 @@
 import pytest
 from pydantic_ai.models.test import TestModel
 
-from llm_do.models import ModelError, register_model_factory, resolve_model
+from llm_do.models import (
+    ModelCache,
+    ModelError,
+    register_model_factory,
+    resolve_model,
+)
+from llm_do.project import build_registry, build_registry_host_wiring
+from llm_do.runtime import Runtime
 
 
 def test_register_model_factory_resolves_custom_model() -> None:
@@ -40,3 +47,68 @@ def test_register_model_factory_rejects_reserved_prefix() -> None:
 def test_unprefixed_unknown_model_includes_hint() -> None:
     with pytest.raises(ModelError, match="provider prefix"):
         resolve_model("not-a-real-model")
+
+
+def _counting_factory(calls: list[str]):
+    def factory(model_name: str) -> TestModel:
+        calls.append(model_name)
+        return TestModel(custom_output_text=model_name)
+
+    return factory
+
+
+def test_model_cache_shares_instances_until_invalidated() -> None:
+    calls: list[str] = []
+    register_model_factory("custom_provider_cache_test", _counting_factory(calls))
+    cache = ModelCache()
+
+    first = resolve_model("custom_provider_cache_test:demo", cache=cache)
+    assert resolve_model("custom_provider_cache_test:demo", cache=cache) is first
+    assert resolve_model("custom_provider_cache_test:other", cache=cache) is not first
+    assert calls == ["demo", "other"]
+
+    assert cache.invalidate("custom_provider_cache_test:demo") == 1
+    assert resolve_model("custom_provider_cache_test:demo", cache=cache) is not first
+    assert calls == ["demo", "other", "demo"]
+    assert resolve_model("custom_provider_cache_test:demo") is not first
+
+
+def test_model_cache_keys_on_factory() -> None:
+    calls: list[str] = []
+    register_model_factory("custom_provider_cache_swap_test", _counting_factory(calls))
+    cache = ModelCache()
+    first = cache.resolve("custom_provider_cache_swap_test:demo")
+
+    register_model_factory(
+        "custom_provider_cache_swap_test", _counting_factory(calls), replace=True
+    )
+
+    assert cache.resolve("custom_provider_cache_swap_test:demo") is not first
+    assert calls == ["demo", "demo"]
+
+
+def test_agents_and_runtime_share_one_model_instance(tmp_path, monkeypatch) -> None:
+    calls: list[str] = []
+    register_model_factory("custom_provider_cache_registry_test", _counting_factory(calls))
+    monkeypatch.setenv("LLM_DO_MODEL", "custom_provider_cache_registry_test:shared")
+    for name in ("first", "second"):
+        (tmp_path / f"{name}.agent").write_text(f"---\nname: {name}\n---\nHi.\n")
+
+    registry = build_registry(
+        [str(tmp_path / "first.agent"), str(tmp_path / "second.agent")],
+        [],
+        project_root=tmp_path,
+        **build_registry_host_wiring(tmp_path),
+    )
+    runtime = Runtime()
+    runtime.register_registry(registry)
+    ctx = runtime.spawn_call_runtime(
+        [],
+        model="custom_provider_cache_registry_test:shared",
+        invocation_name="main",
+        depth=0,
+    )
+
+    assert registry.agents["first"].model is registry.agents["second"].model
+    assert ctx.frame.config.model is registry.agents["first"].model
+    assert calls == ["shared"]
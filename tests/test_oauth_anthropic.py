@@ -9,6 +9,8 @@ from llm_do.oauth import (
     ANTHROPIC_OAUTH_BETA,
     ANTHROPIC_OAUTH_BETA_FEATURES,
     ANTHROPIC_OAUTH_DANGEROUS_HEADER,
+    get_oauth_api_key,
+    get_token_cache,
     resolve_oauth_overrides,
 )
 from llm_do.oauth import anthropic as oauth_anthropic
@@ -86,6 +88,8 @@ def test_login_anthropic_stores_credentials(monkeypatch, memory_storage):
     async def on_prompt_code() -> str:
         return "authcode#authstate"
 
+    memory_storage.save_credentials("anthropic", OAuthCredentials(refresh="r0", access="old", expires=2**53))
+    assert asyncio.run(get_oauth_api_key("anthropic", storage=memory_storage)) == "old"
     creds = asyncio.run(
         oauth_anthropic.login_anthropic(
             on_auth_url,
@@ -93,6 +97,7 @@ def test_login_anthropic_stores_credentials(monkeypatch, memory_storage):
             storage=memory_storage,
         )
     )
+    assert asyncio.run(get_oauth_api_key("anthropic", storage=memory_storage)) == "access123"
 
     stored = memory_storage.load_credentials("anthropic")
     assert stored is not None
@@ -162,3 +167,29 @@ def test_resolve_oauth_overrides(memory_storage):
         assert feature in beta_flags
     assert overrides.model_settings["extra_headers"][ANTHROPIC_OAUTH_DANGEROUS_HEADER] == "true"
     assert hasattr(overrides.model, "model_name")
+
+
+def test_oauth_model_is_reused_until_the_token_changes(memory_storage):
+    def store(access: str) -> None:
+        memory_storage.save_credentials(
+            "anthropic",
+            OAuthCredentials(
+                refresh="refresh",
+                access=access,
+                expires=int(time.time() * 1000) + 10 * 60_000,
+            ),
+        )
+
+    def resolve():
+        return asyncio.run(
+            resolve_oauth_overrides("anthropic:claude-sonnet-4", storage=memory_storage)
+        )
+
+    store("token-1")
+    first = resolve()
+    assert first is not None
+    assert resolve().model is first.model
+
+    store("token-2")
+    get_token_cache(memory_storage).invalidate()
+    assert resolve().model is not first.model
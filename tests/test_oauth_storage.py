@@ -1,10 +1,15 @@
 import asyncio
 import time
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
 import pytest
 
 from llm_do import oauth
-from llm_do.oauth.storage import OAuthCredentials, OAuthStorage
+from llm_do.oauth.storage import FileSystemStorage, OAuthCredentials, OAuthStorage
 
 
 class InMemoryStorage:
@@ -60,7 +65,157 @@ def test_get_oauth_api_key_refreshes(monkeypatch, memory_storage):
         target_storage.save_credentials(provider, new_creds)
         return new_creds.access
 
-    monkeypatch.setattr(oauth, "refresh_token", fake_refresh)
+    monkeypatch.setattr(oauth, "_refresh_credentials", fake_refresh)
 
     token = asyncio.run(oauth.get_oauth_api_key("anthropic", storage=memory_storage))
     assert token == "fresh_token"
+
+
+class CountingStorage(InMemoryStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return super().load()
+
+
+def _expired() -> OAuthCredentials:
+    return OAuthCredentials(refresh="refresh_token", access="stale_token", expires=0)
+
+
+def _valid(access: str) -> OAuthCredentials:
+    return OAuthCredentials(
+        refresh=f"refresh_for_{access}",
+        access=access,
+        expires=int(time.time() * 1000) + 60 * 60_000,
+    )
+
+
+def test_get_oauth_api_key_serves_cached_token_without_loading():
+    backend = CountingStorage()
+    storage = OAuthStorage(backend)
+    storage.save_credentials("anthropic", _valid("cached_token"))
+
+    async def fetch_many() -> list:
+        return [await oauth.get_oauth_api_key("anthropic", storage=storage) for _ in range(5)]
+
+    loads_before = backend.loads
+    assert asyncio.run(fetch_many()) == ["cached_token"] * 5
+    assert backend.loads == loads_before + 1
+
+    oauth.get_token_cache(storage).invalidate("anthropic")
+    assert asyncio.run(oauth.get_oauth_api_key("anthropic", storage=storage)) == "cached_token"
+    assert backend.loads == loads_before + 2
+
+
+def test_concurrent_callers_share_one_refresh(monkeypatch, memory_storage):
+    memory_storage.save_credentials("anthropic", _expired())
+    refreshes = []
+
+    async def fake_refresh(provider: str, storage=None) -> str:
+        refreshes.append(provider)
+        await asyncio.sleep(0.01)
+        storage.save_credentials(provider, _valid("fresh_token"))
+        return "fresh_token"
+
+    monkeypatch.setattr(oauth, "_refresh_credentials", fake_refresh)
+
+    async def fan_out() -> list:
+        return await asyncio.gather(
+            *(oauth.get_oauth_api_key("anthropic", storage=memory_storage) for _ in range(10))
+        )
+
+    assert asyncio.run(fan_out()) == ["fresh_token"] * 10
+    assert refreshes == ["anthropic"]
+
+
+def test_failed_refresh_removes_credentials(monkeypatch, memory_storage):
+    memory_storage.save_credentials("anthropic", _expired())
+
+    async def failing_refresh(provider: str, storage=None) -> str:
+        raise RuntimeError("invalid_grant")
+
+    monkeypatch.setattr(oauth, "_refresh_credentials", failing_refresh)
+
+    assert asyncio.run(oauth.get_oauth_api_key("anthropic", storage=memory_storage)) is None
+    assert memory_storage.load_credentials("anthropic") is None
+
+
+def test_refresh_waits_for_file_lock_and_reuses_other_process_token(monkeypatch, tmp_path):
+    path = tmp_path / "oauth.json"
+    storage = OAuthStorage(FileSystemStorage(path))
+    storage.save_credentials("anthropic", _expired())
+    other_process = OAuthStorage(FileSystemStorage(path))
+
+    async def unexpected_refresh(provider: str, storage=None) -> str:
+        raise AssertionError("token was already refreshed by the lock holder")
+
+    monkeypatch.setattr(oauth, "_refresh_credentials", unexpected_refresh)
+
+    async def scenario() -> str | None:
+        held = other_process.refresh_lock()
+        assert held is not None
+        held.acquire()
+        try:
+            waiting = asyncio.create_task(oauth.get_oauth_api_key("anthropic", storage=storage))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+            other_process.save_credentials("anthropic", _valid("other_process_token"))
+        finally:
+            held.release()
+        return await waiting
+
+    assert asyncio.run(scenario()) == "other_process_token"
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl")
+def test_refresh_token_goes_through_cache_and_lock(monkeypatch, tmp_path):
+    storage = OAuthStorage(FileSystemStorage(tmp_path / "oauth.json"))
+    storage.save_credentials("anthropic", _valid("old_token"))
+    lock_held = []
+
+    async def fake_refresh(provider: str, storage=None) -> str:
+        with open(storage.refresh_lock().path, "a") as handle:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_held.append(True)
+        storage.save_credentials(provider, _valid("forced_token"))
+        return "forced_token"
+
+    monkeypatch.setattr(oauth, "_refresh_credentials", fake_refresh)
+
+    async def scenario() -> list:
+        before = await oauth.get_oauth_api_key("anthropic", storage=storage)
+        forced = await oauth.refresh_token("anthropic", storage=storage)
+        after = await oauth.get_oauth_api_key("anthropic", storage=storage)
+        return [before, forced, after]
+
+    assert asyncio.run(scenario()) == ["old_token", "forced_token", "forced_token"]
+    assert oauth.get_token_cache(storage).cached("anthropic").access == "forced_token"
+    assert lock_held == [True]
+
+
+def test_refresh_token_raises_and_keeps_credentials_on_failure(monkeypatch, memory_storage):
+    memory_storage.save_credentials("anthropic", _valid("old_token"))
+
+    async def failing_refresh(provider: str, storage=None) -> str:
+        raise RuntimeError("invalid_grant")
+
+    monkeypatch.setattr(oauth, "_refresh_credentials", failing_refresh)
+
+    with pytest.raises(RuntimeError, match="invalid_grant"):
+        asyncio.run(oauth.refresh_token("anthropic", storage=memory_storage))
+    assert memory_storage.load_credentials("anthropic").access == "old_token"
+
+
+def test_logout_invalidates_cached_token(memory_storage):
+    memory_storage.save_credentials("anthropic", _valid("cached_token"))
+    assert asyncio.run(oauth.get_oauth_api_key("anthropic", storage=memory_storage)) == "cached_token"
+
+    assert oauth.logout("anthropic", storage=memory_storage)
+    assert oauth.get_token_cache(memory_storage).cached("anthropic") is None
+    assert asyncio.run(oauth.get_oauth_api_key("anthropic", storage=memory_storage)) is None
+    assert not oauth.logout("anthropic", storage=memory_storage)
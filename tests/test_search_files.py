@@ -0,0 +1,123 @@
+"""Tests for the trigram-indexed search_files tool."""
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from llm_do.toolsets import search_index
+from llm_do.toolsets.filesystem import FileSystemToolset
+
+
+@pytest.fixture(autouse=True)
+def _close_indexes():
+    yield
+    search_index.close_search_indexes()
+
+
+def _toolset(root, index_dir) -> FileSystemToolset:
+    return FileSystemToolset(config={"base_path": str(root), "search_index_dir": str(index_dir)})
+
+
+def _write(root, rel: str, text: str) -> None:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_required_literals_only_keep_mandatory_runs() -> None:
+    assert search_index.required_literals("def (foo)_bar+\\(", regex=True) == ["def ", "foo", "_ba", "r", "("]
+    assert search_index.required_literals("foo|bar", regex=True) == []
+    assert search_index.required_literals("abc?d*", regex=True) == ["ab"]
+    assert search_index.required_literals("a.b", regex=False) == ["a.b"]
+
+
+def test_search_files_literal_regex_glob_and_context(tmp_path) -> None:
+    root = tmp_path / "repo"
+    _write(root, "src/app.py", "import os\n\ndef handler(event):\n    return event\n")
+    _write(root, "src/util.py", "def helper():\n    pass  # TODO tidy\n")
+    _write(root, "docs/notes.md", "handler docs\nTODO: write more\n")
+    _write(root, "node_modules/x/index.js", "function handler() {}\n")
+    (root / "blob.bin").write_bytes(b"\0handler\0")
+    toolset = _toolset(root, tmp_path / "index")
+
+    literal = toolset.search_files("handler", context_lines=1)
+    assert [(m.path, m.line) for m in literal.matches] == [("docs/notes.md", 1), ("src/app.py", 3)]
+    assert literal.matches[1].before == [""] and literal.matches[1].after == ["    return event"]
+    assert literal.files_searched == 2
+
+    regex = toolset.search_files(r"def \w+\(\)", regex=True)
+    assert [(m.path, m.text) for m in regex.matches] == [("src/util.py", "def helper():")]
+    assert [m.path for m in toolset.search_files("todo", ignore_case=True, glob="**/*.py").matches] == ["src/util.py"]
+    assert [m.path for m in toolset.search_files("TODO", path="src").matches] == ["util.py"]
+
+    limited = toolset.search_files("e", max_results=2)
+    assert len(limited.matches) == 2 and limited.truncated
+
+
+def test_search_index_persists_and_updates_incrementally(tmp_path) -> None:
+    root = tmp_path / "repo"
+    for i in range(20):
+        _write(root, f"pkg/mod{i}.py", f"value_{i} = {i}\n")
+    index_dir = tmp_path / "index"
+    toolset = _toolset(root, index_dir)
+
+    assert toolset.search_files("value_7").matches[0].path == "pkg/mod7.py"
+    index = search_index.get_search_index(root, index_dir=index_dir, ignore=toolset._ignore)
+    assert index.files_reindexed == 20
+
+    toolset.write_file("pkg/mod3.py", "renamed_thing = 3\n")
+    (root / "pkg" / "mod4.py").unlink()
+    assert toolset.search_files("renamed_thing").matches[0].path == "pkg/mod3.py"
+    assert toolset.search_files("value_4").matches == []
+    assert index.files_reindexed == 21
+
+    search_index.close_search_indexes()
+    reopened = _toolset(root, index_dir)
+    _write(root, "pkg/new.py", "value_new = 1\n")
+    os.utime(root / "pkg", None)
+    assert reopened.search_files("value_new").matches[0].path == "pkg/new.py"
+    index = search_index.get_search_index(root, index_dir=index_dir, ignore=toolset._ignore)
+    assert index.files_reindexed == 1
+
+
+def test_search_files_benchmark(tmp_path) -> None:
+    """Repeated searches over a thousand files after the lazy build."""
+    root = tmp_path / "repo"
+    body = "".join(f"def function_{j}(arg):\n    return arg * {j}\n" for j in range(40))
+    for i in range(1000):
+        _write(root, f"pkg{i % 20}/mod{i}.py", body + f"MARKER_{i} = True\n")
+    toolset = _toolset(root, tmp_path / "index")
+
+    start = time.perf_counter()
+    toolset.search_files("MARKER_0 ")
+    build_s = time.perf_counter() - start
+    queries = [f"MARKER_{i} " for i in range(1, 1000, 50)]
+    start = time.perf_counter()
+    for query in queries:
+        result = toolset.search_files(query)
+        assert len(result.matches) == 1
+    per_query_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    print(f"\nsearch_files: build {build_s:.2f} s over 1000 files, {per_query_ms:.2f} ms per query")
+    assert per_query_ms < 100
+
+
+def test_search_files_reports_oversized_files_as_skipped(tmp_path) -> None:
+    root = tmp_path / "repo"
+    _write(root, "src/small.py", "needle = 1\n")
+    _write(root, "src/big.py", "needle = 2\n" + "x" * 200 + "\n")
+    _write(root, "docs/big.md", "needle\n" + "y" * 200 + "\n")
+    toolset = FileSystemToolset(
+        config={
+            "base_path": str(root),
+            "search_index_dir": str(tmp_path / "index"),
+            "search_max_file_bytes": 100,
+        }
+    )
+
+    result = toolset.search_files("needle")
+    assert [m.path for m in result.matches] == ["src/small.py"]
+    assert result.skipped == ["docs/big.md", "src/big.py"]
+    assert toolset.search_files("needle", path="src", glob="*.py").skipped == ["big.py"]
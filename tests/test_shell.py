@@ -1,6 +1,15 @@
 """Tests for shell command execution and pattern matching."""
 from __future__ import annotations
 
+import asyncio
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
 import pytest
 from inline_snapshot import snapshot
 
@@ -8,6 +17,7 @@ from llm_do.toolsets.shell import (
     ShellBlockedError,
     check_metacharacters,
     execute_shell,
+    execute_shell_async,
     match_shell_rules,
     parse_command,
 )
@@ -195,6 +205,28 @@ class TestExecuteShell:
         assert result.exit_code == -1
         assert "timed out" in result.stderr.lower()
 
+    def test_timeout_kills_process_group(self, tmp_path):
+        pid_file = tmp_path / "child.pid"
+        result = execute_shell(
+            _spawn_child_command(pid_file), working_dir=tmp_path, timeout=1, kill_grace=0.5
+        )
+        assert result.exit_code == -1
+        assert "timed out" in result.stderr
+        assert asyncio.run(_wait_until_gone(int(pid_file.read_text())))
+
+    def test_large_output_keeps_head_and_tail(self, tmp_path):
+        script = "import sys; sys.stdout.write('HEAD' + 'x' * 100_000 + 'TAIL')"
+        result = execute_shell(
+            shlex.join([sys.executable, "-c", script]), working_dir=tmp_path, max_output_bytes=1000
+        )
+        assert (result.exit_code, result.truncated, result.stdout_bytes) == (0, True, 100_008)
+        assert result.stdout.startswith("HEAD") and result.stdout.endswith("TAIL")
+
+    @pytest.mark.anyio
+    async def test_runs_inside_an_event_loop(self, tmp_path):
+        result = execute_shell("echo inside", working_dir=tmp_path)
+        assert (result.exit_code, result.stdout) == (0, "inside\n")
+
     def test_working_directory(self, tmp_path):
         # Create a file in tmp_path
         test_file = tmp_path / "test.txt"
@@ -206,6 +238,188 @@ class TestExecuteShell:
         )
 
 
+def _spawn_child_command(pid_file: Path) -> str:
+    """A python command that starts a long-lived child and records its pid."""
+    script = (
+        "import subprocess, sys, time; "
+        "p = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+        f"open({str(pid_file)!r}, 'w').write(str(p.pid)); "
+        "time.sleep(60)"
+    )
+    return shlex.join([sys.executable, "-c", script])
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return True
+    return "State:\tZ" not in status
+
+
+async def _wait_for_file(path: Path) -> int:
+    for _ in range(200):
+        if path.exists() and path.read_text():
+            return int(path.read_text())
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"{path} was never written")
+
+
+async def _wait_until_gone(pid: int) -> bool:
+    for _ in range(100):
+        if not _is_running(pid):
+            return True
+        await asyncio.sleep(0.02)
+    return False
+
+
+def test_head_tail_buffer_bounds_memory():
+    from llm_do.toolsets.shell.output import HeadTailBuffer
+
+    buf = HeadTailBuffer(head_bytes=4, tail_bytes=4)
+    for chunk in (b"abc", b"defgh", b"ijklmnop", b"qr"):
+        buf.write(chunk)
+    assert buf.total_bytes == 18
+    assert buf.truncated
+    assert buf.render() == "abcd\n... (10 bytes omitted) ...\nopqr"
+
+
+class TestExecuteShellAsync:
+    """Tests for non-blocking execution with process-group cleanup."""
+
+    @pytest.mark.anyio
+    async def test_does_not_block_event_loop(self, tmp_path):
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        result = await execute_shell_async("sleep 0.3", working_dir=tmp_path)
+        task.cancel()
+        assert result.exit_code == 0
+        assert ticks >= 10
+
+    @pytest.mark.anyio
+    async def test_output_and_missing_command(self, tmp_path):
+        result = await execute_shell_async("echo hello", working_dir=tmp_path)
+        assert (result.exit_code, result.stdout.strip()) == (0, "hello")
+        missing = await execute_shell_async("nonexistent_command_xyz", working_dir=tmp_path)
+        assert missing.exit_code == 127
+
+    @pytest.mark.anyio
+    async def test_timeout_kills_process_group(self, tmp_path):
+        pid_file = tmp_path / "child.pid"
+        result = await execute_shell_async(
+            _spawn_child_command(pid_file), working_dir=tmp_path, timeout=1, kill_grace=0.5
+        )
+        assert result.exit_code == -1
+        assert "timed out" in result.stderr
+        assert await _wait_until_gone(int(pid_file.read_text()))
+
+    @pytest.mark.anyio
+    async def test_cancellation_kills_process_group(self, tmp_path):
+        pid_file = tmp_path / "child.pid"
+        task = asyncio.create_task(
+            execute_shell_async(_spawn_child_command(pid_file), working_dir=tmp_path, timeout=60)
+        )
+        child_pid = await _wait_for_file(pid_file)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await _wait_until_gone(child_pid)
+
+    @pytest.mark.anyio
+    async def test_large_output_keeps_head_and_tail(self, tmp_path):
+        script = "import sys; sys.stdout.write('HEAD' + 'x' * 5_000_000 + 'TAIL')"
+        result = await execute_shell_async(
+            shlex.join([sys.executable, "-c", script]), working_dir=tmp_path, max_output_bytes=1000
+        )
+        assert result.exit_code == 0
+        assert result.truncated
+        assert result.stdout_bytes == 5_000_008
+        assert result.stdout.startswith("HEAD") and result.stdout.endswith("TAIL")
+        assert "4999008 bytes omitted" in result.stdout
+        assert len(result.stdout) < 1100
+
+    @pytest.mark.anyio
+    async def test_stop_on_output_limit_kills_command(self, tmp_path):
+        script = "import sys\nwhile True: sys.stdout.write('y' * 4096)"
+        start = time.perf_counter()
+        result = await execute_shell_async(
+            shlex.join([sys.executable, "-c", script]),
+            working_dir=tmp_path,
+            timeout=30,
+            max_output_bytes=100_000,
+            stop_on_output_limit=True,
+        )
+        assert time.perf_counter() - start < 10
+        assert (result.exit_code, result.stopped_early, result.truncated) == (-1, True, True)
+        assert "output exceeded 100000 bytes" in result.stderr
+
+    @pytest.mark.anyio
+    async def test_toolset_streams_output_events(self):
+        from llm_do.runtime.events import ToolOutputEvent
+        from llm_do.toolsets.shell import ShellToolset
+        from tests.runtime.helpers import build_run_context, build_runtime_context
+
+        events = []
+        toolset = ShellToolset(config={"default": {"approval_required": False}})
+        call_ctx = build_runtime_context(toolsets=[toolset], on_event=events.append)
+        run_ctx = build_run_context(call_ctx)
+        tool = (await toolset.get_tools(run_ctx))["shell"]
+        result = await toolset.call_tool("shell", {"command": "echo streamed"}, run_ctx, tool)
+
+        assert result.stdout == "streamed\n"
+        outputs = [e.event for e in events if isinstance(e.event, ToolOutputEvent)]
+        assert "".join(o.content for o in outputs) == "streamed\n"
+        assert {(o.tool_name, o.stream) for o in outputs} == {("shell", "stdout")}
+
+    @pytest.mark.anyio
+    async def test_live_output_is_capped_and_batched(self, tmp_path):
+        chunks = []
+        script = "import sys\nfor _ in range(2000): sys.stdout.write('y' * 4096); sys.stdout.flush()"
+        result = await execute_shell_async(
+            shlex.join([sys.executable, "-c", script]),
+            working_dir=tmp_path,
+            max_output_bytes=100_000,
+            on_output=lambda stream, text: chunks.append(text),
+        )
+        live = "".join(chunks)
+        assert result.stdout_bytes == 2000 * 4096
+        assert live.startswith("y" * 100_000)
+        assert live.endswith("\n... (live output stopped after 100000 bytes) ...\n")
+        assert len(live) < 100_100
+        assert len(chunks) < 30
+
+    @pytest.mark.anyio
+    async def test_toolset_caps_concurrent_commands(self):
+        from llm_do.toolsets.shell import ShellToolset
+        from tests.runtime.helpers import build_run_context, build_runtime_context
+
+        toolset = ShellToolset(
+            config={"default": {"approval_required": False}, "max_concurrent": 2}
+        )
+        run_ctx = build_run_context(build_runtime_context(toolsets=[toolset]))
+        tool = (await toolset.get_tools(run_ctx))["shell"]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            toolset.call_tool("shell", {"command": "sleep 0.3"}, run_ctx, tool)
+            for _ in range(4)
+        ))
+        elapsed = time.perf_counter() - start
+        assert [r.exit_code for r in results] == [0, 0, 0, 0]
+        assert elapsed >= 0.55
+
+
 
 
 
@@ -225,6 +439,178 @@ class TestShellDefault:
         assert (allowed, approval) == snapshot((False, True))
 
 
+class TestCompiledShellRules:
+    """The rule trie must agree with linear first-match-wins matching."""
+
+    RULES = [
+        {"pattern": "git status", "approval_required": False},
+        {"pattern": "git", "approval_required": True},
+        {"pattern": "git log", "approval_required": False},
+        {"pattern": "find", "approval_required": False, "approval_required_if_args": ["-delete"]},
+        {"pattern": "ls -la", "approval_required": False},
+        {"pattern": "echo 'unclosed", "approval_required": False},
+        {"pattern": "", "approval_required": False},
+    ]
+    COMMANDS = [
+        ["git", "status"], ["git", "status", "-s"], ["git", "log"], ["git"],
+        ["find", "."], ["find", ".", "-delete"], ["ls"], ["ls", "-la", "/tmp"],
+        ["echo", "hi"], ["echo 'unclosed"], ["rm", "-rf", "x"],
+    ]
+
+    @pytest.mark.parametrize("default", [None, {"approval_required": False}])
+    def test_matches_linear_rules(self, default):
+        from llm_do.toolsets.shell import CompiledShellRules
+
+        compiled = CompiledShellRules(self.RULES, default)
+        for args in self.COMMANDS:
+            assert compiled.decide(args) == match_shell_rules(" ".join(args), args, self.RULES, default), args
+
+    def test_command_parsed_once_per_call(self, monkeypatch):
+        from llm_do.toolsets.shell import ShellToolset, rules
+
+        calls = []
+        real_parse = rules.parse_command
+        monkeypatch.setattr(rules, "parse_command", lambda cmd: calls.append(cmd) or real_parse(cmd))
+        toolset = ShellToolset(config={"rules": self.RULES})
+        args = {"command": "git status -s"}
+        assert toolset.needs_approval("shell", args, None).is_pre_approved
+        assert toolset.get_capabilities("shell", args, None) == {"proc.exec", "proc.exec.pre_approved"}
+        assert calls == ["git status -s"]
+
+    def test_benchmark_rule_matching(self):
+        from llm_do.toolsets.shell import ShellToolset
+
+        rules_config = [
+            {"pattern": f"tool{i} sub{i % 7}", "approval_required": i % 2 == 0}
+            for i in range(300)
+        ]
+        commands = [f"tool{i} sub{i % 7} --flag value" for i in range(0, 300, 3)]
+        commands.append("unlisted --x")
+        rounds = 3
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for command in commands:
+                args = parse_command(command)
+                match_shell_rules(command, args, rules_config, None)
+                match_shell_rules(command, args, rules_config, None)
+        linear = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            toolset = ShellToolset(config={"rules": rules_config})
+            for command in commands:
+                toolset.needs_approval("shell", {"command": command}, None)
+                toolset.get_capabilities("shell", {"command": command}, None)
+        compiled = time.perf_counter() - start
+
+        calls = rounds * len(commands)
+        print(
+            f"\n300 rules: linear {linear / calls * 1e6:.0f} us/call, "
+            f"compiled (incl. build per round) {compiled / calls * 1e6:.1f} us/call"
+        )
+        assert compiled < linear
+
+
+class TestShellResultCache:
+    """Opt-in caching of read-only command results."""
+
+    def test_git_fingerprint_tracks_head_and_index(self, tmp_path):
+        from llm_do.toolsets.shell.result_cache import repo_fingerprint
+
+        git_dir = tmp_path / ".git"
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (git_dir / "refs" / "heads" / "main").write_text("a" * 40)
+        (git_dir / "index").write_bytes(b"v1")
+        (tmp_path / "src").mkdir()
+
+        before = repo_fingerprint(tmp_path / "src")
+        assert repo_fingerprint(tmp_path / "src") == before
+        (git_dir / "index").write_bytes(b"v2-longer")
+        assert repo_fingerprint(tmp_path / "src") != before
+        after_index = repo_fingerprint(tmp_path)
+        (git_dir / "HEAD").write_text("ref: refs/heads/other\n")
+        assert repo_fingerprint(tmp_path) != after_index
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_git_fingerprint_tracks_refs_in_worktrees(self, tmp_path):
+        from llm_do.toolsets.shell.result_cache import repo_fingerprint
+
+        def git(*args: str, cwd: Path = tmp_path / "repo") -> None:
+            subprocess.run(
+                ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                cwd=cwd, check=True, capture_output=True,
+            )
+
+        (tmp_path / "repo").mkdir()
+        git("init", "-q", "-b", "main")
+        git("commit", "-q", "--allow-empty", "-m", "one")
+        git("commit", "-q", "--allow-empty", "-m", "two")
+        git("worktree", "add", "-q", "-b", "side", str(tmp_path / "wt"))
+        worktree = tmp_path / "wt"
+
+        before = repo_fingerprint(worktree)
+        git("reset", "-q", "--soft", "HEAD~1", cwd=worktree)
+        after_reset = repo_fingerprint(worktree)
+        assert after_reset != before
+        git("tag", "v1")
+        after_tag = repo_fingerprint(worktree)
+        assert after_tag != after_reset
+        git("update-ref", "refs/remotes/origin/main", "HEAD")
+        assert repo_fingerprint(worktree) != after_tag
+
+    @pytest.mark.anyio
+    async def test_cacheable_rule_reuses_result_until_state_changes(self, tmp_path, monkeypatch):
+        from llm_do.toolsets.shell import ShellToolset
+        from tests.runtime.helpers import build_run_context, build_runtime_context
+
+        monkeypatch.chdir(tmp_path)
+        command = shlex.join([sys.executable, "-c", "print(__import__('time').time_ns())"])
+        toolset = ShellToolset(config={
+            "rules": [{"pattern": sys.executable, "approval_required": False, "cacheable": True}],
+        })
+        run_ctx = build_run_context(build_runtime_context(toolsets=[toolset]))
+        tool = (await toolset.get_tools(run_ctx))["shell"]
+
+        async def run() -> str:
+            result = await toolset.call_tool("shell", {"command": command}, run_ctx, tool)
+            assert result.exit_code == 0
+            return result.stdout
+
+        first = await run()
+        assert await run() == first
+        (tmp_path / "new_dir").mkdir()
+        changed = await run()
+        assert changed != first
+        assert await run() == changed
+
+        # A fresh runtime starts with an empty cache.
+        other_ctx = build_run_context(build_runtime_context(toolsets=[toolset]))
+        other = await toolset.call_tool("shell", {"command": command}, other_ctx, tool)
+        assert other.stdout != changed
+
+    @pytest.mark.anyio
+    async def test_ttl_expires_entries(self, tmp_path, monkeypatch):
+        from llm_do.toolsets.shell import ShellToolset
+        from tests.runtime.helpers import build_run_context, build_runtime_context
+
+        monkeypatch.chdir(tmp_path)
+        command = shlex.join([sys.executable, "-c", "print(__import__('time').time_ns())"])
+        toolset = ShellToolset(config={
+            "rules": [{"pattern": sys.executable, "approval_required": False, "cacheable": True}],
+            "cache_ttl": 0.2,
+        })
+        run_ctx = build_run_context(build_runtime_context(toolsets=[toolset]))
+        tool = (await toolset.get_tools(run_ctx))["shell"]
+        first = await toolset.call_tool("shell", {"command": command}, run_ctx, tool)
+        second = await toolset.call_tool("shell", {"command": command}, run_ctx, tool)
+        assert second.stdout == first.stdout
+        await asyncio.sleep(0.3)
+        third = await toolset.call_tool("shell", {"command": command}, run_ctx, tool)
+        assert third.stdout != first.stdout
+
+
 class TestShellToolsetNeedsApproval:
     """Tests for ShellToolset.needs_approval metacharacter blocking."""
 
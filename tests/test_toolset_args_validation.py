@@ -1,10 +1,22 @@
 from __future__ import annotations
 
 import pytest
-from pydantic import ValidationError
+from pydantic import BaseModel, Field, ValidationError
 
-from llm_do.toolsets.filesystem import FileSystemToolset
+from llm_do.toolsets import ValidatedArgs, args_model, args_schema, args_tool
+from llm_do.toolsets.filesystem import (
+    AppendFileArgs,
+    EditFileArgs,
+    FileSystemToolset,
+    ListFilesArgs,
+    ReadFileArgs,
+    ReadFilesArgs,
+    SearchFilesArgs,
+    WriteFileArgs,
+)
 from llm_do.toolsets.shell import ShellToolset
+from llm_do.toolsets.shell.toolset import ShellArgs
+from llm_do.toolsets.validators import DictValidator
 
 
 @pytest.mark.anyio
@@ -31,3 +43,77 @@ async def test_filesystem_read_requires_path() -> None:
     with pytest.raises(ValidationError):
         tool.args_validator.validate_python({})
 
+
+
+@pytest.mark.anyio
+async def test_get_tools_reuses_cached_schema_and_validator() -> None:
+    toolset = FileSystemToolset(config={})
+    first = (await toolset.get_tools(None))["read_file"]
+    second = (await FileSystemToolset(config={}).get_tools(None))["read_file"]
+    assert first.args_validator is second.args_validator
+    assert first.tool_def.parameters_json_schema is second.tool_def.parameters_json_schema
+
+
+def test_args_tool_builds_user_toolset_tool() -> None:
+    class LookupArgs(BaseModel):
+        key: str = Field(description="Key to look up")
+
+    toolset = FileSystemToolset(config={})
+    tool = args_tool(toolset, "lookup", "Look up a key.", LookupArgs, max_retries=2, sequential=True)
+    assert tool.tool_def.parameters_json_schema == LookupArgs.model_json_schema()
+    assert tool.tool_def.sequential is True
+    assert tool.max_retries == 2
+    assert tool.args_validator.validate_python({"key": "a"}) == {"key": "a"}
+    assert args_schema(LookupArgs).validator is tool.args_validator
+
+
+@pytest.mark.anyio
+async def test_get_tools_benchmark_cached_vs_rebuilt() -> None:
+    """Per-step cost of get_tools for the built-in toolsets, rebuilt vs cached."""
+    import time
+
+    import llm_do.project  # noqa: F401 - dynamic_agents must load after project (import cycle)
+    from llm_do.toolsets.dynamic_agents import (
+        AgentCallArgs,
+        AgentCreateArgs,
+        DynamicAgentsToolset,
+    )
+
+    toolsets = [
+        FileSystemToolset(config={}),
+        ShellToolset(config={"default": {"approval_required": False}}),
+        DynamicAgentsToolset(),
+    ]
+    models = [
+        ReadFileArgs, ReadFilesArgs, WriteFileArgs, EditFileArgs, AppendFileArgs, SearchFilesArgs, ListFilesArgs,
+        ShellArgs, AgentCreateArgs, AgentCallArgs,
+    ]
+    steps = 50
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        for model in models:
+            model.model_json_schema()
+            DictValidator(model)
+    rebuilt_ms = (time.perf_counter() - start) / steps * 1000
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        for toolset in toolsets:
+            await toolset.get_tools(None)
+    cached_ms = (time.perf_counter() - start) / steps * 1000
+
+    print(f"\nget_tools per step ({len(models)} tools): rebuilt {rebuilt_ms:.2f} ms, cached {cached_ms:.3f} ms")
+    assert cached_ms < rebuilt_ms / 5
+
+
+@pytest.mark.anyio
+async def test_validator_result_carries_model_for_args_model() -> None:
+    toolset = ShellToolset(config={"default": {"approval_required": False}})
+    tool = (await toolset.get_tools(None))["shell"]
+    args = tool.args_validator.validate_python({"command": "ls"})
+    assert isinstance(args, ValidatedArgs)
+    assert args_model(args, ShellArgs) is args.model
+    assert args_model(args.model, ShellArgs) is args.model
+    plain = args_model({"command": "ls"}, ShellArgs)
+    assert plain == args.model and plain is not args.model
@@ -0,0 +1,101 @@
+"""Batching behaviour and throughput ceiling of the TUI event consumer.
+
+The benchmark drives ``LlmDoApp`` headlessly via ``run_test()`` and reports the
+measured events/second. The asserted floors are deliberately loose so CI noise
+does not cause flakes; see docs/ui.md for reference numbers.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from llm_do.ui.app import LlmDoApp, coalesce_text_deltas, drain_event_batch
+from llm_do.ui.events import TextResponseEvent, ToolCallEvent, UIEvent
+
+
+def test_drain_event_batch_takes_queued_events_and_stops_at_sentinel() -> None:
+    queue: asyncio.Queue[UIEvent | None] = asyncio.Queue()
+    first = TextResponseEvent(content="a", is_delta=True)
+    second = TextResponseEvent(content="b", is_delta=True)
+    queue.put_nowait(second)
+    queue.put_nowait(None)
+    queue.put_nowait(TextResponseEvent(content="after"))
+
+    batch = drain_event_batch(queue, first)
+
+    assert batch == [first, second, None]
+    assert queue.qsize() == 1
+
+
+def test_drain_event_batch_respects_limit() -> None:
+    queue: asyncio.Queue[UIEvent | None] = asyncio.Queue()
+    for _ in range(10):
+        queue.put_nowait(TextResponseEvent(content="x", is_delta=True))
+
+    batch = drain_event_batch(queue, TextResponseEvent(content="x", is_delta=True), limit=4)
+
+    assert len(batch) == 4
+    assert queue.qsize() == 7
+
+
+def test_coalesce_text_deltas_merges_adjacent_deltas_per_agent() -> None:
+    tool = ToolCallEvent(agent="main", tool_name="t")
+    batch: list[UIEvent | None] = [
+        TextResponseEvent(agent="main", content="Hel", is_delta=True),
+        TextResponseEvent(agent="main", content="lo", is_delta=True),
+        TextResponseEvent(agent="child", depth=1, content="x", is_delta=True),
+        tool,
+        TextResponseEvent(agent="main", content="!", is_delta=True),
+        None,
+    ]
+
+    merged = coalesce_text_deltas(batch)
+
+    assert len(merged) == 5
+    assert [e.content for e in merged[:2] if isinstance(e, TextResponseEvent)] == ["Hello", "x"]
+    assert merged[2] is tool
+    assert isinstance(merged[3], TextResponseEvent) and merged[3].content == "!"
+    assert merged[4] is None
+
+
+async def _measure_events_per_second(events: list[UIEvent]) -> float:
+    queue: asyncio.Queue[UIEvent | None] = asyncio.Queue()
+    app = LlmDoApp(queue, auto_quit=True)
+    for event in events:
+        queue.put_nowait(event)
+    queue.put_nowait(None)
+
+    start = time.perf_counter()
+    async with app.run_test() as pilot:
+        while not app._done:
+            await pilot.pause()
+    elapsed = time.perf_counter() - start
+    return len(events) / elapsed
+
+
+@pytest.mark.anyio
+async def test_event_consumer_streaming_delta_throughput() -> None:
+    events: list[UIEvent] = [TextResponseEvent(agent="main", is_complete=False)]
+    events.extend(
+        TextResponseEvent(agent="main", content="token ", is_delta=True)
+        for _ in range(5_000)
+    )
+    events.append(TextResponseEvent(agent="main", content="done"))
+
+    rate = await _measure_events_per_second(events)
+
+    assert rate > 2_000
+
+
+@pytest.mark.anyio
+async def test_event_consumer_widget_event_throughput() -> None:
+    events: list[UIEvent] = [
+        ToolCallEvent(agent="main", tool_name="read_file", args={"path": f"f{i}.txt"})
+        for i in range(300)
+    ]
+
+    rate = await _measure_events_per_second(events)
+
+    assert rate > 50